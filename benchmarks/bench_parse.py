@@ -0,0 +1,110 @@
+"""Benchmark decoding of large search responses.
+
+Compares the standard library json module with orjson, and eagerly built
+results (with and without __slots__) with lazily decoded ones. For each case it
+reports the best time, the peak traced memory, the memory still held by the
+decoded response afterwards, and the part of that held by the result models on
+top of the decoded JSON. Lazy responses keep the raw entries alive, so their
+saving shows in models_mb and time rather than in retained_mb.
+
+    python benchmarks/bench_parse.py --results 50000
+"""
+
+import argparse
+import dataclasses
+import gc
+import json
+import sys
+import time
+import tracemalloc
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path[:0] = [str(ROOT / "src"), str(ROOT)]
+
+from searxngcli.models import SearchResponse, SearchResult  # noqa: E402
+from tests.fakeserver import make_search_response  # noqa: E402
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+MB = 1024 * 1024
+
+# The result model without __slots__, as results were stored before.
+DictSearchResult = dataclasses.make_dataclass(
+    "DictSearchResult", [(f.name, f.type, f) for f in dataclasses.fields(SearchResult)]
+)
+
+
+def _traced(func: Callable[[], Any]) -> tuple[float, float]:
+    """Memory held by func's return value and the peak while it ran, in MB."""
+    gc.collect()
+    tracemalloc.start()
+    kept = func()
+    gc.collect()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del kept
+    return current / MB, peak / MB
+
+
+def _measure(loads: Callable[[bytes], Any], build: Callable[[Any], Any], body: bytes, repeat: int) -> dict[str, float]:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        build(loads(body))
+        timings.append(time.perf_counter() - start)
+
+    retained, peak = _traced(lambda: build(loads(body)))
+    data = loads(body)
+    models, _ = _traced(lambda: build(data))
+    return {"best_ms": min(timings) * 1000, "peak_mb": peak, "retained_mb": retained, "models_mb": models}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--results", type=int, default=50000, help="Number of results in the response")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per case, the best one is reported")
+    parser.add_argument("--show", type=int, default=10, help="Results accessed in the partial cases")
+    args = parser.parse_args()
+
+    body = json.dumps(make_search_response("benchmark", num_results=args.results)).encode()
+
+    def eager(cls: type) -> Callable[[dict], Any]:
+        from_dict = SearchResult.from_dict.__func__  # type: ignore[attr-defined]
+        return lambda data: [from_dict(cls, r) for r in data["results"]]
+
+    def lazy(count: int | None) -> Callable[[dict], Any]:
+        def build(data: dict) -> SearchResponse:
+            response = SearchResponse.from_dict(data)
+            response.results[:count]
+            return response
+
+        return build
+
+    builds: dict[str, Callable[[dict], Any]] = {
+        "eager-dict": eager(DictSearchResult),
+        "eager": eager(SearchResult),
+        "lazy-all": lazy(None),
+        f"lazy-first-{args.show}": lazy(args.show),
+    }
+    decoders: dict[str, Callable[[bytes], Any]] = {"json": json.loads}
+    if orjson is not None:
+        decoders["orjson"] = orjson.loads
+
+    cases: dict[str, dict[str, float]] = {}
+    for name, loads in decoders.items():
+        for build_name, build in builds.items():
+            cases[f"{name}/{build_name}"] = _measure(loads, build, body, args.repeat)
+
+    json.dump({"results": args.results, "bytes": len(body), "cases": cases}, sys.stdout, indent=2)
+    sys.stdout.write("\n")
+
+
+if __name__ == "__main__":
+    main()
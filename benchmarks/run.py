@@ -0,0 +1,241 @@
+"""End-to-end benchmark suite against a local stand-in SearXNG server.
+
+Measures CLI cold start, client search latency and throughput, response
+parsing and result rendering, and prints the numbers as JSON:
+
+    python benchmarks/run.py --output before.json
+    python benchmarks/run.py --compare before.json
+
+With --compare, metrics that got worse by more than --threshold percent are
+reported on stderr and the exit code is 1.
+"""
+
+import argparse
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path[:0] = [str(ROOT / "src"), str(ROOT)]
+
+from searxngcli.client import SearXNGClient  # noqa: E402
+from searxngcli.formatter import print_results  # noqa: E402
+from searxngcli.logging import use_consoles  # noqa: E402
+from searxngcli.models import SearchResponse  # noqa: E402
+from tests.fakeserver import FakeSearXNG, make_search_response  # noqa: E402
+
+# Whether a larger value of a metric is better, by metric name suffix.
+HIGHER_IS_BETTER = ("_per_s",)
+
+
+def _percentile(samples: list[float], q: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, round(q * (len(ordered) - 1)))]
+
+
+def _summarize(samples: list[float]) -> dict[str, float]:
+    """Summarize durations in seconds as milliseconds."""
+    return {
+        "min_ms": min(samples) * 1000,
+        "median_ms": statistics.median(samples) * 1000,
+        "p95_ms": _percentile(samples, 0.95) * 1000,
+    }
+
+
+def _time(func: Callable[[], Any], runs: int) -> list[float]:
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def bench_cold_start(server: FakeSearXNG, runs: int) -> dict[str, Any]:
+    """Wall time of fresh CLI processes, minus a bare interpreter start."""
+    with tempfile.TemporaryDirectory() as tmp:
+        config = Path(tmp) / "config.yml"
+        config.write_text(f"base_url: {server.base_url}\n")
+        env = {**os.environ, "XDG_CACHE_HOME": str(Path(tmp) / "cache"), "SEARXNG_NO_DAEMON": "1"}
+
+        def run(*args: str) -> Callable[[], Any]:
+            command = [sys.executable, "-c", *args]
+            return lambda: subprocess.run(command, env=env, capture_output=True, check=True)
+
+        entry_point = "from searxngcli.cli import cli; cli()"
+        baseline = min(_time(run("pass"), runs))
+        cases = {
+            "version": run(entry_point, "--version"),
+            "search_json": run(entry_point, "--config", str(config), "search", "test", "--json", "--no-cache"),
+        }
+        return {"interpreter_ms": baseline * 1000} | {
+            name: {f"overhead_{k}": v - baseline * 1000 for k, v in _summarize(_time(func, runs)).items()}
+            for name, func in cases.items()
+        }
+
+
+def bench_client(server: FakeSearXNG, runs: int, concurrency: int) -> dict[str, Any]:
+    """Latency of sequential searches and throughput of concurrent ones."""
+    with SearXNGClient(server.base_url, max_connections=concurrency) as client:
+        client.search("warmup", use_cache=False)
+        latency = _time(lambda: client.search("latency", use_cache=False), runs)
+
+        total = runs * concurrency
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            start = time.perf_counter()
+            list(executor.map(lambda i: client.search(f"throughput {i}", use_cache=False), range(total)))
+            elapsed = time.perf_counter() - start
+
+    return {
+        "latency": _summarize(latency),
+        "throughput": {"concurrency": concurrency, "requests_per_s": total / elapsed},
+    }
+
+
+def bench_parse(num_results: int, runs: int) -> dict[str, Any]:
+    """SearchResponse.from_dict with every result decoded."""
+    data = make_search_response("parse", num_results=num_results)
+    samples = _time(lambda: list(SearchResponse.from_dict(data).results), runs)
+    best = min(samples)
+    return _summarize(samples) | {"responses_per_s": 1 / best, "results_per_s": num_results / best}
+
+
+class _Terminal(io.StringIO):
+    def isatty(self) -> bool:
+        return True
+
+
+def bench_render(num_results: int, runs: int) -> dict[str, Any]:
+    """print_results to an in-memory terminal and to a pipe."""
+    from rich.console import Console
+
+    response = SearchResponse.from_dict(make_search_response("render", num_results=num_results))
+
+    def render(stdout: Callable[[], io.StringIO]) -> Callable[[], None]:
+        def run() -> None:
+            out = stdout()
+            console = Console(file=out, force_terminal=True, color_system="truecolor", width=120)
+            real_stdout, sys.stdout = sys.stdout, out
+            try:
+                with use_consoles(console, console):
+                    print_results(response, num=num_results)
+            finally:
+                sys.stdout = real_stdout
+
+        return run
+
+    report = {}
+    for name, stdout in (("terminal", _Terminal), ("pipe", io.StringIO)):
+        run = render(stdout)
+        run()
+        samples = _time(run, runs)
+        report[name] = _summarize(samples) | {"results_per_s": num_results / min(samples)}
+    return report
+
+
+def _git_revision() -> str | None:
+    try:
+        result = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True)
+    except OSError:
+        return None
+    return result.stdout.strip() or None
+
+
+def run_suite(
+    runs: int = 20,
+    num_results: int = 20,
+    latency: float = 0.0,
+    concurrency: int = 8,
+    cold_start: bool = True,
+) -> dict[str, Any]:
+    """Run all benchmarks and return the report."""
+    benchmarks: dict[str, Any] = {}
+    with FakeSearXNG(num_results=num_results, latency=latency) as server:
+        if cold_start:
+            benchmarks["cold_start"] = bench_cold_start(server, max(3, runs // 4))
+        benchmarks["client"] = bench_client(server, runs, concurrency)
+    benchmarks["parse"] = bench_parse(num_results * 50, runs)
+    benchmarks["render"] = bench_render(num_results, runs)
+
+    return {
+        "revision": _git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "parameters": {"runs": runs, "num_results": num_results, "latency_ms": latency * 1000},
+        "benchmarks": benchmarks,
+    }
+
+
+def _flatten(data: dict[str, Any], prefix: str = "") -> dict[str, float]:
+    flat = {}
+    for key, value in data.items():
+        if isinstance(value, dict):
+            flat.update(_flatten(value, f"{prefix}{key}."))
+        elif isinstance(value, int | float) and not isinstance(value, bool):
+            flat[f"{prefix}{key}"] = float(value)
+    return flat
+
+
+def compare(baseline: dict[str, Any], current: dict[str, Any], threshold: float) -> list[str]:
+    """List the metrics that regressed by more than threshold percent."""
+    before = _flatten(baseline["benchmarks"])
+    after = _flatten(current["benchmarks"])
+    regressions = []
+    for name, old in before.items():
+        new = after.get(name)
+        if new is None or old <= 0 or name.endswith(("concurrency", "interpreter_ms")):
+            continue
+        change = (new - old) / old * 100
+        if name.endswith(HIGHER_IS_BETTER):
+            change = -change
+        if change > threshold:
+            regressions.append(f"{name}: {old:.3f} -> {new:.3f} ({change:+.1f}% worse)")
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=20, help="Samples per benchmark")
+    parser.add_argument("--results", type=int, default=20, help="Results per fake response")
+    parser.add_argument("--latency", type=float, default=0.0, help="Fake server latency in milliseconds")
+    parser.add_argument("--concurrency", type=int, default=8, help="Workers in the throughput benchmark")
+    parser.add_argument("--no-cold-start", action="store_true", help="Skip the subprocess benchmarks")
+    parser.add_argument("--output", type=Path, help="Write the report to a file instead of stdout")
+    parser.add_argument("--compare", type=Path, help="Baseline report to check for regressions")
+    parser.add_argument("--threshold", type=float, default=10.0, help="Regression threshold in percent")
+    args = parser.parse_args()
+
+    report = run_suite(
+        runs=args.runs,
+        num_results=args.results,
+        latency=args.latency / 1000,
+        concurrency=args.concurrency,
+        cold_start=not args.no_cold_start,
+    )
+
+    text = json.dumps(report, indent=2) + "\n"
+    if args.output:
+        args.output.write_text(text)
+    else:
+        sys.stdout.write(text)
+
+    if args.compare:
+        regressions = compare(json.loads(args.compare.read_text()), report, args.threshold)
+        for line in regressions:
+            sys.stderr.write(f"regression: {line}\n")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,899 @@
+"""Typer application with the SearXNG CLI commands."""
+
+import json
+import sys
+from dataclasses import asdict
+from pathlib import Path
+from typing import TYPE_CHECKING, Annotated, TextIO
+
+import typer
+
+from . import __version__
+from .batch import DEFAULT_CONCURRENCY
+from .config import (
+    CONFIG_KEYS,
+    Config,
+    get_cache_dir,
+    get_config_path,
+    load_config,
+    parse_config_value,
+    save_config,
+)
+from .context import get_context
+from .logging import get_console, get_error_console, get_logger, setup_logging
+
+if TYPE_CHECKING:
+    from .cache import SearchCache
+    from .export import Exporter
+
+app = typer.Typer(
+    name="searxng",
+    help="A command-line interface for SearXNG.",
+    no_args_is_help=True,
+    rich_markup_mode=None,
+)
+
+config_app = typer.Typer(
+    name="config",
+    help="Configuration management.",
+    no_args_is_help=True,
+    rich_markup_mode=None,
+)
+app.add_typer(config_app, name="config")
+
+cache_app = typer.Typer(
+    name="cache",
+    help="Search response cache management.",
+    no_args_is_help=True,
+    rich_markup_mode=None,
+)
+app.add_typer(cache_app, name="cache")
+
+profile_app = typer.Typer(
+    name="profile",
+    help="Inspect profiles written by --profile-output.",
+    no_args_is_help=True,
+    rich_markup_mode=None,
+)
+app.add_typer(profile_app, name="profile")
+
+logger = get_logger(__name__)
+
+_ctx = get_context()
+
+
+def version_callback(value: bool) -> None:
+    """Print version and exit."""
+    if value:
+        get_console().print(f"searxng {__version__}")
+        raise typer.Exit()
+
+
+@app.callback()
+def main(
+    ctx: typer.Context,
+    config_path: Annotated[
+        Path | None,
+        typer.Option(
+            "--config",
+            "-c",
+            help="Path to config file.",
+            envvar="SEARXNG_CONFIG",
+        ),
+    ] = None,
+    verbose: Annotated[
+        bool,
+        typer.Option(
+            "--verbose",
+            "-v",
+            help="Enable debug logging.",
+            is_eager=True,
+        ),
+    ] = False,
+    version: Annotated[
+        bool | None,
+        typer.Option(
+            "--version",
+            "-V",
+            help="Show version and exit.",
+            callback=version_callback,
+            is_eager=True,
+        ),
+    ] = None,
+    profile: Annotated[
+        str | None,
+        typer.Option("--profile", help="Named profile from the config file to apply."),
+    ] = None,
+    timings: Annotated[
+        bool,
+        typer.Option("--timings", help="Print a per-request phase timing breakdown to stderr."),
+    ] = False,
+    timings_file: Annotated[
+        Path | None,
+        typer.Option(
+            "--timings-file",
+            help="Write phase timings to a file: JSON for *.json, OpenMetrics text otherwise.",
+        ),
+    ] = None,
+    profile_output: Annotated[
+        Path | None,
+        typer.Option(
+            "--profile-output",
+            envvar="SEARXNG_PROFILE",
+            help="Profile CPU and memory use by phase and write the results to a new directory under this one.",
+        ),
+    ] = None,
+    record: Annotated[
+        Path | None,
+        typer.Option("--record", help="Record every exchange with the instance to a cassette file (*.jsonl.gz)."),
+    ] = None,
+    replay: Annotated[
+        Path | None,
+        typer.Option("--replay", help="Answer requests from a recorded cassette file instead of the network."),
+    ] = None,
+    replay_latency: Annotated[
+        float | None,
+        typer.Option(
+            "--replay-latency",
+            help="Delay replayed responses by their recorded latency times this factor (1 = recorded speed).",
+            min=0.0,
+        ),
+    ] = None,
+) -> None:
+    """SearXNG CLI - A command-line interface for SearXNG."""
+    from .profiling import command_started, phase
+
+    # Profiling itself is started by the entry point, before the application is imported.
+    command_started()
+    setup_logging(verbose=verbose)
+    logger.debug("Debug logging enabled")
+
+    _ctx.verbose = verbose
+
+    if config_path or profile:
+        try:
+            with phase("config"):
+                _ctx.config = load_config(config_path, profile=profile)
+        except (FileNotFoundError, ValueError) as e:
+            get_error_console().print(f"[red]{e}[/red]")
+            raise typer.Exit(1) from None
+
+    if record and replay:
+        get_error_console().print("[red]--record and --replay are mutually exclusive[/red]")
+        raise typer.Exit(1)
+    _ctx.record = record
+    _ctx.replay = replay
+    _ctx.replay_latency = replay_latency
+
+    if timings or timings_file:
+        from .timings import Timings
+
+        _ctx.timings = Timings()
+        ctx.call_on_close(lambda: _report_timings(timings, timings_file))
+
+
+def _report_timings(show: bool, path: Path | None) -> None:
+    timings = _ctx.timings
+    if timings is None:
+        return
+    if show:
+        for line in timings.format():
+            get_error_console().print(line, markup=False, highlight=False, soft_wrap=True)
+    if path is not None:
+        timings.write(path)
+
+
+def _filter_defaults(
+    categories: str | None, engines: str | None, language: str | None
+) -> tuple[str | None, str | None, str | None]:
+    """Fill in search filters not given on the command line from the config or profile."""
+    config = _ctx.get_config()
+    return (
+        categories or config.categories or None,
+        engines or config.engines or None,
+        language or config.language or None,
+    )
+
+
+@app.command("search")
+def search_command(
+    query: Annotated[str, typer.Argument(help="Search query.")],
+    categories: Annotated[
+        str | None,
+        typer.Option("--categories", "-c", help="Comma-separated categories (general, images, news, videos, etc.)."),
+    ] = None,
+    engines: Annotated[
+        str | None,
+        typer.Option("--engines", "-e", help="Comma-separated engines."),
+    ] = None,
+    language: Annotated[
+        str | None,
+        typer.Option("--language", "-l", help="Language code (en, de, cs, etc.)."),
+    ] = None,
+    num: Annotated[
+        int | None,
+        typer.Option("--num", "-n", help="Number of results to display.  [default: num from the config, 25]"),
+    ] = None,
+    page: Annotated[
+        int,
+        typer.Option("--page", "-p", help="Page number."),
+    ] = 1,
+    time_range: Annotated[
+        str | None,
+        typer.Option("--time-range", "-t", help="Time range: day, week, month, year."),
+    ] = None,
+    safe_search: Annotated[
+        int | None,
+        typer.Option("--safe-search", help="Safe search level: 0, 1, or 2."),
+    ] = None,
+    output_json: Annotated[
+        bool,
+        typer.Option("--json", help="Output raw JSON."),
+    ] = False,
+    output_jsonl: Annotated[
+        bool,
+        typer.Option("--jsonl", help="Output one JSON object per result, followed by a metadata line."),
+    ] = False,
+    no_cache: Annotated[
+        bool,
+        typer.Option("--no-cache", help="Bypass the search response cache."),
+    ] = False,
+    fill: Annotated[
+        bool,
+        typer.Option(
+            "--fill",
+            help="Fetch further pages concurrently until --num unique results are collected.",
+        ),
+    ] = False,
+    fetch: Annotated[
+        bool,
+        typer.Option(
+            "--fetch", help="Download the pages of the top --num results concurrently and attach their main text."
+        ),
+    ] = False,
+    fuse: Annotated[
+        bool,
+        typer.Option(
+            "--fuse",
+            help="Query each of --engines separately and merge the rankings locally with reciprocal-rank fusion.",
+        ),
+    ] = False,
+    deadline: Annotated[
+        int | None,
+        typer.Option(
+            "--deadline",
+            min=1,
+            help="Return within this many milliseconds with the results that arrived, marked partial if incomplete.",
+        ),
+    ] = None,
+    export: Annotated[
+        Path | None,
+        typer.Option(
+            "--export",
+            help="Append the results to a dataset: CSV (*.csv), SQLite (*.db, *.sqlite) or Parquet (*.parquet).",
+        ),
+    ] = None,
+) -> None:
+    """Search using SearXNG."""
+    from .formatter import print_json, print_results, write_jsonl
+    from .profiling import phase
+    from .timings import measure
+
+    if output_json and output_jsonl:
+        get_error_console().print("[red]--json and --jsonl are mutually exclusive[/red]")
+        raise typer.Exit(1)
+
+    if fuse and fill:
+        get_error_console().print("[red]--fuse and --fill are mutually exclusive[/red]")
+        raise typer.Exit(1)
+
+    client = _ctx.get_client()
+    categories, engines, language = _filter_defaults(categories, engines, language)
+    if fuse and not engines:
+        get_error_console().print("[red]--fuse requires --engines[/red]")
+        raise typer.Exit(1)
+    if num is None:
+        num = _ctx.get_config().num
+    _check_export(export)
+    search_kwargs = {
+        "categories": categories,
+        "language": language,
+        "page": page,
+        "time_range": time_range,
+        "safe_search": safe_search,
+        "use_cache": not no_cache,
+        "deadline": deadline / 1000 if deadline is not None else None,
+    }
+    if fuse:
+        response = client.search_fused(query, engines, **search_kwargs)
+    elif fill:
+        response = client.search_pages(query, num=num, engines=engines, **search_kwargs)
+    else:
+        response = client.search(query, engines=engines, **search_kwargs)
+
+    if fetch:
+        results = response.results[:num]
+        with measure(_ctx.timings, "fetch"), phase("http"):
+            pages = _ctx.get_fetcher().fetch_all([result.url for result in results])
+        for result, fetched in zip(results, pages, strict=True):
+            result.page = fetched
+
+    if export is not None:
+        with _open_export(export) as exporter:
+            # Filled results come from several pages, which the merged response doesn't tell apart.
+            exporter.add(query, None if fill else page, response.results[:num])
+
+    with measure(_ctx.timings, "render"), phase("render"):
+        if output_json:
+            print_json(response.to_dict())
+        elif output_jsonl:
+            write_jsonl(response, num=num)
+        else:
+            print_results(response, num=num)
+
+
+@app.command("local")
+def local_command(
+    terms: Annotated[str, typer.Argument(help="Words to look for in past results.")],
+    num: Annotated[
+        int,
+        typer.Option("--num", "-n", help="Number of results to display."),
+    ] = 10,
+    output_json: Annotated[
+        bool,
+        typer.Option("--json", help="Output raw JSON."),
+    ] = False,
+    output_jsonl: Annotated[
+        bool,
+        typer.Option("--jsonl", help="Output one JSON object per result, followed by a metadata line."),
+    ] = False,
+) -> None:
+    """Search previously seen results offline.
+
+    Results are recorded in a local full-text index when index_results is
+    enabled in the config.
+    """
+    from .formatter import print_json, print_results, write_jsonl
+
+    if output_json and output_jsonl:
+        get_error_console().print("[red]--json and --jsonl are mutually exclusive[/red]")
+        raise typer.Exit(1)
+
+    index = _ctx.get_index()
+    try:
+        response = index.search(terms, limit=num)
+    except ValueError as e:
+        get_error_console().print(f"[red]{e}[/red]")
+        raise typer.Exit(1) from None
+    finally:
+        index.close()
+
+    if output_json:
+        print_json(response.to_dict())
+    elif output_jsonl:
+        write_jsonl(response, num=num)
+    else:
+        print_results(response, num=num)
+
+
+@app.command("suggest")
+def suggest_command(
+    prefix: Annotated[str, typer.Argument(help="Partially typed query.")],
+    output_json: Annotated[
+        bool,
+        typer.Option("--json", help="Output a JSON array."),
+    ] = False,
+    no_cache: Annotated[
+        bool,
+        typer.Option("--no-cache", help="Ask the instance even if the prefix is cached."),
+    ] = False,
+) -> None:
+    """Complete a partially typed query, one suggestion per line.
+
+    Answers are kept in a local prefix cache, so repeated and longer prefixes
+    are usually answered without a request.
+    """
+    from .formatter import print_json
+
+    client = _ctx.get_client()
+    suggestions = client.autocomplete(prefix, use_cache=not no_cache)
+
+    if output_json:
+        print_json(suggestions)
+    else:
+        sys.stdout.write("".join(f"{s}\n" for s in suggestions))
+
+
+@app.command("batch")
+def batch_command(
+    input_file: Annotated[
+        str,
+        typer.Argument(help="File with one query per line, or '-' to read from stdin."),
+    ] = "-",
+    concurrency: Annotated[
+        int,
+        typer.Option("--concurrency", "-j", help="Maximum number of concurrent searches.", min=1),
+    ] = DEFAULT_CONCURRENCY,
+    categories: Annotated[
+        str | None,
+        typer.Option("--categories", "-c", help="Comma-separated categories (general, images, news, videos, etc.)."),
+    ] = None,
+    engines: Annotated[
+        str | None,
+        typer.Option("--engines", "-e", help="Comma-separated engines."),
+    ] = None,
+    language: Annotated[
+        str | None,
+        typer.Option("--language", "-l", help="Language code (en, de, cs, etc.)."),
+    ] = None,
+    page: Annotated[
+        int,
+        typer.Option("--page", "-p", help="Page number."),
+    ] = 1,
+    time_range: Annotated[
+        str | None,
+        typer.Option("--time-range", "-t", help="Time range: day, week, month, year."),
+    ] = None,
+    safe_search: Annotated[
+        int | None,
+        typer.Option("--safe-search", help="Safe search level: 0, 1, or 2."),
+    ] = None,
+    no_cache: Annotated[
+        bool,
+        typer.Option("--no-cache", help="Bypass the search response cache."),
+    ] = False,
+    export: Annotated[
+        Path | None,
+        typer.Option(
+            "--export",
+            help="Append the results to a dataset: CSV (*.csv), SQLite (*.db, *.sqlite) or Parquet (*.parquet).",
+        ),
+    ] = None,
+) -> None:
+    """Run many searches concurrently, one query per input line.
+
+    Writes one JSON record per query to stdout as soon as it finishes.
+    Failed queries are reported inline with an "error" field.
+    """
+    from .batch import read_queries, run_batch
+
+    client = _ctx.get_client()
+    categories, engines, language = _filter_defaults(categories, engines, language)
+
+    _check_export(export)
+    # Opened with the first result, so a run where every query fails leaves no dataset behind.
+    exporter: Exporter | None = None
+    lines = _open_queries(input_file)
+    total = 0
+    failed = 0
+    try:
+        for result in run_batch(
+            client,
+            read_queries(lines),
+            concurrency=concurrency,
+            categories=categories,
+            engines=engines,
+            language=language,
+            page=page,
+            time_range=time_range,
+            safe_search=safe_search,
+            use_cache=not no_cache,
+        ):
+            total += 1
+            if not result.ok:
+                failed += 1
+            elif export is not None:
+                if exporter is None:
+                    exporter = _open_export(export)
+                exporter.add(result.query, page, result.response.results)
+            sys.stdout.write(json.dumps(result.to_dict()) + "\n")
+            sys.stdout.flush()
+    finally:
+        if lines is not sys.stdin:
+            lines.close()
+        if exporter is not None:
+            exporter.close()
+
+    logger.debug("Batch finished: %d queries, %d failed", total, failed)
+    if failed:
+        get_error_console().print(f"[yellow]{failed} of {total} queries failed[/yellow]")
+        raise typer.Exit(1)
+
+
+def _check_export(path: Path | None) -> None:
+    """Reject an unknown dataset format before any search runs."""
+    if path is None:
+        return
+    from .export import export_format
+
+    try:
+        export_format(path)
+    except ValueError as e:
+        get_error_console().print(f"[red]Cannot export to {path}: {e}[/red]")
+        raise typer.Exit(1) from None
+
+
+def _open_export(path: Path | None) -> "Exporter | None":
+    """Open a dataset to append results to, if one was given."""
+    if path is None:
+        return None
+    from .export import open_exporter
+
+    try:
+        return open_exporter(path)
+    except (ImportError, OSError, ValueError) as e:
+        get_error_console().print(f"[red]Cannot export to {path}: {e}[/red]")
+        raise typer.Exit(1) from None
+
+
+def _open_queries(input_file: str) -> TextIO:
+    """Open a query list file, or stdin for '-'."""
+    if input_file == "-":
+        return sys.stdin
+    try:
+        return open(input_file)  # noqa: SIM115
+    except OSError as e:
+        get_error_console().print(f"[red]Cannot read queries: {e}[/red]")
+        raise typer.Exit(1) from None
+
+
+@app.command("watch")
+def watch_command(
+    queries: Annotated[
+        list[str] | None,
+        typer.Argument(help="Queries to watch."),
+    ] = None,
+    input_file: Annotated[
+        str | None,
+        typer.Option("--file", "-f", help="File with one query per line to watch, or '-' for stdin."),
+    ] = None,
+    interval: Annotated[
+        str,
+        typer.Option("--interval", "-i", help="Time between runs of each query, e.g. 30s, 10m, 1h."),
+    ] = "10m",
+    once: Annotated[
+        bool,
+        typer.Option("--once", help="Run every query once and exit, e.g. from cron."),
+    ] = False,
+    concurrency: Annotated[
+        int,
+        typer.Option("--concurrency", "-j", help="Maximum number of concurrent searches.", min=1),
+    ] = DEFAULT_CONCURRENCY,
+    categories: Annotated[
+        str | None,
+        typer.Option("--categories", "-c", help="Comma-separated categories (general, images, news, videos, etc.)."),
+    ] = None,
+    engines: Annotated[
+        str | None,
+        typer.Option("--engines", "-e", help="Comma-separated engines."),
+    ] = None,
+    language: Annotated[
+        str | None,
+        typer.Option("--language", "-l", help="Language code (en, de, cs, etc.)."),
+    ] = None,
+    time_range: Annotated[
+        str | None,
+        typer.Option("--time-range", "-t", help="Time range: day, week, month, year."),
+    ] = None,
+    state: Annotated[
+        Path | None,
+        typer.Option("--state", help="Seen-set file, to keep separate watch lists apart."),
+    ] = None,
+) -> None:
+    """Re-run searches periodically and print only results not seen before.
+
+    Writes one JSON object per new result, with the query it was found by.
+    Seen URLs are remembered across runs in a fixed-size file.
+    """
+    from .batch import read_queries
+    from .watch import SEEN_FILENAME, SeenSet, Watcher, parse_interval
+
+    try:
+        seconds = parse_interval(interval)
+    except ValueError as e:
+        get_error_console().print(f"[red]{e}[/red]")
+        raise typer.Exit(1) from None
+
+    watched = list(queries or [])
+    if input_file is not None:
+        lines = _open_queries(input_file)
+        try:
+            watched.extend(read_queries(lines))
+        finally:
+            if lines is not sys.stdin:
+                lines.close()
+    if not watched:
+        get_error_console().print("[red]Nothing to watch: pass queries or --file[/red]")
+        raise typer.Exit(1)
+
+    categories, engines, language = _filter_defaults(categories, engines, language)
+    watcher = Watcher(
+        _ctx.get_client(),
+        SeenSet(state or get_cache_dir() / SEEN_FILENAME),
+        watched,
+        interval=seconds,
+        concurrency=concurrency,
+        categories=categories,
+        engines=engines,
+        language=language,
+        time_range=time_range,
+    )
+    failed = 0
+    try:
+        for event in watcher.run(rounds=1 if once else None):
+            if event.error is not None:
+                failed += 1
+                get_error_console().print(f"[yellow]{event.query}: {event.error}[/yellow]")
+                continue
+            sys.stdout.write(json.dumps(event.to_dict()) + "\n")
+            sys.stdout.flush()
+    except KeyboardInterrupt:
+        raise typer.Exit(130) from None
+
+    if once and failed:
+        raise typer.Exit(1)
+
+
+@app.command("engines")
+def engines_command(
+    refresh: Annotated[
+        bool,
+        typer.Option("--refresh", help="Revalidate the instance config before listing."),
+    ] = False,
+) -> None:
+    """List available search engines."""
+    from .formatter import print_engines
+
+    client = _ctx.get_client()
+    engines = client.get_engines(refresh=refresh)
+    print_engines(engines)
+
+
+@app.command("categories")
+def categories_command(
+    refresh: Annotated[
+        bool,
+        typer.Option("--refresh", help="Revalidate the instance config before listing."),
+    ] = False,
+) -> None:
+    """List available search categories."""
+    from .formatter import print_categories
+
+    client = _ctx.get_client()
+    categories = client.get_categories(refresh=refresh)
+    print_categories(categories)
+
+
+@config_app.command("show")
+def config_show() -> None:
+    """Show the current configuration."""
+    config_path = get_config_path()
+
+    if not config_path.exists():
+        get_error_console().print(f"[yellow]Config file not found: {config_path}[/yellow]")
+        raise typer.Exit(1)
+
+    try:
+        config = _ctx.get_config()
+    except Exception as e:
+        get_error_console().print(f"[red]Error loading config: {e}[/red]")
+        raise typer.Exit(1) from None
+
+    get_console().print(json.dumps(asdict(config), indent=2))
+    get_console().print(f"\n[dim]Config file: {config_path}[/dim]")
+
+
+@config_app.command("set")
+def config_set(
+    key: Annotated[str, typer.Argument(help="Config key to set.")],
+    value: Annotated[str, typer.Argument(help="Value to set.")],
+) -> None:
+    """Set a configuration value, in the selected profile if --profile is given."""
+    config_path = get_config_path()
+    profile = _ctx.config.profile if _ctx.config is not None else ""
+
+    try:
+        config = load_config()
+    except FileNotFoundError:
+        config = Config()
+
+    if key not in CONFIG_KEYS:
+        get_error_console().print(f"[red]Unknown config key: {key}[/red]")
+        get_error_console().print(f"[dim]Available keys: {', '.join(CONFIG_KEYS)}[/dim]")
+        raise typer.Exit(1)
+
+    if key == "base_url":
+        parsed = value.rstrip("/")
+    else:
+        try:
+            parsed = parse_config_value(key, value)
+        except ValueError as e:
+            get_error_console().print(f"[red]{e}[/red]")
+            raise typer.Exit(1) from None
+
+    if profile:
+        config.profiles[profile][key] = parsed
+    else:
+        setattr(config, key, parsed)
+
+    save_config(config)
+    get_console().print(f"[green]Set {key} = {value}[/green]")
+    get_console().print(f"[dim]Config file: {config_path}[/dim]")
+
+
+@app.command("daemon")
+def daemon_command(
+    idle_timeout: Annotated[
+        float | None,
+        typer.Option("--idle-timeout", help="Exit after this many seconds without requests."),
+    ] = None,
+    stop: Annotated[
+        bool,
+        typer.Option("--stop", help="Stop the running daemon."),
+    ] = False,
+    status: Annotated[
+        bool,
+        typer.Option("--status", help="Show the status of the running daemon."),
+    ] = False,
+) -> None:
+    """Run a resident daemon that keeps the client and caches warm.
+
+    While it runs, search, engines and categories invocations are forwarded
+    to it over a Unix socket. Set SEARXNG_NO_DAEMON=1 to bypass it.
+    """
+    from . import daemon
+
+    if stop:
+        if not daemon.stop():
+            get_error_console().print("[yellow]No daemon is running[/yellow]")
+            raise typer.Exit(1)
+        get_console().print("[green]Daemon stopped[/green]")
+        return
+
+    if status:
+        info = daemon.status()
+        if info is None:
+            get_error_console().print("[yellow]No daemon is running[/yellow]")
+            raise typer.Exit(1)
+        get_console().print(json.dumps(info, indent=2))
+        return
+
+    daemon.Daemon(idle_timeout=idle_timeout).serve()
+
+
+def _open_cache() -> "SearchCache":
+    """Open the search cache regardless of whether caching is enabled."""
+    from .cache import CACHE_FILENAME, SearchCache
+
+    try:
+        cache = _ctx.get_cache()
+    except (FileNotFoundError, ValueError):
+        cache = None
+    return cache or SearchCache(get_cache_dir() / CACHE_FILENAME)
+
+
+@cache_app.command("stats")
+def cache_stats() -> None:
+    """Show search cache statistics."""
+    stats = _open_cache().stats()
+    get_console().print(f"Entries: {stats.entries} ({stats.expired} expired)")
+    get_console().print(f"Size: {stats.size_bytes / 1024:.1f} KiB of {stats.max_size_bytes / 1024 / 1024:.0f} MiB")
+    get_console().print(f"\n[dim]Cache file: {stats.path}[/dim]")
+
+
+@cache_app.command("clear")
+def cache_clear() -> None:
+    """Remove all cached search responses."""
+    count = _open_cache().clear()
+    get_console().print(f"[green]Removed {count} cached responses[/green]")
+
+
+@cache_app.command("warm")
+def cache_warm(
+    input_file: Annotated[
+        str,
+        typer.Argument(help="File with one query per line, or '-' to read from stdin."),
+    ] = "-",
+    concurrency: Annotated[
+        int,
+        typer.Option("--concurrency", "-j", help="Maximum number of concurrent searches.", min=1),
+    ] = DEFAULT_CONCURRENCY,
+    categories: Annotated[
+        str | None,
+        typer.Option("--categories", "-c", help="Comma-separated categories (general, images, news, videos, etc.)."),
+    ] = None,
+    engines: Annotated[
+        str | None,
+        typer.Option("--engines", "-e", help="Comma-separated engines."),
+    ] = None,
+    language: Annotated[
+        str | None,
+        typer.Option("--language", "-l", help="Language code (en, de, cs, etc.)."),
+    ] = None,
+    page: Annotated[
+        int,
+        typer.Option("--page", "-p", help="Page number."),
+    ] = 1,
+    time_range: Annotated[
+        str | None,
+        typer.Option("--time-range", "-t", help="Time range: day, week, month, year."),
+    ] = None,
+    safe_search: Annotated[
+        int | None,
+        typer.Option("--safe-search", help="Safe search level: 0, 1, or 2."),
+    ] = None,
+) -> None:
+    """Pre-populate the cache by running searches for the given queries."""
+    from .batch import read_queries, run_batch
+
+    client = _ctx.get_client()
+    if client.cache is None:
+        get_error_console().print("[red]Caching is disabled (cache_ttl is 0)[/red]")
+        raise typer.Exit(1)
+    categories, engines, language = _filter_defaults(categories, engines, language)
+
+    lines = _open_queries(input_file)
+    warmed = 0
+    failed = 0
+    try:
+        for result in run_batch(
+            client,
+            read_queries(lines),
+            concurrency=concurrency,
+            categories=categories,
+            engines=engines,
+            language=language,
+            page=page,
+            time_range=time_range,
+            safe_search=safe_search,
+        ):
+            if result.ok:
+                warmed += 1
+            else:
+                failed += 1
+                get_error_console().print(f"[yellow]{result.query}: {result.error}[/yellow]")
+    finally:
+        if lines is not sys.stdin:
+            lines.close()
+
+    get_console().print(f"[green]Warmed {warmed} queries[/green]")
+    if failed:
+        get_error_console().print(f"[yellow]{failed} queries failed[/yellow]")
+        raise typer.Exit(1)
+
+
+@profile_app.command("report")
+def profile_report(
+    path: Annotated[
+        Path | None,
+        typer.Argument(
+            help="A profile run directory, or a --profile-output directory to report its latest run.  "
+            "[default: $SEARXNG_PROFILE]",
+        ),
+    ] = None,
+    top: Annotated[
+        int,
+        typer.Option("--top", "-n", help="Number of functions and allocation sites to show per phase.", min=1),
+    ] = 10,
+    phases: Annotated[
+        list[str] | None,
+        typer.Option("--phase", help="Only detail this phase (startup, config, http, model, render, other)."),
+    ] = None,
+) -> None:
+    """Summarize where a profiled command spent its time and memory."""
+    import os
+
+    from .profiling import PROFILE_ENV, find_run, format_report
+
+    if path is None:
+        if not os.environ.get(PROFILE_ENV):
+            get_error_console().print(f"[red]Give a profile directory or set {PROFILE_ENV}[/red]")
+            raise typer.Exit(1)
+        path = Path(os.environ[PROFILE_ENV])
+    try:
+        run_dir = find_run(path)
+        lines = format_report(run_dir, top=top, phases=phases)
+    except (FileNotFoundError, ValueError) as e:
+        get_error_console().print(f"[red]{e}[/red]")
+        raise typer.Exit(1) from None
+    sys.stdout.write("\n".join(lines) + "\n")
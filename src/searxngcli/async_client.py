@@ -0,0 +1,336 @@
+"""Asyncio SearXNG HTTP client for embedding in async services."""
+
+import asyncio
+import time
+from collections.abc import Awaitable, Callable, Iterable, Sequence
+from typing import TYPE_CHECKING, Any, TypeVar
+
+import httpx
+
+from .batch import DEFAULT_CONCURRENCY, BatchResult
+from .cache import cache_key
+from .client import (
+    KEEPALIVE_EXPIRY,
+    Attempts,
+    build_search_params,
+    conditional_headers,
+    decode_search_response,
+    engines_from_config,
+    snapshot_from_response,
+    store_search_data,
+)
+from .config import DEFAULT_CONNECT_TIMEOUT, DEFAULT_MAX_CONNECTIONS, DEFAULT_MAX_RETRIES, DEFAULT_TIMEOUT
+from .deadline import timed_out_engines, timeout_limit
+from .jsonutil import loads
+from .logging import get_logger
+from .metadata import ConfigSnapshot, validate_filters
+from .models import EngineInfo, SearchResponse
+from .pool import InstancePool
+from .ratelimit import AdaptiveLimiter
+from .suggest import normalize_prefix, parse_suggestions
+
+if TYPE_CHECKING:
+    from .cache import SearchCache
+    from .config import InstanceConfig
+    from .index import ResultIndex
+    from .metadata import MetadataStore
+    from .suggest import SuggestCache
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+
+
+class AsyncSearXNGClient:
+    """Asyncio counterpart of SearXNGClient with the same search and config API.
+
+    Request building, response handling, failover, retries and the adaptive
+    limiter are shared with the blocking client. Cache and snapshot file access
+    runs in worker threads so it never blocks the event loop. Use as an async
+    context manager, or call aclose() when done.
+
+    A search deadline is enforced with asyncio.wait_for and the instance's
+    timeout_limit, without hedged duplicates. Multi-page (search_pages) and
+    fused (search_fused) searches are only provided by SearXNGClient; with
+    asyncio, gather several search() calls instead.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        timeout: float = DEFAULT_TIMEOUT,
+        cache: "SearchCache | None" = None,
+        metadata: "MetadataStore | None" = None,
+        connect_timeout: float = DEFAULT_CONNECT_TIMEOUT,
+        max_connections: int = DEFAULT_MAX_CONNECTIONS,
+        http2: bool = False,
+        transport: httpx.AsyncBaseTransport | None = None,
+        instances: "Sequence[InstanceConfig] | None" = None,
+        rate_limit: float = 0.0,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        index: "ResultIndex | None" = None,
+        suggest_cache: "SuggestCache | None" = None,
+    ) -> None:
+        self.base_url = base_url
+        self.pool = InstancePool([(i.url, i.weight) for i in instances] if instances else [(base_url, 1.0)])
+        self.cache = cache
+        self.metadata = metadata
+        self.max_retries = max_retries
+        self.index = index
+        self.suggest_cache = suggest_cache
+        self.limiter = AdaptiveLimiter(rate=rate_limit, max_concurrency=max_connections)
+        self.http = httpx.AsyncClient(
+            timeout=httpx.Timeout(timeout, connect=connect_timeout, pool=None),
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+                keepalive_expiry=KEEPALIVE_EXPIRY,
+            ),
+            http2=http2,
+            transport=transport,
+        )
+        self._revalidation: asyncio.Task | None = None
+        self._inflight: dict[str, asyncio.Future] = {}
+
+    async def __aenter__(self) -> "AsyncSearXNGClient":
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        """Wait for background work and release pooled connections."""
+        if self._revalidation is not None:
+            await self._revalidation
+            self._revalidation = None
+        await self.http.aclose()
+        if self.cache is not None:
+            self.cache.close()
+        if self.index is not None:
+            self.index.close()
+
+    async def _get(self, path: str, **kwargs: Any) -> httpx.Response:
+        """GET a path with the same failover and retry rules as SearXNGClient."""
+        attempts = Attempts(self.pool, self.limiter, self.max_retries)
+        while True:
+            while (wait := self.limiter.try_acquire()) > 0:
+                await asyncio.sleep(wait)
+            instance = attempts.next_instance()
+            start = time.monotonic()
+            try:
+                response = await self.http.get(f"{instance.url}{path}", **kwargs)
+            except httpx.TransportError as e:
+                delay = attempts.failed(instance, e)
+                if delay is None:
+                    raise
+            except BaseException:
+                # Including cancellation, e.g. by asyncio.wait_for.
+                attempts.abandoned(instance)
+                raise
+            else:
+                delay = attempts.answered(instance, response, time.monotonic() - start)
+                if delay is None:
+                    return response
+            if delay:
+                await asyncio.sleep(delay)
+
+    async def search(
+        self,
+        query: str,
+        categories: str | None = None,
+        engines: str | None = None,
+        language: str | None = None,
+        page: int = 1,
+        time_range: str | None = None,
+        safe_search: int | None = None,
+        use_cache: bool = True,
+        deadline: float | None = None,
+    ) -> SearchResponse:
+        """Execute a search query; see SearXNGClient.search.
+
+        With a deadline in seconds, an empty response marked partial is
+        returned if nothing arrives in time; slow requests are not hedged.
+        """
+        if self.metadata is not None and (categories or engines):
+            await self._validate_filters(categories, engines)
+
+        params = build_search_params(query, categories, engines, language, page, time_range, safe_search)
+        logger.debug("Search params: %s", params)
+
+        key = cache_key(self.base_url, params)
+        use_cache = use_cache and self.cache is not None
+        if use_cache:
+            cached = await asyncio.to_thread(self.cache.get, key)
+            if cached is not None:
+                logger.debug("Cache hit for %s", key)
+                return SearchResponse.from_dict(cached)
+
+        if deadline is None:
+            data = await self._coalesce(key, lambda: self._fetch_search(key, params, store=use_cache))
+        else:
+            deadline_params = {**params, "timeout_limit": timeout_limit(deadline)}
+            fetch = self._coalesce(f"{key}:deadline", lambda: self._fetch_search(key, deadline_params, store=False))
+            try:
+                data = await asyncio.wait_for(fetch, deadline)
+            except asyncio.TimeoutError:
+                logger.debug("No response within the %.0f ms deadline", deadline * 1000)
+                return SearchResponse(query=query, partial=True)
+            # A response missing engines that timed out must not stand in for a full one.
+            if use_cache and not timed_out_engines(data):
+                await asyncio.to_thread(self.cache.put, key, params, data)
+        response = SearchResponse.from_dict(data)
+        response.partial = deadline is not None and bool(timed_out_engines(data))
+        return response
+
+    async def _validate_filters(self, categories: str | None, engines: str | None) -> None:
+        assert self.metadata is not None
+        snapshot = await asyncio.to_thread(self.metadata.load)
+        if snapshot is None:
+            return
+        try:
+            validate_filters(snapshot, categories=categories, engines=engines)
+        except ValueError as e:
+            if not self.metadata.is_stale(snapshot):
+                raise
+            try:
+                snapshot = await self._revalidate_config(snapshot)
+            except httpx.HTTPError as refresh_error:
+                logger.warning("%s; could not refresh instance config to check: %s", e, refresh_error)
+                return
+            validate_filters(snapshot, categories=categories, engines=engines)
+
+    async def _fetch_search(self, key: str, params: dict, store: bool) -> dict:
+        response = await self._get("/search", params=params)
+        data = decode_search_response(response, self.limiter)
+        cache = self.cache if store else None
+        if cache is not None or self.index is not None:
+            await asyncio.to_thread(store_search_data, data, key, params, cache, self.index)
+        return data
+
+    async def _coalesce(self, key: str, fetch: Callable[[], Awaitable[T]]) -> T:
+        """Await fetch, or an identical in-flight call and share its result.
+
+        If the call being shared is cancelled, its followers are not: one of
+        them takes over and the rest join it.
+        """
+        while (future := self._inflight.get(key)) is not None:
+            logger.debug("Joining in-flight request %s", key)
+            try:
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                if not future.cancelled():
+                    raise
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            result = await fetch()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            # Followers re-raise it; don't warn about an unretrieved exception.
+            future.exception()
+            raise
+        finally:
+            del self._inflight[key]
+        future.set_result(result)
+        return result
+
+    async def search_many(
+        self,
+        queries: Iterable[str],
+        concurrency: int = DEFAULT_CONCURRENCY,
+        **search_kwargs: Any,
+    ) -> list[BatchResult]:
+        """Run searches with at most concurrency in flight, results in input order.
+
+        Failures are captured per query, as in the batch command.
+        """
+        if concurrency < 1:
+            raise ValueError("Concurrency must be at least 1")
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def run(index: int, query: str) -> BatchResult:
+            async with semaphore:
+                try:
+                    response = await self.search(query, **search_kwargs)
+                except Exception as e:
+                    logger.debug("Query %r failed: %s", query, e)
+                    return BatchResult(index=index, query=query, error=str(e) or type(e).__name__)
+            return BatchResult(index=index, query=query, response=response)
+
+        return list(await asyncio.gather(*(run(i, q) for i, q in enumerate(queries))))
+
+    async def autocomplete(self, prefix: str, use_cache: bool = True) -> list[str]:
+        """Get search suggestions for a partially typed query; see SearXNGClient.autocomplete."""
+        key = normalize_prefix(prefix)
+        if not key.strip():
+            return []
+        use_cache = use_cache and self.suggest_cache is not None
+        if use_cache:
+            cached = await asyncio.to_thread(self.suggest_cache.lookup, key)
+            if cached is not None:
+                logger.debug("Suggestion cache hit for %r", key)
+                return cached
+
+        return await self._coalesce(f"suggest:{key}", lambda: self._fetch_suggestions(key, store=use_cache))
+
+    async def _fetch_suggestions(self, key: str, store: bool) -> list[str]:
+        response = await self._get("/autocompleter", params={"q": key})
+        response.raise_for_status()
+        suggestions = parse_suggestions(loads(response.content))
+
+        if store:
+            self.suggest_cache.store(key, suggestions)
+            try:
+                await asyncio.to_thread(self.suggest_cache.save)
+            except OSError as e:
+                logger.warning("Could not save the suggestion cache: %s", e)
+        return suggestions
+
+    async def get_config(self, refresh: bool = False) -> dict:
+        """Get the SearXNG instance configuration; see SearXNGClient.get_config."""
+        if self.metadata is None:
+            return (await self.fetch_config()).data
+
+        snapshot = await asyncio.to_thread(self.metadata.load)
+        if snapshot is None:
+            snapshot = await self.fetch_config()
+            await asyncio.to_thread(self.metadata.save, snapshot)
+        elif refresh:
+            try:
+                snapshot = await self._revalidate_config(snapshot)
+            except httpx.HTTPError as e:
+                logger.warning("Could not refresh instance config, using local snapshot: %s", e)
+        elif self.metadata.is_stale(snapshot) and (self._revalidation is None or self._revalidation.done()):
+            self._revalidation = asyncio.create_task(self._revalidate_in_background(snapshot))
+
+        return snapshot.data
+
+    async def fetch_config(self, snapshot: ConfigSnapshot | None = None) -> ConfigSnapshot:
+        """Download /config, conditionally if a previous snapshot is given."""
+        response = await self._get("/config", headers=conditional_headers(snapshot))
+        return snapshot_from_response(response, snapshot)
+
+    async def _revalidate_config(self, snapshot: ConfigSnapshot) -> ConfigSnapshot:
+        assert self.metadata is not None
+        snapshot = await self.fetch_config(snapshot)
+        await asyncio.to_thread(self.metadata.save, snapshot)
+        return snapshot
+
+    async def _revalidate_in_background(self, snapshot: ConfigSnapshot) -> None:
+        try:
+            await self._revalidate_config(snapshot)
+        except httpx.HTTPError as e:
+            logger.debug("Background config revalidation failed: %s", e)
+
+    async def get_engines(self, refresh: bool = False) -> list[EngineInfo]:
+        """Get list of available engines."""
+        return engines_from_config(await self.get_config(refresh=refresh))
+
+    async def get_categories(self, refresh: bool = False) -> list[str]:
+        """Get list of available categories."""
+        config = await self.get_config(refresh=refresh)
+        return config.get("categories", [])
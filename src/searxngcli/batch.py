@@ -0,0 +1,89 @@
+"""Concurrent batch search execution."""
+
+from collections.abc import Iterable, Iterator
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+from .logging import get_logger
+
+if TYPE_CHECKING:
+    from .client import SearXNGClient
+    from .models import SearchResponse
+
+logger = get_logger(__name__)
+
+DEFAULT_CONCURRENCY = 4
+
+
+@dataclass
+class BatchResult:
+    """Outcome of a single query within a batch."""
+
+    index: int
+    query: str
+    response: "SearchResponse | None" = None
+    error: str | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    def to_dict(self) -> dict:
+        data: dict[str, Any] = {"index": self.index, "query": self.query}
+        if self.response is not None:
+            data["response"] = self.response.to_dict()
+        if self.error is not None:
+            data["error"] = self.error
+        return data
+
+
+def read_queries(lines: Iterable[str]) -> Iterator[str]:
+    """Yield queries from lines, skipping blank lines and # comments."""
+    for line in lines:
+        query = line.strip()
+        if query and not query.startswith("#"):
+            yield query
+
+
+def run_batch(
+    client: "SearXNGClient",
+    queries: Iterable[str],
+    concurrency: int = DEFAULT_CONCURRENCY,
+    **search_kwargs: Any,
+) -> Iterator[BatchResult]:
+    """Run queries concurrently and yield results in completion order.
+
+    Queries are consumed lazily, so at most ``concurrency`` searches are in flight
+    and the input may be an unbounded stream. Failures are captured per query.
+    """
+    if concurrency < 1:
+        raise ValueError("Concurrency must be at least 1")
+
+    query_iter = enumerate(queries)
+    pending: dict[Future, tuple[int, str]] = {}
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+
+        def submit_next() -> bool:
+            try:
+                index, query = next(query_iter)
+            except StopIteration:
+                return False
+            future = executor.submit(client.search, query=query, **search_kwargs)
+            pending[future] = (index, query)
+            return True
+
+        while len(pending) < concurrency and submit_next():
+            pass
+
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                index, query = pending.pop(future)
+                try:
+                    yield BatchResult(index=index, query=query, response=future.result())
+                except Exception as e:
+                    logger.debug("Query %r failed: %s", query, e)
+                    yield BatchResult(index=index, query=query, error=str(e) or type(e).__name__)
+                submit_next()
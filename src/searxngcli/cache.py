@@ -0,0 +1,188 @@
+"""On-disk cache of search responses."""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+
+from .jsonutil import dumpb, loads
+from .logging import get_logger
+
+logger = get_logger(__name__)
+
+CACHE_FILENAME = "search.db"
+DEFAULT_TTL = 300
+DEFAULT_MAX_SIZE = 50 * 1024 * 1024
+
+# Fraction of max_size to shrink to when evicting, so that eviction doesn't run on every insert.
+EVICTION_TARGET = 0.9
+
+CACHE_KEY_PARAMS = ("q", "pageno", "categories", "engines", "language", "time_range", "safesearch")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    params TEXT NOT NULL,
+    data BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    expires_at REAL NOT NULL,
+    accessed_at REAL NOT NULL
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS entries_accessed_at ON entries (accessed_at);
+"""
+
+
+def normalize_params(params: dict) -> dict[str, str]:
+    """Reduce search params to the canonical form used for cache keys."""
+    normalized: dict[str, str] = {}
+    for name in CACHE_KEY_PARAMS:
+        value = params.get(name)
+        if value is None or value == "":
+            continue
+        if name in ("categories", "engines"):
+            items = {item.strip().lower() for item in str(value).split(",")}
+            value = ",".join(sorted(item for item in items if item))
+        elif name == "q":
+            value = " ".join(str(value).split())
+        normalized[name] = str(value)
+    return normalized
+
+
+def cache_key(base_url: str, params: dict) -> str:
+    """Build a stable cache key for a search against an instance."""
+    payload = json.dumps({"base_url": base_url, **normalize_params(params)}, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+@dataclass
+class CacheStats:
+    """Summary of the cache contents."""
+
+    path: Path
+    entries: int
+    expired: int
+    size_bytes: int
+    max_size_bytes: int
+
+
+class SearchCache:
+    """SQLite-backed cache of raw search responses with TTL and LRU eviction.
+
+    Entries are stored as zlib-compressed JSON. SQLite's locking makes the cache
+    safe to share between concurrently running CLI processes.
+    """
+
+    def __init__(self, path: Path, ttl: float = DEFAULT_TTL, max_size: int = DEFAULT_MAX_SIZE) -> None:
+        self.path = path
+        self.ttl = ttl
+        self.max_size = max_size
+        self._conn: sqlite3.Connection | None = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=10.0, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(_SCHEMA)
+            self._conn = conn
+        return self._conn
+
+    def get(self, key: str) -> dict | None:
+        """Return the cached response data, or None if missing or expired."""
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            row = conn.execute("SELECT data, expires_at FROM entries WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            data, expires_at = row
+            if expires_at <= now:
+                conn.execute("DELETE FROM entries WHERE key = ? AND expires_at <= ?", (key, now))
+                return None
+            conn.execute("UPDATE entries SET accessed_at = ? WHERE key = ?", (now, key))
+
+        try:
+            return loads(zlib.decompress(data))
+        except (zlib.error, ValueError) as e:
+            logger.debug("Dropping corrupt cache entry %s: %s", key, e)
+            self.delete(key)
+            return None
+
+    def put(self, key: str, params: dict, data: dict, ttl: float | None = None) -> None:
+        """Store response data and evict entries if the cache grew too large."""
+        now = time.time()
+        blob = zlib.compress(dumpb(data))
+        ttl = self.ttl if ttl is None else ttl
+        with self._lock:
+            conn = self._connect()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.execute(
+                    "INSERT OR REPLACE INTO entries (key, params, data, size, created_at, expires_at, accessed_at)"
+                    " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (key, json.dumps(normalize_params(params)), blob, len(blob), now, now + ttl, now),
+                )
+                self._evict(conn, now)
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+
+    def _evict(self, conn: sqlite3.Connection, now: float) -> None:
+        conn.execute("DELETE FROM entries WHERE expires_at <= ?", (now,))
+        (total,) = conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()
+        if total <= self.max_size:
+            return
+
+        target = int(self.max_size * EVICTION_TARGET)
+        evict: list[tuple[str]] = []
+        for key, size in conn.execute("SELECT key, size FROM entries ORDER BY accessed_at"):
+            if total <= target:
+                break
+            evict.append((key,))
+            total -= size
+        conn.executemany("DELETE FROM entries WHERE key = ?", evict)
+        logger.debug("Evicted %d cache entries", len(evict))
+
+    def delete(self, key: str) -> None:
+        """Remove a single entry."""
+        with self._lock:
+            self._connect().execute("DELETE FROM entries WHERE key = ?", (key,))
+
+    def clear(self) -> int:
+        """Remove all entries and return how many were removed."""
+        with self._lock:
+            conn = self._connect()
+            count = conn.execute("DELETE FROM entries").rowcount
+            conn.execute("VACUUM")
+        return count
+
+    def stats(self) -> CacheStats:
+        """Return statistics about the cache contents."""
+        with self._lock:
+            conn = self._connect()
+            row = conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(expires_at <= ?), 0), COALESCE(SUM(size), 0) FROM entries",
+                (time.time(),),
+            ).fetchone()
+        entries, expired, size = row
+        return CacheStats(
+            path=self.path,
+            entries=entries,
+            expired=expired,
+            size_bytes=size,
+            max_size_bytes=self.max_size,
+        )
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
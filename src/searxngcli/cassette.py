@@ -0,0 +1,181 @@
+"""Recording HTTP exchanges with SearXNG instances and replaying them offline.
+
+A cassette is a gzip-compressed JSON lines file. A header line carries
+CASSETTE_VERSION, then every exchange takes two lines: its metadata (request
+method, path and query, response status and headers, and how long the
+response took) and the response body as a JSON string. Bodies are only
+decoded when replayed, so loading a cassette parses just the small metadata
+lines into an index keyed by request, and lookups stay constant-time however
+many exchanges it holds.
+
+Requests are matched on method, path and query parameters, ignoring the
+instance they were sent to and parameters that vary between runs
+(IGNORED_PARAMS). A request recorded several times is answered with its
+recordings in order, the last one repeating.
+"""
+
+import base64
+import gzip
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+from urllib.parse import urlencode
+
+import httpx
+
+from . import jsonutil
+from .logging import get_logger
+
+logger = get_logger(__name__)
+
+CASSETTE_VERSION = 1
+# Recording shouldn't slow down the run it records; higher levels barely shrink JSON further.
+COMPRESS_LEVEL = 6
+# Set from the time left before a deadline, so they differ between runs of the same search.
+IGNORED_PARAMS = frozenset({"timeout_limit"})
+# Bodies are stored decoded, and their length is set again on replay.
+STRIPPED_HEADERS = frozenset({"content-encoding", "content-length", "transfer-encoding", "connection", "keep-alive"})
+
+
+class CassetteMissError(LookupError):
+    """A replayed request has no recorded response."""
+
+
+def request_key(method: str, url: httpx.URL) -> str:
+    """The key a request is recorded and looked up by."""
+    params = sorted((k, v) for k, v in url.params.multi_items() if k not in IGNORED_PARAMS)
+    return f"{method} {url.path}?{urlencode(params)}"
+
+
+class RecordingTransport(httpx.BaseTransport):
+    """Passes requests on to a transport and writes every exchange to a cassette.
+
+    The cassette is written to a temporary file and replaces path once the
+    transport is closed, so an interrupted recording leaves any previous
+    cassette in place.
+    """
+
+    def __init__(self, path: Path, transport: httpx.BaseTransport) -> None:
+        self.path = path
+        self.recorded = 0
+        self._transport = transport
+        self._lock = threading.Lock()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, self._tmp_path = tempfile.mkstemp(dir=path.parent, prefix=".cassette-")
+        os.close(fd)
+        self._file = gzip.open(self._tmp_path, "wt", compresslevel=COMPRESS_LEVEL, encoding="utf-8")  # noqa: SIM115
+        self._file.write(jsonutil.dumps({"cassette": CASSETTE_VERSION}) + "\n")
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        start = time.monotonic()
+        response = self._transport.handle_request(request)
+        try:
+            body = response.read()
+        finally:
+            response.close()
+        latency = time.monotonic() - start
+
+        meta = {
+            "key": request_key(request.method, request.url),
+            "status": response.status_code,
+            "headers": [[k, v] for k, v in response.headers.multi_items() if k.lower() not in STRIPPED_HEADERS],
+            "latency": round(latency, 4),
+        }
+        try:
+            text = body.decode()
+        except UnicodeDecodeError:
+            meta["base64"] = True
+            text = base64.b64encode(body).decode()
+        with self._lock:
+            if self._file.closed:
+                # An abandoned request finishing after close, e.g. a late engine of a fused search.
+                return response
+            self._file.write(jsonutil.dumps(meta) + "\n" + jsonutil.dumps(text) + "\n")
+            self.recorded += 1
+        return response
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file.closed:
+                return
+            try:
+                self._file.close()
+                os.replace(self._tmp_path, self.path)
+            except BaseException:
+                Path(self._tmp_path).unlink(missing_ok=True)
+                raise
+            finally:
+                self._transport.close()
+        logger.debug("Recorded %d exchanges to %s", self.recorded, self.path)
+
+
+class _Recording:
+    __slots__ = ("status", "headers", "latency", "base64", "body")
+
+    def __init__(self, meta: dict, body: str) -> None:
+        self.status: int = meta["status"]
+        self.headers: list[list[str]] = meta["headers"]
+        self.latency: float = meta["latency"]
+        self.base64: bool = meta.get("base64", False)
+        # Kept as the encoded JSON line until the exchange is replayed.
+        self.body = body
+
+
+class ReplayTransport(httpx.BaseTransport):
+    """Answers requests from a cassette, without touching the network.
+
+    With latency above zero, every response is delayed by its recorded
+    latency times that factor (1.0 replays at recorded speed), and a request
+    whose delay exceeds its read timeout times out like a live one would.
+    """
+
+    def __init__(self, path: Path, latency: float = 0.0) -> None:
+        if latency < 0:
+            raise ValueError("Replay latency factor can't be negative")
+        self.path = path
+        self.latency = latency
+        self._index: dict[str, list[_Recording]] = {}
+        self._served: dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._load()
+
+    def __len__(self) -> int:
+        return sum(len(recordings) for recordings in self._index.values())
+
+    def _load(self) -> None:
+        with gzip.open(self.path, "rt", encoding="utf-8") as f:
+            header = jsonutil.loads(f.readline() or "null")
+            if not isinstance(header, dict) or header.get("cassette") != CASSETTE_VERSION:
+                raise ValueError(f"{self.path} is not a cassette of version {CASSETTE_VERSION}")
+            while line := f.readline():
+                meta = jsonutil.loads(line)
+                body = f.readline()
+                if not body:
+                    logger.warning("Ignoring the truncated last exchange of %s", self.path)
+                    break
+                self._index.setdefault(meta["key"], []).append(_Recording(meta, body))
+        logger.debug("Loaded %d exchanges from %s", len(self), self.path)
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        key = request_key(request.method, request.url)
+        with self._lock:
+            recordings = self._index.get(key)
+            if recordings is None:
+                raise CassetteMissError(f"No recorded response for {key} in {self.path}")
+            served = self._served.get(key, 0)
+            self._served[key] = served + 1
+        recording = recordings[min(served, len(recordings) - 1)]
+
+        if self.latency:
+            delay = recording.latency * self.latency
+            read_timeout = request.extensions.get("timeout", {}).get("read")
+            if read_timeout is not None and delay > read_timeout:
+                time.sleep(read_timeout)
+                raise httpx.ReadTimeout(f"Replayed response took {delay:.2f} s", request=request)
+            time.sleep(delay)
+
+        text = jsonutil.loads(recording.body)
+        content = base64.b64decode(text) if recording.base64 else text.encode()
+        return httpx.Response(recording.status, headers=recording.headers, content=content, request=request)
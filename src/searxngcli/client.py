@@ -1,21 +1,384 @@
 """SearXNG HTTP client."""
 
+import math
+import sqlite3
+import threading
+import time
+from collections.abc import Callable, Sequence
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import TYPE_CHECKING, Any, TypeVar
+
 import httpx
 
+from .cache import cache_key
+from .config import DEFAULT_CONNECT_TIMEOUT, DEFAULT_MAX_CONNECTIONS, DEFAULT_MAX_RETRIES, DEFAULT_TIMEOUT
+from .deadline import LatencyHistory, timed_out_engines, timeout_limit
+from .jsonutil import loads
 from .logging import get_logger
+from .merge import ResultMerger, fuse_responses, merge_responses
+from .metadata import ConfigSnapshot, validate_filters
 from .models import EngineInfo, SearchResponse
+from .pool import FAILURE_STATUS_CODES, Instance, InstancePool
+from .profiling import phase
+from .ratelimit import RETRY_STATUS_CODES, AdaptiveLimiter, backoff_delay, parse_retry_after
+from .suggest import normalize_prefix, parse_suggestions
+from .timings import measure
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from .cache import SearchCache
+    from .config import InstanceConfig
+    from .index import ResultIndex
+    from .metadata import MetadataStore
+    from .suggest import SuggestCache
+    from .timings import Timings
 
 logger = get_logger(__name__)
 
-DEFAULT_TIMEOUT = 30.0
+T = TypeVar("T")
+
+KEEPALIVE_EXPIRY = 30.0
+
+# Results per page assumed when planning how many pages to fetch at once.
+DEFAULT_PAGE_SIZE = 20
+DEFAULT_MAX_PAGES = 10
+
+
+def build_search_params(
+    query: str,
+    categories: str | None = None,
+    engines: str | None = None,
+    language: str | None = None,
+    page: int = 1,
+    time_range: str | None = None,
+    safe_search: int | None = None,
+) -> dict[str, str | int]:
+    """Build the /search query parameters."""
+    params: dict[str, str | int] = {
+        "q": query,
+        "format": "json",
+        "pageno": page,
+    }
+
+    if categories:
+        params["categories"] = categories
+    if engines:
+        params["engines"] = engines
+    if language:
+        params["language"] = language
+    if time_range:
+        params["time_range"] = time_range
+    if safe_search is not None:
+        params["safesearch"] = safe_search
+    return params
+
+
+def conditional_headers(snapshot: ConfigSnapshot | None) -> dict[str, str]:
+    """Validators for a conditional /config request."""
+    headers = {}
+    if snapshot is not None:
+        if snapshot.etag:
+            headers["If-None-Match"] = snapshot.etag
+        if snapshot.last_modified:
+            headers["If-Modified-Since"] = snapshot.last_modified
+    return headers
+
+
+def snapshot_from_response(response: httpx.Response, snapshot: ConfigSnapshot | None = None) -> ConfigSnapshot:
+    """Turn a /config response into a snapshot.
+
+    Returns the given snapshot with a fresh timestamp when the server answered
+    304 Not Modified.
+    """
+    if snapshot is not None and response.status_code == 304:
+        logger.debug("Instance config not modified")
+        snapshot.fetched_at = time.time()
+        return snapshot
+
+    response.raise_for_status()
+    return ConfigSnapshot(
+        data=loads(response.content),
+        etag=response.headers.get("ETag"),
+        last_modified=response.headers.get("Last-Modified"),
+        fetched_at=time.time(),
+    )
+
+
+def engines_from_config(config: dict) -> list[EngineInfo]:
+    return [EngineInfo.from_dict(e) for e in config.get("engines", [])]
+
+
+def decode_search_response(
+    response: httpx.Response, limiter: AdaptiveLimiter, timings: "Timings | None" = None
+) -> dict:
+    """Check and decode a /search response, letting the limiter see its unresponsive engines."""
+    response.raise_for_status()
+    with measure(timings, "decode"):
+        data = loads(response.content)
+    logger.debug("Got %d results", len(data.get("results", [])))
+    limiter.observe_unresponsive(len(data.get("unresponsive_engines", [])))
+    return data
+
+
+def store_search_data(
+    data: dict, key: str, params: dict, cache: "SearchCache | None", index: "ResultIndex | None"
+) -> None:
+    """Put a decoded /search response in the cache and its results in the local index, where given."""
+    if cache is not None:
+        cache.put(key, params, data)
+    if index is not None:
+        try:
+            index.add(str(params["q"]), data.get("results", []))
+        except sqlite3.Error as e:
+            logger.warning("Could not add results to the local index: %s", e)
+
+
+class Attempts:
+    """Failover and retry bookkeeping for one logical request.
+
+    Failed instances are ejected for a cool-down period (at least as long as
+    their Retry-After) and the request moves on to another healthy instance.
+    Once none is left, connection errors, 429 and 502-504 are retried up to
+    max_retries times after a jittered backoff. The sync and async clients
+    share this and only differ in how they wait.
+    """
+
+    def __init__(self, pool: InstancePool, limiter: AdaptiveLimiter, max_retries: int) -> None:
+        self.pool = pool
+        self.limiter = limiter
+        self.max_retries = max_retries
+        self.tried: set[str] = set()
+        self.attempt = 0
+
+    def next_instance(self) -> Instance:
+        instance = self.pool.acquire(exclude=self.tried)
+        self.tried.add(instance.url)
+        return instance
+
+    def failed(self, instance: Instance, error: httpx.TransportError) -> float | None:
+        """Record a transport error; returns the delay before the next attempt, or None to give up."""
+        self.limiter.release(None, ok=False)
+        self.pool.release(instance, ok=False)
+        if self.pool.has_healthy(exclude=self.tried):
+            logger.warning("Request to %s failed (%s), retrying on another instance", instance.url, error)
+            return 0.0
+        # A read timeout already took the whole timeout, don't wait for it again.
+        delay = None if isinstance(error, httpx.ReadTimeout) else self._retry_delay()
+        if delay is not None:
+            logger.warning("Request to %s failed (%s), retrying in %.1f s", instance.url, error, delay)
+        return delay
+
+    def answered(self, instance: Instance, response: httpx.Response, latency: float) -> float | None:
+        """Record a response; returns the delay before the next attempt, or None to use this response."""
+        failed = response.status_code in FAILURE_STATUS_CODES
+        retry_after = parse_retry_after(response.headers.get("Retry-After")) if failed else None
+        self.limiter.release(latency, ok=not failed)
+        self.pool.release(instance, ok=not failed, retry_after=retry_after)
+        if not failed:
+            return None
+        if self.pool.has_healthy(exclude=self.tried):
+            logger.warning("%s answered %d, retrying on another instance", instance.url, response.status_code)
+            return 0.0
+        if response.status_code not in RETRY_STATUS_CODES:
+            return None
+        delay = self._retry_delay(retry_after)
+        if delay is not None:
+            logger.warning("%s answered %d, retrying in %.1f s", instance.url, response.status_code, delay)
+        return delay
+
+    def abandoned(self, instance: Instance) -> None:
+        """Release an attempt that ended in an error unrelated to the instance, or was cancelled."""
+        self.limiter.cancel()
+        self.pool.cancel(instance)
+
+    def _retry_delay(self, retry_after: float | None = None) -> float | None:
+        if self.attempt >= self.max_retries:
+            return None
+        delay = backoff_delay(self.attempt, retry_after)
+        if delay is not None:
+            self.attempt += 1
+            self.tried.clear()
+        return delay
+
+
+def _start_daemon(fn: Callable[..., T], *args: Any, **kwargs: Any) -> "Future[T]":
+    """Run fn in a daemon thread; unlike executor workers it does not hold up interpreter exit."""
+    future: Future[T] = Future()
+
+    def run() -> None:
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            result = fn(*args, **kwargs)
+        except BaseException as e:
+            future.set_exception(e)
+        else:
+            future.set_result(result)
+
+    threading.Thread(target=run, name="searxng-fanout", daemon=True).start()
+    return future
 
 
 class SearXNGClient:
-    """Client for interacting with a SearXNG instance."""
+    """Client for interacting with a SearXNG instance, or a pool of instances.
 
-    def __init__(self, base_url: str, timeout: float = DEFAULT_TIMEOUT) -> None:
+    With several instances, requests are balanced across them and failed
+    requests are retried on a healthy peer; base_url stays the primary instance
+    that identifies cached data. Requests share one keep-alive connection pool,
+    created on first use. With record, every exchange is also written to that
+    cassette file, to be replayed later through a cassette.ReplayTransport.
+    The client is thread-safe and should be closed when no longer needed,
+    preferably by using it as a context manager.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        timeout: float = DEFAULT_TIMEOUT,
+        cache: "SearchCache | None" = None,
+        metadata: "MetadataStore | None" = None,
+        connect_timeout: float = DEFAULT_CONNECT_TIMEOUT,
+        max_connections: int = DEFAULT_MAX_CONNECTIONS,
+        http2: bool = False,
+        transport: httpx.BaseTransport | None = None,
+        instances: "Sequence[InstanceConfig] | None" = None,
+        timings: "Timings | None" = None,
+        rate_limit: float = 0.0,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        index: "ResultIndex | None" = None,
+        suggest_cache: "SuggestCache | None" = None,
+        latency: LatencyHistory | None = None,
+        record: "Path | None" = None,
+    ) -> None:
         self.base_url = base_url
+        self.pool = InstancePool([(i.url, i.weight) for i in instances] if instances else [(base_url, 1.0)])
         self.timeout = timeout
+        self.cache = cache
+        self.metadata = metadata
+        self.connect_timeout = connect_timeout
+        self.max_connections = max_connections
+        self.http2 = http2
+        self.transport = transport
+        self.timings = timings
+        self.max_retries = max_retries
+        self.index = index
+        self.suggest_cache = suggest_cache
+        self.latency = latency if latency is not None else LatencyHistory()
+        self.record = record
+        self.limiter = AdaptiveLimiter(rate=rate_limit, max_concurrency=max_connections)
+        self._http: httpx.Client | None = None
+        self._http_lock = threading.Lock()
+        self._revalidation: threading.Thread | None = None
+        self._inflight: dict[str, Future] = {}
+        self._inflight_lock = threading.Lock()
+
+    def __enter__(self) -> "SearXNGClient":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    @property
+    def http(self) -> httpx.Client:
+        """The shared HTTP connection pool."""
+        if self._http is None:
+            with self._http_lock:
+                if self._http is None:
+                    self._http = self._create_http_client()
+        return self._http
+
+    def _create_http_client(self) -> httpx.Client:
+        http2 = self.http2
+        if http2:
+            try:
+                import h2  # noqa: F401
+            except ImportError:
+                logger.warning("HTTP/2 requires the 'h2' package (pip install 'searxngcli[http2]'), using HTTP/1.1")
+                http2 = False
+
+        limits = httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_connections,
+            keepalive_expiry=KEEPALIVE_EXPIRY,
+        )
+        transport = self.transport
+        if self.record is not None:
+            from .cassette import RecordingTransport
+
+            transport = RecordingTransport(self.record, transport or httpx.HTTPTransport(http2=http2, limits=limits))
+        return httpx.Client(
+            timeout=httpx.Timeout(self.timeout, connect=self.connect_timeout, pool=None),
+            limits=limits,
+            http2=http2,
+            transport=transport,
+        )
+
+    def close(self) -> None:
+        """Wait for background work and release pooled connections."""
+        if self._revalidation is not None:
+            self._revalidation.join()
+            self._revalidation = None
+        if self._http is not None:
+            self._http.close()
+            self._http = None
+        if self.cache is not None:
+            self.cache.close()
+        if self.index is not None:
+            self.index.close()
+        try:
+            self.latency.save()
+        except OSError as e:
+            logger.debug("Could not save latency history: %s", e)
+
+    def _get(self, path: str, until: float | None = None, **kwargs: Any) -> httpx.Response:
+        """GET a path from the least loaded instance, failing over to healthy peers.
+
+        See Attempts for the failover and retry rules. Every attempt passes
+        through the adaptive limiter. With until, a monotonic deadline, every
+        attempt times out at it, a timeout then is not held against the instance
+        or the limiter, and no attempt is started or retried past it.
+        """
+        attempts = Attempts(self.pool, self.limiter, self.max_retries)
+        while True:
+            if until is not None:
+                remaining = until - time.monotonic()
+                if remaining <= 0:
+                    raise httpx.TimeoutException(f"Deadline passed before {path} could be requested")
+                kwargs["timeout"] = httpx.Timeout(remaining, pool=None)
+            self.limiter.acquire()
+            instance = attempts.next_instance()
+            start = time.monotonic()
+            try:
+                response = self._send(f"{instance.url}{path}", **kwargs)
+            except httpx.TransportError as e:
+                if self._http is None or (until is not None and isinstance(e, httpx.TimeoutException)):
+                    # Closed under an abandoned request, e.g. a late engine of a fused search,
+                    # or cut off by the deadline; neither says anything about the instance.
+                    attempts.abandoned(instance)
+                    raise
+                delay = attempts.failed(instance, e)
+                if delay is None or (until is not None and time.monotonic() + delay >= until):
+                    raise
+            except BaseException:
+                attempts.abandoned(instance)
+                raise
+            else:
+                delay = attempts.answered(instance, response, time.monotonic() - start)
+                if delay is None or (until is not None and time.monotonic() + delay >= until):
+                    return response
+            if delay:
+                time.sleep(delay)
+
+    def _send(self, url: str, **kwargs: Any) -> httpx.Response:
+        http = self.http
+        with phase("http"):
+            if self.timings is None:
+                return http.get(url, **kwargs)
+            with self.timings.request("GET", url) as record:
+                response = http.get(url, extensions={"trace": record.trace}, **kwargs)
+                record.status = response.status_code
+            return response
 
     def search(
         self,
@@ -26,55 +389,385 @@ class SearXNGClient:
         page: int = 1,
         time_range: str | None = None,
         safe_search: int | None = None,
+        use_cache: bool = True,
+        deadline: float | None = None,
     ) -> SearchResponse:
-        """Execute a search query."""
-        params: dict[str, str | int] = {
-            "q": query,
-            "format": "json",
-            "pageno": page,
-        }
+        """Execute a search query.
+
+        Category and engine names are checked against the local /config snapshot,
+        when one is available, before the search request is made. A stale
+        snapshot is revalidated before an unknown name is rejected.
 
-        if categories:
-            params["categories"] = categories
-        if engines:
-            params["engines"] = engines
-        if language:
-            params["language"] = language
-        if time_range:
-            params["time_range"] = time_range
-        if safe_search is not None:
-            params["safesearch"] = safe_search
+        With a deadline in seconds, the instance is asked to drop engines that
+        would make it late, a request slower than most recent ones is hedged
+        with a duplicate, and if nothing arrives in time an empty response
+        marked partial is returned instead of waiting for the timeout. A
+        response missing engines that timed out is marked partial too, and is
+        not cached.
+        """
+        until = time.monotonic() + deadline if deadline is not None else None
+        if self.metadata is not None and (categories or engines):
+            self._validate_filters(categories, engines)
 
+        params = build_search_params(query, categories, engines, language, page, time_range, safe_search)
         logger.debug("Search params: %s", params)
 
-        response = httpx.get(
-            f"{self.base_url}/search",
-            params=params,
-            timeout=self.timeout,
-        )
-        response.raise_for_status()
+        key = cache_key(self.base_url, params)
+        use_cache = use_cache and self.cache is not None
+        if use_cache:
+            cached = self.cache.get(key)
+            if cached is not None:
+                logger.debug("Cache hit for %s", key)
+                with measure(self.timings, "model"), phase("model"):
+                    return SearchResponse.from_dict(cached)
 
-        data = response.json()
-        logger.debug("Got %d results", len(data.get("results", [])))
+        if until is None:
+            data = self._coalesce(key, lambda: self._fetch_search(key, params, store=use_cache))
+        else:
+            # Kept apart from searches without a deadline, which must not share a trimmed response.
+            data = self._coalesce(f"{key}:deadline", lambda: self._fetch_hedged(key, params, use_cache, until))
+            if data is None:
+                logger.debug("No response within the %.0f ms deadline", deadline * 1000)
+                return SearchResponse(query=query, partial=True)
+        with measure(self.timings, "model"), phase("model"):
+            response = SearchResponse.from_dict(data)
+        response.partial = until is not None and bool(timed_out_engines(data))
+        return response
 
-        return SearchResponse.from_dict(data)
+    def _validate_filters(self, categories: str | None, engines: str | None) -> None:
+        assert self.metadata is not None
+        snapshot = self.metadata.load()
+        if snapshot is None:
+            return
+        try:
+            validate_filters(snapshot, categories=categories, engines=engines)
+        except ValueError as e:
+            if not self.metadata.is_stale(snapshot):
+                raise
+            # The name may have been added on the instance since the snapshot was taken.
+            try:
+                snapshot = self._revalidate_config(snapshot)
+            except httpx.HTTPError as refresh_error:
+                logger.warning("%s; could not refresh instance config to check: %s", e, refresh_error)
+                return
+            validate_filters(snapshot, categories=categories, engines=engines)
 
-    def get_config(self) -> dict:
-        """Get the SearXNG instance configuration."""
-        response = httpx.get(
-            f"{self.base_url}/config",
-            timeout=self.timeout,
-        )
+    def _fetch_hedged(self, key: str, params: dict, store: bool, until: float) -> dict | None:
+        """Fetch a search before the monotonic time until, or return None.
+
+        Once the request has taken longer than the history's hedge delay, a
+        duplicate is sent and whichever answers first is used. The requests run
+        on daemon threads and are abandoned at the deadline. The response is
+        only cached if no engine timed out, as it is then the same as one
+        fetched without a deadline.
+        """
+
+        def attempt() -> Future:
+            remaining = until - time.monotonic()
+            attempt_params = {**params, "timeout_limit": timeout_limit(remaining)}
+            return _start_daemon(self._fetch_search, key, attempt_params, False, until=until)
+
+        hedge_at = time.monotonic() + self.latency.hedge_delay(until - time.monotonic())
+        pending = {attempt()}
+        hedged = False
+        while True:
+            now = time.monotonic()
+            if now >= until:
+                return None
+            if not hedged and now >= hedge_at:
+                logger.debug("No response after %.0f ms, sending a hedged request", (now - hedge_at) * 1000)
+                pending.add(attempt())
+                hedged = True
+            done, pending = wait(pending, timeout=(until if hedged else hedge_at) - now, return_when=FIRST_COMPLETED)
+            for future in done:
+                error = future.exception()
+                if error is None:
+                    data = future.result()
+                    if store and not timed_out_engines(data):
+                        self.cache.put(key, params, data)
+                    return data
+                if not pending:
+                    if isinstance(error, httpx.TimeoutException):
+                        # Timed out at the deadline: nothing arrived in time.
+                        return None
+                    raise error
+                logger.debug("Hedged search attempt failed: %s", error)
+
+    def _fetch_search(self, key: str, params: dict, store: bool, until: float | None = None) -> dict:
+        start = time.monotonic()
+        response = self._get("/search", until=until, params=params)
+        latency = time.monotonic() - start
+        data = decode_search_response(response, self.limiter, self.timings)
+        self.latency.record(latency)
+        store_search_data(data, key, params, self.cache if store else None, self.index)
+        return data
+
+    def _coalesce(self, key: str, fetch: Callable[[], T]) -> T:
+        """Run fetch, or wait for an identical in-flight call and share its result."""
+        with self._inflight_lock:
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._inflight[key] = future
+
+        if not leader:
+            logger.debug("Joining in-flight request %s", key)
+            return future.result()
+
+        try:
+            result = fetch()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._inflight_lock:
+                del self._inflight[key]
+        future.set_result(result)
+        return result
+
+    def search_pages(
+        self,
+        query: str,
+        num: int,
+        categories: str | None = None,
+        engines: str | None = None,
+        language: str | None = None,
+        page: int = 1,
+        time_range: str | None = None,
+        safe_search: int | None = None,
+        use_cache: bool = True,
+        max_pages: int = DEFAULT_MAX_PAGES,
+        deadline: float | None = None,
+    ) -> SearchResponse:
+        """Fetch consecutive pages concurrently until num unique results are collected.
+
+        Pages are requested in waves sized by the expected number of results per
+        page, merged in page order and deduplicated by normalized URL. Fetching
+        stops at the first empty page, after max_pages, or once num results are in.
+        With a deadline in seconds, the pages collected by then are returned,
+        marked partial if more were needed.
+        """
+        until = time.monotonic() + deadline if deadline is not None else None
+        search_kwargs = {
+            "categories": categories,
+            "engines": engines,
+            "language": language,
+            "time_range": time_range,
+            "safe_search": safe_search,
+            "use_cache": use_cache,
+        }
+        merger = ResultMerger()
+        responses: list[SearchResponse] = []
+        next_page = page
+        last_page = page + max_pages - 1
+        page_size = DEFAULT_PAGE_SIZE
+        exhausted = False
+        late = False
+
+        executor = ThreadPoolExecutor(max_workers=max_pages)
+        try:
+            while not exhausted and len(merger) < num and next_page <= last_page:
+                remaining = until - time.monotonic() if until is not None else None
+                if remaining is not None and remaining <= 0:
+                    late = True
+                    break
+                wave = max(1, math.ceil((num - len(merger)) / page_size))
+                pages = range(next_page, min(next_page + wave, last_page + 1))
+                next_page = pages.stop
+                futures = {
+                    p: executor.submit(self.search, query, page=p, deadline=remaining, **search_kwargs) for p in pages
+                }
+                logger.debug("Fetching pages %d-%d", pages.start, pages.stop - 1)
+
+                for p in pages:
+                    try:
+                        response = futures[p].result()
+                    except Exception:
+                        if not responses:
+                            raise
+                        logger.warning("Failed to fetch page %d, returning results collected so far", p, exc_info=True)
+                        exhausted = True
+                    else:
+                        responses.append(response)
+                        merger.add(response.results)
+                        exhausted = not response.results
+                        if response.results and p == page:
+                            page_size = len(response.results)
+
+                    if exhausted or len(merger) >= num:
+                        break
+        finally:
+            # Don't wait for pages that are no longer needed.
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        merged = merge_responses(responses, limit=num)
+        merged.partial = merged.partial or late
+        logger.debug("Collected %d unique results from %d pages", len(merged.results), len(responses))
+        return merged
+
+    def search_fused(
+        self,
+        query: str,
+        engines: str,
+        num: int | None = None,
+        deadline: float | None = None,
+        categories: str | None = None,
+        language: str | None = None,
+        page: int = 1,
+        time_range: str | None = None,
+        safe_search: int | None = None,
+        use_cache: bool = True,
+    ) -> SearchResponse:
+        """Search every engine separately and fuse the rankings locally.
+
+        One request per engine in the comma-separated engines list runs
+        concurrently; the answers are merged with reciprocal-rank fusion, so each
+        result's engines and score reflect which engines found it and how high.
+        With a deadline in seconds, engines that have not answered by then are
+        reported as unresponsive and left out, and the response is marked
+        partial. Their requests are not waited for; in a long-running process
+        their responses still land in the cache.
+        """
+        names = [name for name in dict.fromkeys(e.strip() for e in engines.split(",")) if name]
+        if not names:
+            raise ValueError("Fused search needs at least one engine")
+        search_kwargs = {
+            "categories": categories,
+            "language": language,
+            "page": page,
+            "time_range": time_range,
+            "safe_search": safe_search,
+            "use_cache": use_cache,
+            "deadline": deadline,
+        }
+        responses: dict[str, SearchResponse] = {}
+        failed: dict[str, Exception] = {}
+        late: list[str] = []
+        started = time.monotonic()
+
+        # Daemon threads, so that engines still running past the deadline don't hold up exit.
+        pending = {_start_daemon(self.search, query, engines=name, **search_kwargs): name for name in names}
+        while pending:
+            timeout = None if deadline is None else max(0.0, started + deadline - time.monotonic())
+            done, _ = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+            if not done:
+                break
+            for future in done:
+                name = pending.pop(future)
+                try:
+                    response = future.result()
+                except Exception as e:
+                    logger.warning("Engine %s failed: %s", name, e)
+                    failed[name] = e
+                    continue
+                if response.partial and not response.results:
+                    late.append(name)
+                else:
+                    responses[name] = response
+
+        late.extend(pending.values())
+        if not responses and not late:
+            raise next(iter(failed.values()))
+        logger.debug("Fused %d engines in %.3fs, %d late", len(responses), time.monotonic() - started, len(late))
+
+        fused = fuse_responses([(name, responses[name]) for name in names if name in responses], limit=num)
+        fused.query = query
+        fused.unresponsive_engines.extend([name, str(e) or type(e).__name__] for name, e in failed.items())
+        fused.unresponsive_engines.extend([name, "deadline exceeded"] for name in late)
+        fused.partial = fused.partial or bool(late)
+        return fused
+
+    def autocomplete(self, prefix: str, use_cache: bool = True) -> list[str]:
+        """Get search suggestions for a partially typed query.
+
+        With a suggestion cache, answers are served from the local prefix trie
+        when possible, including from a shorter prefix's complete answer.
+        """
+        key = normalize_prefix(prefix)
+        if not key.strip():
+            return []
+        use_cache = use_cache and self.suggest_cache is not None
+        if use_cache:
+            cached = self.suggest_cache.lookup(key)
+            if cached is not None:
+                logger.debug("Suggestion cache hit for %r", key)
+                return cached
+
+        return self._coalesce(f"suggest:{key}", lambda: self._fetch_suggestions(key, store=use_cache))
+
+    def _fetch_suggestions(self, key: str, store: bool) -> list[str]:
+        response = self._get("/autocompleter", params={"q": key})
         response.raise_for_status()
-        return response.json()
+        suggestions = parse_suggestions(loads(response.content))
+
+        if store:
+            self.suggest_cache.store(key, suggestions)
+            try:
+                self.suggest_cache.save()
+            except OSError as e:
+                logger.warning("Could not save the suggestion cache: %s", e)
+        return suggestions
+
+    def get_config(self, refresh: bool = False) -> dict:
+        """Get the SearXNG instance configuration.
+
+        With a metadata store, the local snapshot is served immediately and
+        revalidated in the background once it is older than the store's max age.
+        Pass refresh=True to revalidate before returning.
+        """
+        if self.metadata is None:
+            return self.fetch_config().data
+
+        snapshot = self.metadata.load()
+        if snapshot is None:
+            snapshot = self.fetch_config()
+            self.metadata.save(snapshot)
+        elif refresh:
+            try:
+                snapshot = self._revalidate_config(snapshot)
+            except httpx.HTTPError as e:
+                logger.warning("Could not refresh instance config, using local snapshot: %s", e)
+        elif self.metadata.is_stale(snapshot):
+            self._start_background_revalidation(snapshot)
+
+        return snapshot.data
+
+    def fetch_config(self, snapshot: ConfigSnapshot | None = None) -> ConfigSnapshot:
+        """Download /config, conditionally if a previous snapshot is given.
+
+        Returns the given snapshot with a fresh timestamp when the server
+        answers 304 Not Modified.
+        """
+        response = self._get("/config", headers=conditional_headers(snapshot))
+        return snapshot_from_response(response, snapshot)
+
+    def _revalidate_config(self, snapshot: ConfigSnapshot) -> ConfigSnapshot:
+        assert self.metadata is not None
+        snapshot = self.fetch_config(snapshot)
+        self.metadata.save(snapshot)
+        return snapshot
+
+    def _start_background_revalidation(self, snapshot: ConfigSnapshot) -> None:
+        if self._revalidation is not None and self._revalidation.is_alive():
+            return
+
+        def revalidate() -> None:
+            try:
+                self._revalidate_config(snapshot)
+            except httpx.HTTPError as e:
+                logger.debug("Background config revalidation failed: %s", e)
+
+        # Not a daemon thread: the process waits for the revalidation to finish after
+        # the command has already written its output.
+        self._revalidation = threading.Thread(target=revalidate, name="config-revalidation")
+        self._revalidation.start()
 
-    def get_engines(self) -> list[EngineInfo]:
+    def get_engines(self, refresh: bool = False) -> list[EngineInfo]:
         """Get list of available engines."""
-        config = self.get_config()
-        engines = config.get("engines", [])
-        return [EngineInfo.from_dict(e) for e in engines]
+        return engines_from_config(self.get_config(refresh=refresh))
 
-    def get_categories(self) -> list[str]:
+    def get_categories(self, refresh: bool = False) -> list[str]:
         """Get list of available categories."""
-        config = self.get_config()
+        config = self.get_config(refresh=refresh)
         return config.get("categories", [])
@@ -1,47 +1,218 @@
 """Configuration management for SearXNG CLI."""
 
-from dataclasses import dataclass
+import hashlib
+import json
+import os
+from dataclasses import dataclass, field, fields
 from pathlib import Path
-
-import yaml
+from typing import Any
 
 DEFAULT_CONFIG_PATH = Path.home() / ".config" / "searxngcli" / "config.yml"
 
+DEFAULT_CACHE_TTL = 300
+DEFAULT_CACHE_MAX_SIZE = 50
+DEFAULT_TIMEOUT = 30.0
+DEFAULT_CONNECT_TIMEOUT = 5.0
+DEFAULT_MAX_CONNECTIONS = 20
+DEFAULT_MAX_RETRIES = 2
+DEFAULT_INDEX_MAX_AGE = 90
+DEFAULT_FETCH_MAX_BYTES = 2 * 1024 * 1024
+DEFAULT_FETCH_PER_HOST = 2
+DEFAULT_NUM = 25
+
+
+@dataclass
+class InstanceConfig:
+    """A SearXNG instance in a load-balanced pool."""
+
+    url: str
+    weight: float = 1.0
+
 
 @dataclass
 class Config:
     """Main configuration class."""
 
     base_url: str = ""
-
-
-def load_config(config_path: Path | None = None) -> Config:
-    """Load configuration from YAML file."""
+    cache_ttl: int = DEFAULT_CACHE_TTL
+    cache_max_size: int = DEFAULT_CACHE_MAX_SIZE
+    timeout: float = DEFAULT_TIMEOUT
+    connect_timeout: float = DEFAULT_CONNECT_TIMEOUT
+    max_connections: int = DEFAULT_MAX_CONNECTIONS
+    http2: bool = False
+    rate_limit: float = 0.0
+    max_retries: int = DEFAULT_MAX_RETRIES
+    index_results: bool = False
+    index_max_age: int = DEFAULT_INDEX_MAX_AGE
+    fetch_max_bytes: int = DEFAULT_FETCH_MAX_BYTES
+    fetch_per_host: int = DEFAULT_FETCH_PER_HOST
+    categories: str = ""
+    engines: str = ""
+    language: str = ""
+    num: int = DEFAULT_NUM
+    # Cassette files to record exchanges with instances to, or to replay them from.
+    record: str = ""
+    replay: str = ""
+    replay_latency: float = 0.0
+    instances: list[InstanceConfig] = field(default_factory=list)
+    # Named sets of overrides as written in the file, and the one applied, if any.
+    profiles: dict[str, dict] = field(default_factory=dict)
+    profile: str = ""
+
+
+# Keys with scalar values, which can be set with `searxng config set`.
+CONFIG_KEYS = tuple(f.name for f in fields(Config) if f.name not in ("instances", "profiles", "profile"))
+
+
+def _parse_instances(items: list, path: Path) -> list[InstanceConfig]:
+    instances = []
+    for item in items:
+        if isinstance(item, str):
+            item = {"url": item}
+        if not isinstance(item, dict) or not item.get("url"):
+            raise ValueError(f"Invalid instance {item!r} in config file: {path}")
+        weight = float(item.get("weight", 1.0))
+        if weight <= 0:
+            raise ValueError(f"Instance weight must be positive: {item['url']}")
+        instances.append(InstanceConfig(url=str(item["url"]).rstrip("/"), weight=weight))
+    return instances
+
+
+def parse_config_value(key: str, value: Any) -> Any:
+    """Convert a raw config value to the type of the given config key."""
+    field_type = next(f.type for f in fields(Config) if f.name == key)
+    if field_type is bool:
+        if isinstance(value, bool):
+            return value
+        if str(value).lower() in ("1", "true", "yes", "on"):
+            return True
+        if str(value).lower() in ("0", "false", "no", "off"):
+            return False
+        raise ValueError(f"Invalid value for {key}: expected true or false")
+    try:
+        return field_type(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"Invalid value for {key}: expected {field_type.__name__}") from None
+
+
+def load_config(config_path: Path | None = None, profile: str | None = None) -> Config:
+    """Load configuration from YAML file, with a named profile's overrides applied."""
     path = config_path or DEFAULT_CONFIG_PATH
 
-    if not path.exists():
+    try:
+        data = read_config_file(path)
+    except FileNotFoundError:
         raise FileNotFoundError(
             f"Config file not found: {path}\n"
             f"Create it with your SearXNG instance URL. Example:\n\n"
             f"base_url: https://searxng.example.com"
-        )
-
-    with open(path) as f:
-        data = yaml.safe_load(f) or {}
-
-    base_url = data.get("base_url", "")
+        ) from None
+
+    profiles = data.get("profiles") or {}
+    if not isinstance(profiles, dict) or not all(isinstance(p, dict) for p in profiles.values()):
+        raise ValueError(f"'profiles' must map profile names to settings in config file: {path}")
+
+    settings = dict(data)
+    if profile:
+        if profile not in profiles:
+            available = ", ".join(sorted(profiles)) or "none"
+            raise ValueError(f"Unknown profile '{profile}' in config file: {path} (available: {available})")
+        overrides = profiles[profile]
+        settings.update(overrides)
+        # A profile pointing at another instance doesn't inherit the top-level pool.
+        if "base_url" in overrides and "instances" not in overrides:
+            settings["instances"] = []
+
+    instances = _parse_instances(settings.get("instances") or [], path)
+    base_url = settings.get("base_url") or (instances[0].url if instances else "")
     if not base_url:
         raise ValueError(f"Missing 'base_url' in config file: {path}")
 
-    return Config(base_url=base_url.rstrip("/"))
+    options = {
+        key: parse_config_value(key, settings[key]) for key in CONFIG_KEYS if key in settings and key != "base_url"
+    }
+    return Config(
+        base_url=base_url.rstrip("/"),
+        instances=instances,
+        profiles=profiles,
+        profile=profile or "",
+        **options,
+    )
+
+
+def read_config_file(path: Path) -> dict:
+    """Parse the YAML config file, or reuse its compiled copy if the file is unchanged.
+
+    The parsed data is kept as JSON in the cache directory, keyed on the file's
+    path, modification time and size, so PyYAML is only imported after an edit.
+    """
+    stat = path.stat()
+    source = os.path.abspath(path)
+    stamp = [source, stat.st_mtime_ns, stat.st_size]
+    compiled = compiled_config_path(source)
+    try:
+        with open(compiled, "rb") as f:
+            stored = json.load(f)
+        if stored.get("stamp") == stamp:
+            return stored["data"]
+    except (OSError, ValueError, KeyError, AttributeError):
+        pass
+
+    import tempfile
+
+    import yaml
+
+    with open(path) as f:
+        data = yaml.safe_load(f) or {}
+    if not isinstance(data, dict):
+        raise ValueError(f"Config file must contain a mapping: {path}")
+
+    try:
+        compiled.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=compiled.parent, prefix=".config-")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump({"stamp": stamp, "data": data}, f)
+            os.replace(tmp_path, compiled)
+        except BaseException:
+            Path(tmp_path).unlink(missing_ok=True)
+            raise
+    except (OSError, TypeError, ValueError):
+        # Values JSON can't represent (YAML dates, say) or a read-only cache: parse every time.
+        pass
+    return data
+
+
+def compiled_config_path(source: str) -> Path:
+    """Get the path of the compiled copy of a config file."""
+    digest = hashlib.sha256(source.encode()).hexdigest()[:16]
+    return get_cache_dir() / "config" / f"{digest}.json"
 
 
 def save_config(config: Config, config_path: Path | None = None) -> None:
-    """Save configuration to YAML file."""
+    """Save configuration to YAML file.
+
+    The config must be loaded without a profile, whose merged values would
+    otherwise be written as the top-level settings; profiles are kept as is.
+    """
+    if config.profile:
+        raise ValueError("Cannot save a config with a profile applied")
     path = config_path or DEFAULT_CONFIG_PATH
     path.parent.mkdir(parents=True, exist_ok=True)
 
-    data = {"base_url": config.base_url}
+    defaults = Config()
+    data = {
+        key: getattr(config, key)
+        for key in CONFIG_KEYS
+        if key == "base_url" or getattr(config, key) != getattr(defaults, key)
+    }
+    if config.instances:
+        data["instances"] = [{"url": i.url, "weight": i.weight} for i in config.instances]
+    if config.profiles:
+        data["profiles"] = config.profiles
+
+    import yaml
+
     with open(path, "w") as f:
         yaml.dump(data, f, default_flow_style=False)
 
@@ -49,3 +220,9 @@ def save_config(config: Config, config_path: Path | None = None) -> None:
 def get_config_path() -> Path:
     """Get the default config file path."""
     return DEFAULT_CONFIG_PATH
+
+
+def get_cache_dir() -> Path:
+    """Get the directory for cached data."""
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "searxngcli"
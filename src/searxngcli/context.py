@@ -1,11 +1,18 @@
 """CLI context management for SearXNG CLI."""
 
 from dataclasses import dataclass
+from pathlib import Path
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
+    from .cache import SearchCache
     from .client import SearXNGClient
     from .config import Config
+    from .fetch import PageFetcher
+    from .index import ResultIndex
+    from .metadata import MetadataStore
+    from .suggest import SuggestCache
+    from .timings import Timings
 
 
 @dataclass
@@ -14,21 +21,128 @@ class Context:
 
     config: "Config | None" = None
     verbose: bool = False
+    client: "SearXNGClient | None" = None
+    timings: "Timings | None" = None
+    fetcher: "PageFetcher | None" = None
+    # Cassette options from the command line, which take precedence over the config file.
+    record: Path | None = None
+    replay: Path | None = None
+    replay_latency: float | None = None
 
     def get_config(self) -> "Config":
         """Get config, loading if needed."""
         from .config import load_config
+        from .profiling import phase
 
         if self.config is None:
-            self.config = load_config()
+            with phase("config"):
+                self.config = load_config()
         return self.config
 
     def get_client(self) -> "SearXNGClient":
-        """Create a SearXNGClient from config."""
+        """Get the SearXNGClient, creating it from config on first use.
+
+        The client is shared by everything running in this process so that
+        its connection pool stays warm. While recording or replaying a
+        cassette, the local caches are bypassed so that every exchange goes
+        through it, and the latency history is not updated.
+        """
         from .client import SearXNGClient
+        from .config import get_cache_dir
+        from .deadline import LatencyHistory, latency_path
+
+        if self.client is None:
+            config = self.get_config()
+            record = self.record or (Path(config.record).expanduser() if config.record else None)
+            replay = self.replay or (Path(config.replay).expanduser() if config.replay else None)
+            if record is not None and replay is not None:
+                raise ValueError("Can't record and replay a cassette at the same time")
+            kwargs = {
+                "base_url": config.base_url,
+                "timeout": config.timeout,
+                "connect_timeout": config.connect_timeout,
+                "max_connections": config.max_connections,
+                "http2": config.http2,
+                "instances": config.instances,
+                "timings": self.timings,
+                "rate_limit": config.rate_limit,
+                "max_retries": config.max_retries,
+                "index": self.get_index() if config.index_results else None,
+            }
+            if record is not None:
+                kwargs["record"] = record
+            elif replay is not None:
+                from .cassette import ReplayTransport
+
+                latency = self.replay_latency if self.replay_latency is not None else config.replay_latency
+                kwargs["transport"] = ReplayTransport(replay, latency=latency)
+            else:
+                kwargs["cache"] = self.get_cache()
+                kwargs["metadata"] = self.get_metadata_store()
+                kwargs["suggest_cache"] = self.get_suggest_cache()
+                kwargs["latency"] = LatencyHistory(latency_path(get_cache_dir(), config.base_url))
+            self.client = SearXNGClient(**kwargs)
+        return self.client
+
+    def get_fetcher(self) -> "PageFetcher":
+        """Get the result page fetcher, creating it from config on first use."""
+        from .config import get_cache_dir
+        from .fetch import PAGES_FILENAME, PageCache, PageFetcher
+
+        if self.fetcher is None:
+            config = self.get_config()
+            self.fetcher = PageFetcher(
+                cache=PageCache(get_cache_dir() / PAGES_FILENAME),
+                max_bytes=config.fetch_max_bytes,
+                per_host=config.fetch_per_host,
+                connect_timeout=config.connect_timeout,
+            )
+        return self.fetcher
+
+    def close(self) -> None:
+        """Close the client and page fetcher if they were created."""
+        if self.client is not None:
+            self.client.close()
+            self.client = None
+        if self.fetcher is not None:
+            self.fetcher.close()
+            self.fetcher = None
+
+    def get_cache(self) -> "SearchCache | None":
+        """Create the search response cache, or None if caching is disabled."""
+        from .cache import CACHE_FILENAME, SearchCache
+        from .config import get_cache_dir
+
+        config = self.get_config()
+        if config.cache_ttl <= 0:
+            return None
+        return SearchCache(
+            get_cache_dir() / CACHE_FILENAME,
+            ttl=config.cache_ttl,
+            max_size=config.cache_max_size * 1024 * 1024,
+        )
+
+    def get_index(self) -> "ResultIndex":
+        """Open the local full-text index of past results."""
+        from .config import get_cache_dir
+        from .index import INDEX_FILENAME, ResultIndex
+
+        return ResultIndex(get_cache_dir() / INDEX_FILENAME, max_age_days=self.get_config().index_max_age)
+
+    def get_suggest_cache(self) -> "SuggestCache":
+        """Create the autocomplete prefix cache for the configured instance."""
+        from .config import get_cache_dir
+        from .suggest import SuggestCache, suggest_path
+
+        return SuggestCache(suggest_path(get_cache_dir(), self.get_config().base_url))
+
+    def get_metadata_store(self) -> "MetadataStore":
+        """Create the /config snapshot store for the configured instance."""
+        from .config import get_cache_dir
+        from .metadata import MetadataStore, snapshot_path
 
         config = self.get_config()
-        return SearXNGClient(base_url=config.base_url)
+        return MetadataStore(snapshot_path(get_cache_dir(), config.base_url))
 
 
 _ctx = Context()
@@ -0,0 +1,369 @@
+"""Resident daemon that serves CLI invocations over a Unix socket.
+
+The daemon keeps one warm client (connection pool, config and caches) and runs
+forwarded commands in-process, capturing their output per connection. The
+forwarding side in this module only uses the standard library, so trying the
+daemon costs the CLI next to nothing when none is running.
+"""
+
+import io
+import json
+import os
+import socket
+import socketserver
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+# Commands that are safe to run inside the daemon: they don't read stdin and
+# only depend on the shared configuration.
+FORWARDED_COMMANDS = {"search", "local", "suggest", "engines", "categories"}
+
+# Options of forwarded commands whose value is a path relative to the working directory.
+PATH_OPTIONS = ("--export",)
+
+CONNECT_TIMEOUT = 0.05
+
+
+def get_socket_path() -> Path:
+    """Get the path of the daemon's Unix socket."""
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_dir:
+        return Path(runtime_dir) / "searxngcli" / "daemon.sock"
+    cache_dir = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(cache_dir) / "searxngcli" / "daemon.sock"
+
+
+def _connect(path: Path) -> socket.socket | None:
+    if not hasattr(socket, "AF_UNIX") or not path.exists():
+        return None
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(CONNECT_TIMEOUT)
+    try:
+        sock.connect(str(path))
+    except OSError:
+        sock.close()
+        return None
+    sock.settimeout(None)
+    return sock
+
+
+def _request(path: Path, message: dict) -> dict | None:
+    sock = _connect(path)
+    if sock is None:
+        return None
+    try:
+        with sock, sock.makefile("rwb") as stream:
+            stream.write(json.dumps(message).encode() + b"\n")
+            stream.flush()
+            line = stream.readline()
+    except OSError:
+        return None
+    return json.loads(line) if line else None
+
+
+def _absolute_paths(argv: list[str]) -> list[str]:
+    """Resolve path option values against this process's working directory, not the daemon's."""
+    resolved = []
+    is_path = False
+    for i, arg in enumerate(argv):
+        if is_path:
+            arg = os.path.abspath(arg)
+            is_path = False
+        elif arg == "--":
+            return resolved + argv[i:]
+        elif arg in PATH_OPTIONS:
+            is_path = True
+        else:
+            option, equals, value = arg.partition("=")
+            if equals and option in PATH_OPTIONS:
+                arg = f"{option}={os.path.abspath(value)}"
+        resolved.append(arg)
+    return resolved
+
+
+def forward(argv: list[str]) -> int | None:
+    """Run a command through the daemon and print its output.
+
+    Returns the exit code, or None if no daemon is available and the command
+    should run in-process instead.
+    """
+    if os.environ.get("SEARXNG_NO_DAEMON") or os.environ.get("SEARXNG_CONFIG"):
+        return None
+    if not argv or argv[0] not in FORWARDED_COMMANDS:
+        return None
+
+    message = {
+        "argv": _absolute_paths(argv),
+        "tty": sys.stdout.isatty(),
+        "stderr_tty": sys.stderr.isatty(),
+        "env": {name: os.environ[name] for name in ("TERM", "COLORTERM", "NO_COLOR", "COLUMNS") if name in os.environ},
+    }
+    if message["tty"]:
+        message["width"] = os.get_terminal_size(sys.stdout.fileno()).columns
+
+    response = _request(get_socket_path(), message)
+    if response is None:
+        return None
+
+    sys.stdout.write(response.get("stdout", ""))
+    sys.stdout.flush()
+    sys.stderr.write(response.get("stderr", ""))
+    sys.stderr.flush()
+    return int(response.get("exit_code", 1))
+
+
+def status(path: Path | None = None) -> dict | None:
+    """Get the status of the running daemon, or None if none is running."""
+    return _request(path or get_socket_path(), {"control": "status"})
+
+
+def stop(path: Path | None = None) -> bool:
+    """Ask the running daemon to shut down."""
+    return _request(path or get_socket_path(), {"control": "stop"}) is not None
+
+
+class _ThreadLocalStream:
+    """Stand-in for sys.stdout/sys.stderr that writes to a per-thread buffer."""
+
+    def __init__(self, default: Any) -> None:
+        self._default = default
+        self._local = threading.local()
+
+    def redirect(self, buffer: Any, tty: bool) -> None:
+        self._local.buffer = buffer
+        self._local.tty = tty
+
+    def reset(self) -> None:
+        self._local.__dict__.clear()
+
+    def _target(self) -> Any:
+        return getattr(self._local, "buffer", None) or self._default
+
+    def isatty(self) -> bool:
+        if hasattr(self._local, "tty"):
+            return self._local.tty
+        return self._default.isatty()
+
+    def write(self, text: str) -> int:
+        return self._target().write(text)
+
+    def flush(self) -> None:
+        self._target().flush()
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._target(), name)
+
+
+def _color_system(env: dict[str, str]) -> str | None:
+    if "NO_COLOR" in env:
+        return None
+    if env.get("COLORTERM") in ("truecolor", "24bit"):
+        return "truecolor"
+    if "256color" in env.get("TERM", ""):
+        return "256"
+    return "standard"
+
+
+class Daemon:
+    """Unix socket server running forwarded CLI commands on a warm context."""
+
+    def __init__(self, path: Path | None = None, idle_timeout: float | None = None) -> None:
+        self.path = path or get_socket_path()
+        self.idle_timeout = idle_timeout
+        self.requests = 0
+        self._lock = threading.Lock()
+        self._server: Any = None
+        self._config_mtime: float | None = None
+        # Each config change starts a new generation. Clients dropped by a change
+        # are kept under the generation that used them and closed once no command
+        # of that or an earlier generation is still running.
+        self._generation = 0
+        self._running: dict[int, int] = {}
+        self._retired: dict[int, list[Any]] = {}
+        self._stdout = _ThreadLocalStream(sys.stdout)
+        self._stderr = _ThreadLocalStream(sys.stderr)
+        self.started_at = self.last_request_at = time.time()
+
+    def serve(self) -> None:
+        """Serve requests until stopped or idle for longer than idle_timeout."""
+        from .context import get_context
+        from .logging import get_logger
+
+        logger = get_logger(__name__)
+
+        if status(self.path) is not None:
+            raise RuntimeError(f"A daemon is already listening on {self.path}")
+        self.path.parent.mkdir(parents=True, exist_ok=True, mode=0o700)
+        self.path.unlink(missing_ok=True)
+
+        daemon = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self) -> None:
+                line = self.rfile.readline()
+                if not line:
+                    return
+                response = daemon.handle(json.loads(line))
+                self.wfile.write(json.dumps(response).encode() + b"\n")
+
+        self.started_at = self.last_request_at = time.time()
+
+        stdout, stderr = sys.stdout, sys.stderr
+        self._stdout = _ThreadLocalStream(stdout)
+        self._stderr = _ThreadLocalStream(stderr)
+        sys.stdout = self._stdout  # type: ignore[assignment]
+        sys.stderr = self._stderr  # type: ignore[assignment]
+
+        server = socketserver.ThreadingUnixStreamServer(str(self.path), Handler)
+        server.daemon_threads = True
+        self._server = server
+        os.chmod(self.path, 0o600)
+
+        try:
+            # Warm up the client so the first forwarded command doesn't pay for it.
+            self._reload_config_if_changed()
+            get_context().get_client()
+            logger.info("Listening on %s", self.path)
+
+            if self.idle_timeout:
+                server.timeout = min(self.idle_timeout, 1.0)
+                while self._server is not None:
+                    server.handle_request()
+                    if time.time() - self.last_request_at > self.idle_timeout:
+                        logger.info("Idle for %.0f s, shutting down", self.idle_timeout)
+                        break
+            else:
+                server.serve_forever()
+        finally:
+            server.server_close()
+            self.path.unlink(missing_ok=True)
+            sys.stdout, sys.stderr = stdout, stderr
+            get_context().close()
+            self._close_retired(everything=True)
+
+    def shutdown(self) -> None:
+        server, self._server = self._server, None
+        if server is not None and not self.idle_timeout:
+            # serve_forever() must be stopped from another thread.
+            threading.Thread(target=server.shutdown).start()
+
+    def handle(self, message: dict) -> dict:
+        self.last_request_at = time.time()
+        control = message.get("control")
+        if control == "status":
+            return {
+                "pid": os.getpid(),
+                "socket": str(self.path),
+                "uptime": time.time() - self.started_at,
+                "requests": self.requests,
+            }
+        if control == "stop":
+            self.shutdown()
+            return {"stopped": True}
+
+        with self._lock:
+            self.requests += 1
+        self._reload_config_if_changed()
+        with self._lock:
+            generation = self._generation
+            self._running[generation] = self._running.get(generation, 0) + 1
+        try:
+            return self.run(message)
+        finally:
+            with self._lock:
+                self._running[generation] -= 1
+                if not self._running[generation]:
+                    del self._running[generation]
+            self._close_retired()
+
+    def _reload_config_if_changed(self) -> None:
+        from .config import get_config_path
+        from .context import get_context
+
+        try:
+            mtime = get_config_path().stat().st_mtime
+        except OSError:
+            mtime = None
+        with self._lock:
+            if self._config_mtime is not None and mtime != self._config_mtime:
+                # Drop the stale client and fetcher; requests still using them finish normally.
+                ctx = get_context()
+                stale = [resource for resource in (ctx.client, ctx.fetcher) if resource is not None]
+                if stale:
+                    self._retired.setdefault(self._generation, []).extend(stale)
+                ctx.client = None
+                ctx.fetcher = None
+                ctx.config = None
+                self._generation += 1
+            self._config_mtime = mtime
+        self._close_retired()
+
+    def _close_retired(self, everything: bool = False) -> None:
+        """Close dropped clients that no running command can still be using."""
+        with self._lock:
+            oldest = min(self._running, default=self._generation)
+            done = [g for g in self._retired if everything or g < oldest]
+            closing = [resource for g in done for resource in self._retired.pop(g)]
+        for resource in closing:
+            resource.close()
+
+    def run(self, message: dict) -> dict:
+        """Run a forwarded command and capture its output."""
+        import typer
+        from rich.console import Console
+
+        from .app import app
+        from .logging import use_consoles
+
+        argv = message["argv"]
+        if not argv or argv[0] not in FORWARDED_COMMANDS:
+            return {"stdout": "", "stderr": f"Command cannot be run by the daemon: {argv[:1]}\n", "exit_code": 2}
+
+        env = message.get("env", {})
+        tty = bool(message.get("tty"))
+        stderr_tty = bool(message.get("stderr_tty"))
+        out = io.StringIO()
+        err = io.StringIO()
+        console = Console(
+            file=out,
+            force_terminal=tty,
+            color_system=_color_system(env) if tty else None,
+            width=message.get("width") or int(env.get("COLUMNS", 0)) or 80,
+        )
+        error_console = Console(
+            file=err,
+            force_terminal=stderr_tty,
+            color_system=_color_system(env) if stderr_tty else None,
+            width=message.get("width") or 80,
+        )
+
+        self._stdout.redirect(out, tty)
+        self._stderr.redirect(err, stderr_tty)
+        try:
+            with use_consoles(console, error_console):
+                exit_code = app(args=argv, prog_name="searxng", standalone_mode=False)
+        except typer.Abort:
+            err.write("Aborted!\n")
+            exit_code = 1
+        except typer.TyperException as e:
+            show = getattr(e, "show", None)
+            if show is not None:
+                show()
+            else:
+                error_console.print(f"[red]Error: {e}[/red]")
+            exit_code = e.exit_code
+        except Exception as e:
+            error_console.print(f"[red]Error: {e}[/red]")
+            exit_code = 1
+        finally:
+            self._stdout.reset()
+            self._stderr.reset()
+
+        return {
+            "stdout": out.getvalue(),
+            "stderr": err.getvalue(),
+            "exit_code": exit_code if isinstance(exit_code, int) else 0,
+        }
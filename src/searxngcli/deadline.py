@@ -0,0 +1,120 @@
+"""Latency history and the timing of searches bounded by a deadline.
+
+A search with a deadline asks the instance to give up on slow engines in time
+(SearXNG's timeout_limit parameter) and, when it is still waiting once the
+request is slower than almost all recent ones, sends a hedged duplicate that
+may reach a faster instance or worker. The latency percentiles come from a
+small per-instance history, persisted so that short-lived CLI runs learn from
+each other. This module only uses the standard library.
+"""
+
+import hashlib
+import json
+import math
+import os
+import tempfile
+import threading
+from collections import deque
+from pathlib import Path
+
+from .logging import get_logger
+
+logger = get_logger(__name__)
+
+LATENCY_WINDOW = 200
+# Below this many samples, percentiles say too little to time a hedge by.
+MIN_SAMPLES = 10
+HEDGE_PERCENTILE = 95
+# The latest point to hedge at, as a share of the deadline, so the duplicate has time to answer.
+MAX_HEDGE_SHARE = 0.5
+# The share of the remaining time offered to the instance as timeout_limit; the rest covers the network.
+TIMEOUT_LIMIT_SHARE = 0.8
+MIN_TIMEOUT_LIMIT = 0.1
+
+
+def latency_path(cache_dir: Path, base_url: str) -> Path:
+    """Get the latency history file path for an instance."""
+    digest = hashlib.sha256(base_url.encode()).hexdigest()[:16]
+    return cache_dir / "latency" / f"{digest}.json"
+
+
+def timeout_limit(remaining: float) -> str:
+    """The timeout_limit parameter for a request with remaining seconds left."""
+    return f"{max(MIN_TIMEOUT_LIMIT, remaining * TIMEOUT_LIMIT_SHARE):.1f}"
+
+
+def timed_out_engines(data: dict) -> list[str]:
+    """Engines a /search response lists as unresponsive because they ran out of time."""
+    return [
+        str(entry[0])
+        for entry in data.get("unresponsive_engines", [])
+        if len(entry) > 1 and "timeout" in str(entry[1]).lower()
+    ]
+
+
+class LatencyHistory:
+    """The latencies of the last window successful searches, optionally kept in a file."""
+
+    def __init__(self, path: Path | None = None, window: int = LATENCY_WINDOW) -> None:
+        self.path = path
+        self._samples: deque[float] = deque(maxlen=window)
+        self._loaded = path is None
+        self._dirty = False
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._load()
+            return len(self._samples)
+
+    def _load(self) -> None:
+        if self._loaded:
+            return
+        self._loaded = True
+        try:
+            with open(self.path, "rb") as f:
+                samples = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            logger.debug("Ignoring unreadable latency history %s: %s", self.path, e)
+            return
+        if isinstance(samples, list):
+            self._samples.extend(float(s) for s in samples if isinstance(s, (int, float)))
+
+    def record(self, latency: float) -> None:
+        with self._lock:
+            self._load()
+            self._samples.append(latency)
+            self._dirty = True
+
+    def percentile(self, p: float) -> float | None:
+        """The p-th percentile latency in seconds, or None with too few samples."""
+        with self._lock:
+            self._load()
+            if len(self._samples) < MIN_SAMPLES:
+                return None
+            ordered = sorted(self._samples)
+        return ordered[min(len(ordered) - 1, math.ceil(p / 100 * len(ordered)) - 1)]
+
+    def hedge_delay(self, deadline: float) -> float:
+        """How long to wait for a request before hedging it, given deadline seconds."""
+        latest = deadline * MAX_HEDGE_SHARE
+        threshold = self.percentile(HEDGE_PERCENTILE)
+        return latest if threshold is None else min(threshold, latest)
+
+    def save(self) -> None:
+        """Atomically write the history back, if it changed."""
+        with self._lock:
+            if self.path is None or not self._dirty:
+                return
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.path.parent, prefix=".latency-")
+            try:
+                with os.fdopen(fd, "w") as f:
+                    json.dump([round(s, 4) for s in self._samples], f, separators=(",", ":"))
+                os.replace(tmp_path, self.path)
+            except BaseException:
+                Path(tmp_path).unlink(missing_ok=True)
+                raise
+            self._dirty = False
@@ -0,0 +1,308 @@
+"""Appending search results to CSV, Parquet or SQLite datasets for analysis.
+
+Every format holds the same columns, listed in COLUMNS: the query, when it ran,
+the requested page and the rank of the result, followed by every SearchResult
+field and the fields of its fetched page. The column set is versioned by
+EXPORT_SCHEMA_VERSION, stored in every row, so readers can tell datasets
+written by different releases apart; a dataset is only ever appended to with
+the schema it was created with.
+
+Rows are buffered and written batch_size at a time, so memory stays bounded
+however many results are exported.
+"""
+
+import csv
+import os
+import sqlite3
+from abc import ABC, abstractmethod
+from collections.abc import Sequence
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from .logging import get_logger
+
+if TYPE_CHECKING:
+    from .models import SearchResult
+
+logger = get_logger(__name__)
+
+EXPORT_SCHEMA_VERSION = 1
+DEFAULT_BATCH_SIZE = 1000
+
+# Column names and types. Lists are stored as comma-separated text outside Parquet;
+# the fetched_* columns are empty unless the page was fetched.
+COLUMNS: list[tuple[str, str]] = [
+    ("schema_version", "int"),
+    ("query", "str"),
+    ("timestamp", "timestamp"),
+    ("page", "int"),
+    ("rank", "int"),
+    ("title", "str"),
+    ("url", "str"),
+    ("content", "str"),
+    ("engine", "str"),
+    ("engines", "list"),
+    ("category", "str"),
+    ("score", "float"),
+    ("published_date", "str"),
+    ("thumbnail", "str"),
+    ("fetched_status", "int"),
+    ("fetched_content_type", "str"),
+    ("fetched_title", "str"),
+    ("fetched_text", "str"),
+    ("fetched_size", "int"),
+    ("fetched_truncated", "bool"),
+    ("fetched_from_cache", "bool"),
+    ("fetched_error", "str"),
+]
+COLUMN_NAMES = [name for name, _ in COLUMNS]
+
+FORMATS = {".csv": "csv", ".parquet": "parquet", ".db": "sqlite", ".sqlite": "sqlite", ".sqlite3": "sqlite"}
+
+SQLITE_TABLE = "results"
+
+Row = tuple[Any, ...]
+
+
+def export_format(path: Path) -> str:
+    """Get the dataset format for a path from its extension."""
+    fmt = FORMATS.get(path.suffix.lower())
+    if fmt is None:
+        raise ValueError(f"Unknown export format for {path.name} (use {', '.join(FORMATS)})")
+    return fmt
+
+
+def result_rows(query: str, page: int | None, results: Sequence["SearchResult"], timestamp: datetime) -> list[Row]:
+    """Build dataset rows for results, ranked in the given order."""
+    rows = []
+    for rank, result in enumerate(results, 1):
+        fetched = result.page
+        rows.append(
+            (
+                EXPORT_SCHEMA_VERSION,
+                query,
+                timestamp,
+                page,
+                rank,
+                result.title,
+                result.url,
+                result.content,
+                result.engine,
+                list(result.engines),
+                result.category,
+                float(result.score),
+                result.published_date,
+                result.thumbnail,
+                *(
+                    (None,) * 8
+                    if fetched is None
+                    else (
+                        fetched.status,
+                        fetched.content_type,
+                        fetched.title,
+                        fetched.text,
+                        fetched.size,
+                        fetched.truncated,
+                        fetched.from_cache,
+                        fetched.error,
+                    )
+                ),
+            )
+        )
+    return rows
+
+
+def _flat_value(kind: str, value: Any) -> Any:
+    if value is None:
+        return None
+    if kind == "timestamp":
+        return value.isoformat(timespec="milliseconds")
+    if kind == "list":
+        return ",".join(value)
+    if kind == "bool":
+        return int(value)
+    return value
+
+
+def _flat(row: Row) -> Row:
+    """Convert a row to the plain values stored in CSV and SQLite."""
+    return tuple(_flat_value(kind, value) for (_, kind), value in zip(COLUMNS, row, strict=True))
+
+
+class Exporter(ABC):
+    """Buffers result rows and appends them to a dataset in batches."""
+
+    def __init__(self, path: Path, batch_size: int = DEFAULT_BATCH_SIZE) -> None:
+        if batch_size < 1:
+            raise ValueError("Export batch size must be at least 1")
+        self.path = path
+        self.batch_size = batch_size
+        self.written = 0
+        self._rows: list[Row] = []
+
+    def __enter__(self) -> "Exporter":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def add(
+        self, query: str, page: int | None, results: Sequence["SearchResult"], timestamp: datetime | None = None
+    ) -> None:
+        """Queue the results of one search, writing a batch once enough rows are queued."""
+        self._rows.extend(result_rows(query, page, results, timestamp or datetime.now(timezone.utc)))
+        if len(self._rows) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write the queued rows."""
+        if self._rows:
+            rows, self._rows = self._rows, []
+            self._write(rows)
+            self.written += len(rows)
+            logger.debug("Exported %d rows to %s", len(rows), self.path)
+
+    def close(self) -> None:
+        self.flush()
+
+    @abstractmethod
+    def _write(self, rows: list[Row]) -> None:
+        """Append a batch of rows to the dataset."""
+
+
+class CsvExporter(Exporter):
+    """Appends rows to a CSV file, writing the header when the file is new."""
+
+    def __init__(self, path: Path, batch_size: int = DEFAULT_BATCH_SIZE) -> None:
+        super().__init__(path, batch_size)
+        new = not path.exists() or path.stat().st_size == 0
+        if not new:
+            with open(path, newline="", encoding="utf-8") as f:
+                header = next(csv.reader(f), [])
+            if header != COLUMN_NAMES:
+                raise ValueError(f"{path} has different columns; export to a new file")
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(path, "a", newline="", encoding="utf-8")  # noqa: SIM115
+        self._writer = csv.writer(self._file)
+        if new:
+            self._writer.writerow(COLUMN_NAMES)
+
+    def _write(self, rows: list[Row]) -> None:
+        self._writer.writerows(_flat(row) for row in rows)
+        self._file.flush()
+
+    def close(self) -> None:
+        try:
+            super().close()
+        finally:
+            self._file.close()
+
+
+_SQLITE_TYPES = {
+    "int": "INTEGER",
+    "float": "REAL",
+    "str": "TEXT",
+    "timestamp": "TEXT",
+    "list": "TEXT",
+    "bool": "INTEGER",
+}
+
+
+class SqliteExporter(Exporter):
+    """Appends rows to the results table of a SQLite database, one transaction per batch."""
+
+    def __init__(self, path: Path, batch_size: int = DEFAULT_BATCH_SIZE) -> None:
+        super().__init__(path, batch_size)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(path, timeout=10.0, isolation_level=None)
+        try:
+            columns = [row[1] for row in self._conn.execute(f"PRAGMA table_info({SQLITE_TABLE})")]
+            if not columns:
+                definition = ", ".join(f"{name} {_SQLITE_TYPES[kind]}" for name, kind in COLUMNS)
+                self._conn.execute(f"CREATE TABLE IF NOT EXISTS {SQLITE_TABLE} ({definition})")
+            elif columns != COLUMN_NAMES:
+                raise ValueError(f"Table {SQLITE_TABLE} in {path} has different columns; export to a new database")
+        except BaseException:
+            self._conn.close()
+            raise
+        placeholders = ", ".join("?" * len(COLUMNS))
+        self._insert = f"INSERT INTO {SQLITE_TABLE} ({', '.join(COLUMN_NAMES)}) VALUES ({placeholders})"
+
+    def _write(self, rows: list[Row]) -> None:
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            self._conn.executemany(self._insert, (_flat(row) for row in rows))
+            self._conn.execute("COMMIT")
+        except BaseException:
+            self._conn.execute("ROLLBACK")
+            raise
+
+    def close(self) -> None:
+        try:
+            super().close()
+        finally:
+            self._conn.close()
+
+
+class ParquetExporter(Exporter):
+    """Appends to a Parquet dataset directory, one new part file per export run.
+
+    Parquet files can't be appended to, so path is a directory (as written by
+    Spark or pyarrow.dataset) and every run adds a file with one row group per
+    batch. The file only appears under its final name once it is complete.
+    """
+
+    def __init__(self, path: Path, batch_size: int = DEFAULT_BATCH_SIZE) -> None:
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError(
+                "Parquet export requires the 'pyarrow' package (pip install 'searxngcli[parquet]')"
+            ) from None
+
+        super().__init__(path, batch_size)
+        if path.exists() and not path.is_dir():
+            raise ValueError(f"{path} is not a Parquet dataset directory")
+        types = {
+            "int": pa.int64(),
+            "float": pa.float64(),
+            "str": pa.string(),
+            "timestamp": pa.timestamp("ms", tz="UTC"),
+            "list": pa.list_(pa.string()),
+            "bool": pa.bool_(),
+        }
+        self._pa = pa
+        self._schema = pa.schema(
+            [(name, types[kind]) for name, kind in COLUMNS],
+            metadata={"searxngcli.schema_version": str(EXPORT_SCHEMA_VERSION)},
+        )
+        path.mkdir(parents=True, exist_ok=True)
+        name = f"part-{datetime.now(timezone.utc):%Y%m%dT%H%M%S%f}-{os.getpid()}.parquet"
+        self._part = path / name
+        self._tmp_part = path / f".{name}.tmp"
+        self._writer = pq.ParquetWriter(self._tmp_part, self._schema, compression="zstd")
+
+    def _write(self, rows: list[Row]) -> None:
+        columns = dict(zip(COLUMN_NAMES, zip(*rows, strict=True), strict=True))
+        self._writer.write_table(self._pa.Table.from_pydict(columns, schema=self._schema))
+
+    def close(self) -> None:
+        try:
+            super().close()
+        finally:
+            # Batches written before a failure still form a valid file.
+            self._writer.close()
+            if self.written:
+                os.replace(self._tmp_part, self._part)
+            else:
+                self._tmp_part.unlink(missing_ok=True)
+
+
+_EXPORTERS: dict[str, type[Exporter]] = {"csv": CsvExporter, "parquet": ParquetExporter, "sqlite": SqliteExporter}
+
+
+def open_exporter(path: Path, batch_size: int = DEFAULT_BATCH_SIZE) -> Exporter:
+    """Open a dataset for appending, picking the format from the path's extension."""
+    return _EXPORTERS[export_format(path)](path, batch_size)
@@ -0,0 +1,107 @@
+"""Main-text extraction from HTML pages, using only the standard library."""
+
+import re
+from html.parser import HTMLParser
+
+# Elements whose content is never part of the readable text.
+SKIP_TAGS = frozenset(
+    {"script", "style", "noscript", "template", "svg", "canvas", "iframe", "head", "nav", "header", "footer", "aside"}
+    | {"form", "button", "select", "textarea", "dialog", "menu"}
+)
+
+# Elements that start a new paragraph of text.
+BLOCK_TAGS = frozenset(
+    {"p", "div", "section", "article", "main", "li", "ul", "ol", "dl", "dt", "dd", "table", "tr", "td", "th"}
+    | {"h1", "h2", "h3", "h4", "h5", "h6", "pre", "blockquote", "figcaption", "br", "hr", "summary", "details"}
+)
+
+# Elements holding the main content of a page, when it marks it up.
+MAIN_TAGS = frozenset({"main", "article"})
+
+# Elements with no end tag, which must not be counted as open.
+VOID_TAGS = frozenset(
+    {"area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta", "source", "track", "wbr"}
+)
+
+# A <main> or <article> with less text than this is taken to be a teaser, not the content.
+MIN_MAIN_TEXT = 200
+
+_META_CHARSET = re.compile(rb"""<meta[^>]+charset=["']?([\w-]+)""", re.IGNORECASE)
+
+
+def sniff_charset(body: bytes) -> str | None:
+    """Find the charset declared in a <meta> tag near the start of an HTML document."""
+    match = _META_CHARSET.search(body[:2048])
+    return match.group(1).decode("ascii") if match else None
+
+
+class _TextParser(HTMLParser):
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=True)
+        self.title = ""
+        self.blocks: list[str] = []
+        self.main_blocks: list[str] = []
+        self._current: list[str] = []
+        self._skip = 0
+        self._main = 0
+        self._in_title = False
+
+    def handle_starttag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+        if tag in VOID_TAGS:
+            if tag in BLOCK_TAGS:
+                self._flush()
+            return
+        if tag in SKIP_TAGS:
+            self._skip += 1
+        elif tag == "title":
+            self._in_title = True
+        if tag in BLOCK_TAGS:
+            self._flush()
+        if tag in MAIN_TAGS:
+            self._main += 1
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag in SKIP_TAGS:
+            self._skip = max(0, self._skip - 1)
+        elif tag == "title":
+            self._in_title = False
+        if tag in BLOCK_TAGS:
+            self._flush()
+        if tag in MAIN_TAGS:
+            self._main = max(0, self._main - 1)
+
+    def handle_data(self, data: str) -> None:
+        if self._in_title:
+            self.title += data
+        elif not self._skip:
+            self._current.append(data)
+
+    def _flush(self) -> None:
+        text = " ".join("".join(self._current).split())
+        self._current.clear()
+        if not text:
+            return
+        self.blocks.append(text)
+        if self._main:
+            self.main_blocks.append(text)
+
+    def close(self) -> None:
+        super().close()
+        self._flush()
+
+
+def extract_text(html: str) -> tuple[str, str]:
+    """Return the title and the readable main text of an HTML document.
+
+    Scripts, styles, navigation, headers, footers and forms are dropped. When
+    the page marks up its content with <main> or <article>, only that is kept.
+    Paragraphs are separated by blank lines.
+    """
+    parser = _TextParser()
+    parser.feed(html)
+    parser.close()
+
+    blocks = parser.blocks
+    if sum(len(block) for block in parser.main_blocks) >= MIN_MAIN_TEXT:
+        blocks = parser.main_blocks
+    return " ".join(parser.title.split()), "\n\n".join(blocks)
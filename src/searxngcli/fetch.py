@@ -0,0 +1,320 @@
+"""Concurrent downloading of the pages behind search results."""
+
+import sqlite3
+import threading
+import time
+import zlib
+from collections.abc import Sequence
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from urllib.parse import urlsplit
+
+import httpx
+
+from . import __version__
+from .config import DEFAULT_CONNECT_TIMEOUT, DEFAULT_FETCH_MAX_BYTES, DEFAULT_FETCH_PER_HOST
+from .extract import extract_text, sniff_charset
+from .logging import get_logger
+from .models import FetchedPage
+
+logger = get_logger(__name__)
+
+PAGES_FILENAME = "pages.db"
+DEFAULT_FETCH_TIMEOUT = 15.0
+DEFAULT_FETCH_CONCURRENCY = 8
+# Cached pages younger than this are used without asking the server.
+DEFAULT_PAGE_FRESHNESS = 3600
+DEFAULT_PAGE_CACHE_MAX_SIZE = 100 * 1024 * 1024
+
+# Fraction of max_size to shrink to when evicting, as in the search cache.
+EVICTION_TARGET = 0.9
+
+TEXT_CONTENT_TYPES = ("text/html", "application/xhtml+xml", "text/plain")
+
+ACCEPT = "text/html,application/xhtml+xml,text/plain;q=0.9,*/*;q=0.5"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS pages (
+    url TEXT PRIMARY KEY,
+    status INTEGER NOT NULL,
+    content_type TEXT NOT NULL,
+    etag TEXT,
+    last_modified TEXT,
+    title TEXT NOT NULL,
+    text TEXT NOT NULL,
+    body BLOB NOT NULL,
+    truncated INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    fetched_at REAL NOT NULL,
+    accessed_at REAL NOT NULL
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS pages_accessed_at ON pages (accessed_at);
+"""
+
+
+@dataclass
+class CachedPage:
+    """A page body stored with its HTTP validators."""
+
+    page: FetchedPage
+    body: bytes
+    etag: str | None
+    last_modified: str | None
+    fetched_at: float
+
+
+class PageCache:
+    """SQLite-backed cache of fetched page bodies and their extracted text, keyed by URL.
+
+    Bodies are stored zlib-compressed along with ETag and Last-Modified, so
+    stale entries can be revalidated with a conditional GET. The least recently
+    used pages are evicted beyond max_size bytes.
+    """
+
+    def __init__(self, path: Path, max_size: int = DEFAULT_PAGE_CACHE_MAX_SIZE) -> None:
+        self.path = path
+        self.max_size = max_size
+        self._conn: sqlite3.Connection | None = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=10.0, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(_SCHEMA)
+            self._conn = conn
+        return self._conn
+
+    def get(self, url: str) -> CachedPage | None:
+        """Return the stored page, or None if the URL was never fetched."""
+        with self._lock:
+            conn = self._connect()
+            row = conn.execute(
+                "SELECT status, content_type, etag, last_modified, title, text, body, truncated, fetched_at"
+                " FROM pages WHERE url = ?",
+                (url,),
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute("UPDATE pages SET accessed_at = ? WHERE url = ?", (time.time(), url))
+
+        status, content_type, etag, last_modified, title, text, blob, truncated, fetched_at = row
+        try:
+            body = zlib.decompress(blob)
+        except zlib.error as e:
+            logger.debug("Dropping corrupt page cache entry %s: %s", url, e)
+            return None
+        page = FetchedPage(
+            url=url,
+            status=status,
+            content_type=content_type,
+            title=title,
+            text=text,
+            size=len(body),
+            truncated=bool(truncated),
+            from_cache=True,
+        )
+        return CachedPage(page=page, body=body, etag=etag, last_modified=last_modified, fetched_at=fetched_at)
+
+    def put(self, page: FetchedPage, body: bytes, etag: str | None, last_modified: str | None) -> None:
+        """Store a freshly downloaded page and evict pages if the cache grew too large."""
+        now = time.time()
+        blob = zlib.compress(body)
+        size = len(blob) + len(page.text.encode())
+        with self._lock:
+            conn = self._connect()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.execute(
+                    "INSERT OR REPLACE INTO pages (url, status, content_type, etag, last_modified, title, text, body,"
+                    " truncated, size, fetched_at, accessed_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        page.url,
+                        page.status,
+                        page.content_type,
+                        etag,
+                        last_modified,
+                        page.title,
+                        page.text,
+                        blob,
+                        page.truncated,
+                        size,
+                        now,
+                        now,
+                    ),
+                )
+                self._evict(conn)
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+
+    def touch(self, url: str) -> None:
+        """Mark a stored page as just revalidated."""
+        now = time.time()
+        with self._lock:
+            self._connect().execute("UPDATE pages SET fetched_at = ?, accessed_at = ? WHERE url = ?", (now, now, url))
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        (total,) = conn.execute("SELECT COALESCE(SUM(size), 0) FROM pages").fetchone()
+        if total <= self.max_size:
+            return
+
+        target = int(self.max_size * EVICTION_TARGET)
+        evict: list[tuple[str]] = []
+        for url, size in conn.execute("SELECT url, size FROM pages ORDER BY accessed_at"):
+            if total <= target:
+                break
+            evict.append((url,))
+            total -= size
+        conn.executemany("DELETE FROM pages WHERE url = ?", evict)
+        logger.debug("Evicted %d cached pages", len(evict))
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+def _host(url: str) -> str:
+    parts = urlsplit(url)
+    return f"{(parts.hostname or '').lower()}:{parts.port or parts.scheme}"
+
+
+def _decode(body: bytes, response: httpx.Response) -> str:
+    charset = response.charset_encoding or sniff_charset(body) or "utf-8"
+    try:
+        return body.decode(charset, errors="replace")
+    except LookupError:
+        return body.decode("utf-8", errors="replace")
+
+
+class PageFetcher:
+    """Download result pages concurrently, at most per_host at a time from any one host.
+
+    Bodies are streamed and cut off at max_bytes. HTML and plain text pages get
+    their main text extracted. With a PageCache, pages fetched within the last
+    freshness seconds are served locally, and older ones are revalidated with
+    a conditional GET.
+    """
+
+    def __init__(
+        self,
+        cache: PageCache | None = None,
+        max_bytes: int = DEFAULT_FETCH_MAX_BYTES,
+        per_host: int = DEFAULT_FETCH_PER_HOST,
+        concurrency: int = DEFAULT_FETCH_CONCURRENCY,
+        timeout: float = DEFAULT_FETCH_TIMEOUT,
+        connect_timeout: float = DEFAULT_CONNECT_TIMEOUT,
+        freshness: float = DEFAULT_PAGE_FRESHNESS,
+        transport: httpx.BaseTransport | None = None,
+    ) -> None:
+        if per_host < 1 or concurrency < 1:
+            raise ValueError("Fetch concurrency limits must be at least 1")
+        self.cache = cache
+        self.max_bytes = max_bytes
+        self.per_host = per_host
+        self.concurrency = concurrency
+        self.freshness = freshness
+        self.http = httpx.Client(
+            timeout=httpx.Timeout(timeout, connect=connect_timeout, pool=None),
+            limits=httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency),
+            headers={"User-Agent": f"searxngcli/{__version__}", "Accept": ACCEPT},
+            follow_redirects=True,
+            transport=transport,
+        )
+        self._hosts: dict[str, threading.Semaphore] = {}
+        self._hosts_lock = threading.Lock()
+
+    def __enter__(self) -> "PageFetcher":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.http.close()
+        if self.cache is not None:
+            self.cache.close()
+
+    def _host_slot(self, url: str) -> threading.Semaphore:
+        host = _host(url)
+        with self._hosts_lock:
+            slot = self._hosts.get(host)
+            if slot is None:
+                slot = self._hosts[host] = threading.Semaphore(self.per_host)
+            return slot
+
+    def fetch_all(self, urls: Sequence[str]) -> list[FetchedPage]:
+        """Fetch pages concurrently; the result list matches the order of urls."""
+        if not urls:
+            return []
+        with ThreadPoolExecutor(max_workers=min(self.concurrency, len(urls))) as executor:
+            return list(executor.map(self.fetch, urls))
+
+    def fetch(self, url: str) -> FetchedPage:
+        """Fetch one page. Failures are reported in the page's error field."""
+        if urlsplit(url).scheme not in ("http", "https"):
+            return FetchedPage(url=url, error="Unsupported URL scheme")
+
+        cached = self.cache.get(url) if self.cache is not None else None
+        if cached is not None and time.time() - cached.fetched_at < self.freshness:
+            return cached.page
+
+        headers = {}
+        if cached is not None:
+            if cached.etag:
+                headers["If-None-Match"] = cached.etag
+            if cached.last_modified:
+                headers["If-Modified-Since"] = cached.last_modified
+
+        try:
+            with self._host_slot(url):
+                return self._download(url, headers, cached)
+        except httpx.HTTPError as e:
+            logger.debug("Fetching %s failed: %s", url, e)
+            if cached is not None:
+                return cached.page
+            return FetchedPage(url=url, error=str(e) or type(e).__name__)
+
+    def _download(self, url: str, headers: dict[str, str], cached: CachedPage | None) -> FetchedPage:
+        with self.http.stream("GET", url, headers=headers) as response:
+            if response.status_code == 304 and cached is not None:
+                logger.debug("Page not modified: %s", url)
+                self.cache.touch(url)
+                return cached.page
+
+            content_type = response.headers.get("Content-Type", "").split(";")[0].strip().lower()
+            page = FetchedPage(url=url, status=response.status_code, content_type=content_type)
+            if response.status_code >= 400:
+                page.error = f"HTTP {response.status_code}"
+                return page
+
+            chunks: list[bytes] = []
+            size = 0
+            for chunk in response.iter_bytes():
+                chunks.append(chunk)
+                size += len(chunk)
+                if size > self.max_bytes:
+                    page.truncated = True
+                    break
+            body = b"".join(chunks)[: self.max_bytes]
+
+        page.size = len(body)
+        if content_type in TEXT_CONTENT_TYPES:
+            text = _decode(body, response)
+            if content_type == "text/plain":
+                page.text = text.strip()
+            else:
+                page.title, page.text = extract_text(text)
+
+        if self.cache is not None and response.status_code == 200:
+            try:
+                self.cache.put(page, body, response.headers.get("ETag"), response.headers.get("Last-Modified"))
+            except sqlite3.Error as e:
+                logger.warning("Could not cache page %s: %s", url, e)
+        return page
@@ -1,24 +1,64 @@
-"""Rich output formatting for SearXNG CLI."""
+"""Output formatting for SearXNG CLI.
 
-from rich.table import Table
+Output is assembled in full and written once. Terminals get rich styling;
+pipes get plain text without importing rich at all.
+"""
 
-from .logging import console
+import json
+import sys
+from typing import Any
+
+from .jsonutil import dumps
+from .logging import get_console
 from .models import EngineInfo, SearchResponse
 
+# Characters of fetched page text shown under a result in the terminal.
+PAGE_EXCERPT_LENGTH = 300
+
+
+def _write(lines: list[tuple[str, str]]) -> None:
+    """Write (text, rich style) lines in one go.
+
+    Pipes get the plain text; terminals get a single styled rich Text, so
+    result titles and snippets are never parsed as console markup.
+    """
+    if not sys.stdout.isatty():
+        sys.stdout.write("".join(f"{text}\n" for text, _ in lines))
+        return
+
+    from rich.text import Text
+
+    output = Text()
+    for text, style in lines:
+        output.append(text, style=style or None)
+        output.append("\n")
+    get_console().print(output, end="")
+
 
 def print_results(response: SearchResponse, num: int = 10) -> None:
     """Print formatted search results."""
     if not response.results:
-        console.print("[yellow]No results found.[/yellow]")
+        message = "No results within the deadline." if response.partial else "No results found."
+        _write([(message, "yellow")])
         return
 
     results = response.results[:num]
+    lines: list[tuple[str, str]] = []
 
     for i, result in enumerate(results, 1):
-        console.print(f"\n[bold]{i}. {result.title}[/bold]")
-        console.print(f"   [dim]{result.url}[/dim]")
+        lines.append(("", ""))
+        lines.append((f"{i}. {result.title}", "bold"))
+        lines.append((f"   {result.url}", "dim"))
         if result.content:
-            console.print(f"   {result.content}")
+            lines.append((f"   {result.content}", ""))
+        if result.page is not None:
+            if result.page.error:
+                lines.append((f"   page: {result.page.error}", "yellow"))
+            elif result.page.text:
+                excerpt = " ".join(result.page.text[: PAGE_EXCERPT_LENGTH * 2].split())
+                if len(excerpt) > PAGE_EXCERPT_LENGTH or len(result.page.text) > PAGE_EXCERPT_LENGTH * 2:
+                    excerpt = excerpt[:PAGE_EXCERPT_LENGTH].rstrip() + "…"
+                lines.append((f"   page: {excerpt}", "cyan"))
         engines_str = ", ".join(result.engines) if result.engines else result.engine
         meta_parts = []
         if engines_str:
@@ -26,46 +66,100 @@ def print_results(response: SearchResponse, num: int = 10) -> None:
         if result.category:
             meta_parts.append(f"category: {result.category}")
         if result.score:
-            meta_parts.append(f"score: {result.score:.1f}")
+            # Reciprocal-rank fusion scores are small fractions; keep them distinguishable.
+            precision = 1 if result.score >= 0.1 else 4
+            meta_parts.append(f"score: {result.score:.{precision}f}")
         if result.published_date:
             meta_parts.append(f"date: {result.published_date}")
         if meta_parts:
-            console.print(f"   [dim italic]{' | '.join(meta_parts)}[/dim italic]")
+            lines.append((f"   {' | '.join(meta_parts)}", "dim italic"))
 
-    console.print(f"\n[dim]Showing {len(results)} of {response.number_of_results} results[/dim]")
+    lines.append(("", ""))
+    lines.append((f"Showing {len(results)} of {response.number_of_results} results", "dim"))
 
     if response.suggestions:
-        console.print(f"[dim]Suggestions: {', '.join(response.suggestions)}[/dim]")
+        lines.append((f"Suggestions: {', '.join(response.suggestions)}", "dim"))
 
     if response.corrections:
-        console.print(f"[dim]Corrections: {', '.join(response.corrections)}[/dim]")
+        lines.append((f"Corrections: {', '.join(response.corrections)}", "dim"))
 
     if response.unresponsive_engines:
         names = [e[0] if isinstance(e, list) and e else str(e) for e in response.unresponsive_engines]
-        console.print(f"[yellow]Unresponsive engines: {', '.join(names)}[/yellow]")
+        lines.append((f"Unresponsive engines: {', '.join(names)}", "yellow"))
+
+    if response.partial:
+        lines.append(("Partial results: the deadline passed before the search completed", "yellow"))
+
+    _write(lines)
 
 
 def print_engines(engines: list[EngineInfo]) -> None:
-    """Print a table of available engines."""
+    """Print a table of available engines, or tab-separated lines when piped."""
+    engines = sorted(engines, key=lambda e: e.name)
+    if not sys.stdout.isatty():
+        lines = [f"{e.name}\t{e.shortcut}\t{','.join(e.categories)}\t{'yes' if e.enabled else 'no'}\n" for e in engines]
+        sys.stdout.write("".join(lines))
+        return
+
+    from rich.table import Table
+    from rich.text import Text
+
     table = Table(title="Available Engines")
     table.add_column("Name", style="bold")
     table.add_column("Shortcut", style="dim")
     table.add_column("Categories")
     table.add_column("Enabled")
 
-    for engine in sorted(engines, key=lambda e: e.name):
+    for engine in engines:
         table.add_row(
             engine.name,
             engine.shortcut,
             ", ".join(engine.categories),
-            "[green]yes[/green]" if engine.enabled else "[red]no[/red]",
+            Text("yes", style="green") if engine.enabled else Text("no", style="red"),
         )
 
-    console.print(table)
+    get_console().print(table)
 
 
 def print_categories(categories: list[str]) -> None:
-    """Print available categories."""
-    console.print("[bold]Available Categories:[/bold]")
-    for cat in sorted(categories):
-        console.print(f"  • {cat}")
+    """Print available categories, one per line when piped."""
+    if not sys.stdout.isatty():
+        sys.stdout.write("".join(f"{cat}\n" for cat in sorted(categories)))
+        return
+    _write([("Available Categories:", "bold")] + [(f"  • {cat}", "") for cat in sorted(categories)])
+
+
+def print_json(data: Any) -> None:
+    """Print data as JSON, highlighted only when writing to a terminal."""
+    if sys.stdout.isatty():
+        get_console().print_json(json.dumps(data))
+        return
+    sys.stdout.write(json.dumps(data, indent=2, ensure_ascii=False) + "\n")
+
+
+def write_jsonl(response: SearchResponse, num: int | None = None) -> None:
+    """Write results as newline-delimited JSON, one compact object per line.
+
+    Results (the first num, if given) are serialized one at a time straight to
+    stdout, followed by a final "meta" line with suggestions, corrections and
+    unresponsive engines, and "partial": true when a deadline cut the search
+    short.
+    """
+    out = sys.stdout
+    results = response.results if num is None else response.results[:num]
+    for result in results:
+        out.write(dumps({"type": "result", **result.to_dict()}))
+        out.write("\n")
+
+    meta = {
+        "type": "meta",
+        "query": response.query,
+        "number_of_results": response.number_of_results,
+        "suggestions": response.suggestions,
+        "corrections": response.corrections,
+        "unresponsive_engines": response.unresponsive_engines,
+    }
+    if response.partial:
+        meta["partial"] = True
+    out.write(dumps(meta) + "\n")
+    out.flush()
@@ -0,0 +1,195 @@
+"""Local full-text index of previously seen search results."""
+
+import re
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+from .config import DEFAULT_INDEX_MAX_AGE
+from .logging import get_logger
+from .merge import normalize_url
+from .models import SearchResponse, SearchResult
+
+logger = get_logger(__name__)
+
+INDEX_FILENAME = "index.db"
+
+# bm25 weights for the title, content, url, engines and queries columns.
+RANK_WEIGHTS = (10.0, 2.0, 4.0, 0.5, 3.0)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS pages (
+    id INTEGER PRIMARY KEY,
+    url_key TEXT NOT NULL UNIQUE,
+    url TEXT NOT NULL,
+    title TEXT NOT NULL,
+    content TEXT NOT NULL,
+    engines TEXT NOT NULL,
+    queries TEXT NOT NULL,
+    category TEXT NOT NULL,
+    score REAL NOT NULL,
+    published_date TEXT NOT NULL,
+    first_seen REAL NOT NULL,
+    last_seen REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS pages_last_seen ON pages (last_seen);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS pages_fts USING fts5(
+    title, content, url, engines, queries,
+    content='pages', content_rowid='id', tokenize='unicode61 remove_diacritics 2'
+);
+
+CREATE TRIGGER IF NOT EXISTS pages_ai AFTER INSERT ON pages BEGIN
+    INSERT INTO pages_fts (rowid, title, content, url, engines, queries)
+    VALUES (new.id, new.title, new.content, new.url, new.engines, new.queries);
+END;
+CREATE TRIGGER IF NOT EXISTS pages_ad AFTER DELETE ON pages BEGIN
+    INSERT INTO pages_fts (pages_fts, rowid, title, content, url, engines, queries)
+    VALUES ('delete', old.id, old.title, old.content, old.url, old.engines, old.queries);
+END;
+CREATE TRIGGER IF NOT EXISTS pages_au AFTER UPDATE ON pages BEGIN
+    INSERT INTO pages_fts (pages_fts, rowid, title, content, url, engines, queries)
+    VALUES ('delete', old.id, old.title, old.content, old.url, old.engines, old.queries);
+    INSERT INTO pages_fts (rowid, title, content, url, engines, queries)
+    VALUES (new.id, new.title, new.content, new.url, new.engines, new.queries);
+END;
+"""
+
+# A page seen again keeps its first_seen, gets the latest title and snippet and
+# collects every query it was found by.
+_UPSERT = """
+INSERT INTO pages (
+    url_key, url, title, content, engines, queries, category, score, published_date, first_seen, last_seen
+)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (url_key) DO UPDATE SET
+    url = excluded.url,
+    title = excluded.title,
+    content = CASE WHEN excluded.content != '' THEN excluded.content ELSE content END,
+    engines = excluded.engines,
+    queries = CASE
+        WHEN instr(char(10) || queries || char(10), char(10) || excluded.queries || char(10)) THEN queries
+        ELSE queries || char(10) || excluded.queries
+    END,
+    category = excluded.category,
+    score = excluded.score,
+    published_date = excluded.published_date,
+    last_seen = excluded.last_seen
+"""
+
+
+def build_match_query(terms: str) -> str:
+    """Turn free text into an FTS5 query matching all words, the last one as a prefix."""
+    words = re.findall(r"\w+", terms)
+    if not words:
+        raise ValueError("Search terms must contain at least one word")
+    quoted = [f'"{word}"' for word in words]
+    quoted[-1] += "*"
+    return " ".join(quoted)
+
+
+class ResultIndex:
+    """SQLite FTS5 index of search results, deduplicated by normalized URL.
+
+    Pages not seen for max_age days are pruned whenever new results are added.
+    """
+
+    def __init__(self, path: Path, max_age_days: float = DEFAULT_INDEX_MAX_AGE) -> None:
+        self.path = path
+        self.max_age = max_age_days * 86400
+        self._conn: sqlite3.Connection | None = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=10.0, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(_SCHEMA)
+            self._conn = conn
+        return self._conn
+
+    def add(self, query: str, results: list[dict]) -> None:
+        """Record raw /search results found by query."""
+        now = time.time()
+        rows = []
+        for result in results:
+            url = result.get("url")
+            if not url:
+                continue
+            engines = result.get("engines") or [result.get("engine", "")]
+            rows.append(
+                (
+                    normalize_url(url),
+                    url,
+                    result.get("title") or "",
+                    result.get("content") or "",
+                    ", ".join(e for e in engines if e),
+                    query,
+                    result.get("category") or "",
+                    result.get("score") or 0.0,
+                    result.get("publishedDate") or "",
+                    now,
+                    now,
+                )
+            )
+        if not rows:
+            return
+
+        with self._lock:
+            conn = self._connect()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.executemany(_UPSERT, rows)
+                self._prune(conn, now)
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        logger.debug("Indexed %d results for %r", len(rows), query)
+
+    def _prune(self, conn: sqlite3.Connection, now: float) -> None:
+        count = conn.execute("DELETE FROM pages WHERE last_seen < ?", (now - self.max_age,)).rowcount
+        if count:
+            logger.debug("Pruned %d pages from the local index", count)
+
+    def search(self, terms: str, limit: int = 10) -> SearchResponse:
+        """Find indexed pages matching all words of terms, best matches first."""
+        match = build_match_query(terms)
+        weights = ", ".join(str(w) for w in RANK_WEIGHTS)
+        with self._lock:
+            rows = (
+                self._connect()
+                .execute(
+                    "SELECT p.url, p.title, p.content, p.engines, p.category, p.score, p.published_date"
+                    " FROM pages_fts JOIN pages p ON p.id = pages_fts.rowid"
+                    f" WHERE pages_fts MATCH ? ORDER BY bm25(pages_fts, {weights}) LIMIT ?",
+                    (match, limit),
+                )
+                .fetchall()
+            )
+
+        results = []
+        for url, title, content, engines, category, score, published_date in rows:
+            engine_list = engines.split(", ") if engines else []
+            results.append(
+                SearchResult(
+                    title=title,
+                    url=url,
+                    content=content,
+                    engine=engine_list[0] if engine_list else "",
+                    engines=engine_list,
+                    category=category,
+                    score=score,
+                    published_date=published_date,
+                )
+            )
+        return SearchResponse(query=terms, number_of_results=len(results), results=results)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
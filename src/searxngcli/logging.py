@@ -1,12 +1,76 @@
 """Logging configuration for SearXNG CLI."""
 
 import logging
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import TYPE_CHECKING
 
-from rich.console import Console
-from rich.logging import RichHandler
+if TYPE_CHECKING:
+    from rich.console import Console
 
-console = Console()
-error_console = Console(stderr=True)
+_console: "Console | None" = None
+_error_console: "Console | None" = None
+_local = threading.local()
+
+
+@contextmanager
+def use_consoles(console: "Console", error_console: "Console") -> Iterator[None]:
+    """Route output of the current thread to the given consoles."""
+    _local.consoles = (console, error_console)
+    try:
+        yield
+    finally:
+        del _local.consoles
+
+
+def get_console() -> "Console":
+    """Get the rich console for standard output, creating it on first use."""
+    global _console
+    consoles = getattr(_local, "consoles", None)
+    if consoles is not None:
+        return consoles[0]
+    if _console is None:
+        from rich.console import Console
+
+        _console = Console()
+    return _console
+
+
+def get_error_console() -> "Console":
+    """Get the rich console for standard error, creating it on first use."""
+    global _error_console
+    consoles = getattr(_local, "consoles", None)
+    if consoles is not None:
+        return consoles[1]
+    if _error_console is None:
+        from rich.console import Console
+
+        _error_console = Console(stderr=True)
+    return _error_console
+
+
+class _LazyRichHandler(logging.Handler):
+    """Logging handler that only imports rich once a record is actually emitted."""
+
+    def __init__(self, verbose: bool) -> None:
+        super().__init__()
+        self.verbose = verbose
+        self._handler: logging.Handler | None = None
+
+    def emit(self, record: logging.LogRecord) -> None:
+        if self._handler is None:
+            from rich.logging import RichHandler
+
+            self._handler = RichHandler(
+                console=get_error_console(),
+                rich_tracebacks=True,
+                show_time=self.verbose,
+                show_path=self.verbose,
+            )
+            self._handler.setFormatter(self.formatter)
+        self._handler.console = get_error_console()
+        self._handler.handle(record)
 
 
 def setup_logging(verbose: bool = False) -> None:
@@ -17,14 +81,7 @@ def setup_logging(verbose: bool = False) -> None:
         level=level,
         format="%(message)s",
         datefmt="[%X]",
-        handlers=[
-            RichHandler(
-                console=error_console,
-                rich_tracebacks=True,
-                show_time=verbose,
-                show_path=verbose,
-            )
-        ],
+        handlers=[_LazyRichHandler(verbose=verbose)],
     )
 
     if not verbose:
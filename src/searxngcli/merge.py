@@ -0,0 +1,151 @@
+"""Merging and deduplication of search results."""
+
+from collections.abc import Iterable
+from dataclasses import replace
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+from .models import SearchResponse, SearchResult
+
+TRACKING_PARAM_PREFIXES = ("utm_",)
+TRACKING_PARAMS = {"fbclid", "gclid"}
+
+# Reciprocal-rank fusion constant; larger values flatten the advantage of top ranks.
+RRF_K = 60
+
+
+def normalize_url(url: str) -> str:
+    """Normalize a URL for duplicate detection.
+
+    Ignores the http/https scheme difference, letter case of the host, a leading
+    "www.", default ports, trailing slashes, fragments and common tracking params.
+    """
+    parts = urlsplit(url.strip())
+    if parts.scheme.lower() not in ("http", "https") or not parts.hostname:
+        return url.strip()
+
+    host = parts.hostname.lower().removeprefix("www.")
+    if parts.port and parts.port not in (80, 443):
+        host = f"{host}:{parts.port}"
+
+    query = sorted(
+        (name, value)
+        for name, value in parse_qsl(parts.query, keep_blank_values=True)
+        if name not in TRACKING_PARAMS and not name.startswith(TRACKING_PARAM_PREFIXES)
+    )
+    normalized = host + parts.path.rstrip("/")
+    if query:
+        normalized += "?" + urlencode(query)
+    return normalized
+
+
+def _unique(items: Iterable) -> list:
+    seen: list = []
+    for item in items:
+        if item not in seen:
+            seen.append(item)
+    return seen
+
+
+class ResultMerger:
+    """Accumulates results, deduplicating them by normalized URL.
+
+    A duplicate keeps the position of its first occurrence, the fields of the
+    higher scored copy and the union of both engine lists.
+    """
+
+    def __init__(self) -> None:
+        self._results: dict[str, SearchResult] = {}
+
+    def __len__(self) -> int:
+        return len(self._results)
+
+    def add(self, results: Iterable[SearchResult]) -> None:
+        for result in results:
+            key = normalize_url(result.url) if result.url else f"#{len(self._results)}"
+            existing = self._results.get(key)
+            if existing is None:
+                self._results[key] = result
+                continue
+
+            best = result if result.score > existing.score else existing
+            engines = _unique([*existing.engines, *result.engines])
+            self._results[key] = replace(best, engines=engines)
+
+    @property
+    def results(self) -> list[SearchResult]:
+        return list(self._results.values())
+
+
+def merge_responses(responses: list[SearchResponse], limit: int | None = None) -> SearchResponse:
+    """Merge responses for the same query into one deduplicated response."""
+    merger = ResultMerger()
+    for response in responses:
+        merger.add(response.results)
+
+    results = merger.results
+    return SearchResponse(
+        query=responses[0].query if responses else "",
+        number_of_results=max((r.number_of_results for r in responses), default=0),
+        results=results[:limit] if limit is not None else results,
+        suggestions=_unique(s for r in responses for s in r.suggestions),
+        corrections=_unique(c for r in responses for c in r.corrections),
+        unresponsive_engines=_unique(e for r in responses for e in r.unresponsive_engines),
+        partial=any(r.partial for r in responses),
+    )
+
+
+class RankFusion:
+    """Combines ranked result lists, one per engine, with reciprocal-rank fusion.
+
+    A result scores the sum of 1 / (k + rank) over the lists it appears in,
+    after deduplication by normalized URL, so results several engines agree on
+    rise to the top. Fused results carry that score and every engine that found
+    them; their other fields come from the copy ranked highest.
+    """
+
+    def __init__(self, k: int = RRF_K) -> None:
+        self.k = k
+        self._results: dict[str, SearchResult] = {}
+        self._ranks: dict[str, int] = {}
+        self._scores: dict[str, float] = {}
+        self._engines: dict[str, list[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._results)
+
+    def add(self, engine: str, results: Iterable[SearchResult]) -> None:
+        """Fold in one engine's results, best first."""
+        seen: set[str] = set()
+        for rank, result in enumerate(results, 1):
+            key = normalize_url(result.url) if result.url else f"#{engine}#{rank}"
+            if key in seen:
+                continue
+            seen.add(key)
+            self._scores[key] = self._scores.get(key, 0.0) + 1 / (self.k + rank)
+            self._engines[key] = _unique([*self._engines.get(key, []), engine, *result.engines])
+            if key not in self._results or rank < self._ranks[key]:
+                self._results[key] = result
+                self._ranks[key] = rank
+
+    @property
+    def results(self) -> list[SearchResult]:
+        """Fused results, best first; ties keep the order in which they were first seen."""
+        keys = sorted(self._results, key=lambda key: -self._scores[key])
+        return [
+            replace(self._results[key], engines=self._engines[key], score=round(self._scores[key], 6)) for key in keys
+        ]
+
+
+def fuse_responses(
+    responses: Iterable[tuple[str, SearchResponse]], limit: int | None = None, k: int = RRF_K
+) -> SearchResponse:
+    """Fuse per-engine responses for the same query into one response ranked by reciprocal-rank fusion."""
+    responses = list(responses)
+    fusion = RankFusion(k)
+    for engine, response in responses:
+        fusion.add(engine, response.results)
+
+    merged = merge_responses([response for _, response in responses])
+    results = fusion.results
+    merged.results = results[:limit] if limit is not None else results
+    return merged
@@ -0,0 +1,118 @@
+"""Local snapshot of the SearXNG instance /config metadata."""
+
+import difflib
+import hashlib
+import json
+import os
+import tempfile
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from .logging import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_MAX_AGE = 600
+
+
+@dataclass
+class ConfigSnapshot:
+    """A stored copy of the /config document with its HTTP validators."""
+
+    data: dict = field(default_factory=dict)
+    etag: str | None = None
+    last_modified: str | None = None
+    fetched_at: float = 0.0
+
+    def age(self) -> float:
+        return time.time() - self.fetched_at
+
+    @property
+    def engine_names(self) -> set[str]:
+        return {e.get("name", "") for e in self.data.get("engines", [])}
+
+    @property
+    def categories(self) -> set[str]:
+        return set(self.data.get("categories", []))
+
+
+def snapshot_path(cache_dir: Path, base_url: str) -> Path:
+    """Get the snapshot file path for an instance."""
+    digest = hashlib.sha256(base_url.encode()).hexdigest()[:16]
+    return cache_dir / "metadata" / f"{digest}.json"
+
+
+class MetadataStore:
+    """File-backed store for the /config snapshot of one instance."""
+
+    def __init__(self, path: Path, max_age: float = DEFAULT_MAX_AGE) -> None:
+        self.path = path
+        self.max_age = max_age
+        self._snapshot: ConfigSnapshot | None = None
+
+    def load(self) -> ConfigSnapshot | None:
+        """Load the stored snapshot, or None if there is none."""
+        if self._snapshot is not None:
+            return self._snapshot
+        try:
+            with open(self.path, "rb") as f:
+                stored = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.debug("Ignoring unreadable metadata snapshot %s: %s", self.path, e)
+            return None
+
+        self._snapshot = ConfigSnapshot(
+            data=stored.get("data", {}),
+            etag=stored.get("etag"),
+            last_modified=stored.get("last_modified"),
+            fetched_at=stored.get("fetched_at", 0.0),
+        )
+        return self._snapshot
+
+    def save(self, snapshot: ConfigSnapshot) -> None:
+        """Atomically replace the stored snapshot."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        stored = {
+            "data": snapshot.data,
+            "etag": snapshot.etag,
+            "last_modified": snapshot.last_modified,
+            "fetched_at": snapshot.fetched_at,
+        }
+        fd, tmp_path = tempfile.mkstemp(dir=self.path.parent, prefix=".snapshot-")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(stored, f, separators=(",", ":"))
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            Path(tmp_path).unlink(missing_ok=True)
+            raise
+        self._snapshot = snapshot
+
+    def is_stale(self, snapshot: ConfigSnapshot) -> bool:
+        return snapshot.age() > self.max_age
+
+
+def _check_names(kind: str, value: str, known: set[str]) -> None:
+    unknown = [name for name in (n.strip() for n in value.split(",")) if name and name not in known]
+    if not unknown:
+        return
+
+    hints = []
+    for name in unknown:
+        matches = difflib.get_close_matches(name, known, n=1)
+        hints.append(f"{name} (did you mean {matches[0]}?)" if matches else name)
+    raise ValueError(f"Unknown {kind}: {', '.join(hints)}")
+
+
+def validate_filters(snapshot: ConfigSnapshot, categories: str | None = None, engines: str | None = None) -> None:
+    """Check category and engine names against the snapshot.
+
+    Raises ValueError listing unknown names with the closest known match.
+    """
+    if categories:
+        _check_names("categories", categories, snapshot.categories)
+    if engines:
+        _check_names("engines", engines, snapshot.engine_names)
@@ -1,9 +1,45 @@
 """Data models for SearXNG CLI."""
 
+from collections.abc import Iterator, Sequence
 from dataclasses import dataclass, field
+from typing import overload
 
 
-@dataclass
+@dataclass(slots=True)
+class FetchedPage:
+    """The downloaded page behind a search result, reduced to its main text."""
+
+    url: str
+    status: int = 0
+    content_type: str = ""
+    title: str = ""
+    text: str = ""
+    size: int = 0
+    truncated: bool = False
+    from_cache: bool = False
+    error: str | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    def to_dict(self) -> dict:
+        data = {
+            "url": self.url,
+            "status": self.status,
+            "content_type": self.content_type,
+            "title": self.title,
+            "text": self.text,
+            "size": self.size,
+            "truncated": self.truncated,
+            "from_cache": self.from_cache,
+        }
+        if self.error is not None:
+            data["error"] = self.error
+        return data
+
+
+@dataclass(slots=True)
 class SearchResult:
     """A single search result."""
 
@@ -16,6 +52,7 @@ class SearchResult:
     score: float = 0.0
     published_date: str = ""
     thumbnail: str = ""
+    page: FetchedPage | None = None
 
     @classmethod
     def from_dict(cls, data: dict) -> "SearchResult":
@@ -31,31 +68,106 @@ class SearchResult:
             thumbnail=data.get("thumbnail", ""),
         )
 
+    def to_dict(self) -> dict:
+        data = {
+            "title": self.title,
+            "url": self.url,
+            "content": self.content,
+            "engine": self.engine,
+            "engines": self.engines,
+            "category": self.category,
+            "score": self.score,
+            "published_date": self.published_date,
+            "thumbnail": self.thumbnail,
+        }
+        if self.page is not None:
+            data["page"] = self.page.to_dict()
+        return data
+
+
+class LazyResults(Sequence[SearchResult]):
+    """Results decoded from the raw response entries on first access.
+
+    Large responses are usually only partially displayed, so entries that are
+    never looked at are never turned into SearchResult objects.
+    """
+
+    __slots__ = ("_raw", "_decoded")
+
+    def __init__(self, raw: list[dict]) -> None:
+        self._raw = raw
+        self._decoded: list[SearchResult | None] = [None] * len(raw)
 
-@dataclass
+    def __len__(self) -> int:
+        return len(self._raw)
+
+    @overload
+    def __getitem__(self, index: int) -> SearchResult: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[SearchResult]: ...
+
+    def __getitem__(self, index: int | slice) -> SearchResult | list[SearchResult]:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self._raw)))]
+
+        result = self._decoded[index]
+        if result is None:
+            result = self._decoded[index] = SearchResult.from_dict(self._raw[index])
+        return result
+
+    def __iter__(self) -> Iterator[SearchResult]:
+        for i in range(len(self._raw)):
+            yield self[i]
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, Sequence):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other, strict=True))
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"LazyResults({len(self._raw)} results)"
+
+
+@dataclass(slots=True)
 class SearchResponse:
     """Response from a search query."""
 
     query: str = ""
     number_of_results: int = 0
-    results: list[SearchResult] = field(default_factory=list)
+    results: Sequence[SearchResult] = field(default_factory=list)
     suggestions: list[str] = field(default_factory=list)
     corrections: list[str] = field(default_factory=list)
     unresponsive_engines: list[list[str]] = field(default_factory=list)
+    # Set when a deadline cut the search short and only what arrived in time is included.
+    partial: bool = False
 
     @classmethod
     def from_dict(cls, data: dict) -> "SearchResponse":
         return cls(
             query=data.get("query", ""),
             number_of_results=data.get("number_of_results", 0),
-            results=[SearchResult.from_dict(r) for r in data.get("results", [])],
+            results=LazyResults(data.get("results", [])),
             suggestions=data.get("suggestions", []),
             corrections=data.get("corrections", []),
             unresponsive_engines=data.get("unresponsive_engines", []),
         )
 
+    def to_dict(self) -> dict:
+        data = {
+            "query": self.query,
+            "number_of_results": self.number_of_results,
+            "results": [r.to_dict() for r in self.results],
+            "suggestions": self.suggestions,
+            "corrections": self.corrections,
+            "unresponsive_engines": self.unresponsive_engines,
+        }
+        if self.partial:
+            data["partial"] = True
+        return data
+
 
-@dataclass
+@dataclass(slots=True)
 class EngineInfo:
     """Information about a search engine."""
 
@@ -0,0 +1,91 @@
+"""Load balancing and failover across multiple SearXNG instances."""
+
+import threading
+import time
+from collections.abc import Collection, Sequence
+from dataclasses import dataclass
+
+from .logging import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_COOLDOWN = 30.0
+
+# Status codes that indicate an overloaded or broken instance rather than a bad request.
+FAILURE_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
+
+@dataclass
+class Instance:
+    """A pooled instance and its load and health state."""
+
+    url: str
+    weight: float = 1.0
+    outstanding: int = 0
+    ejected_until: float = 0.0
+    failures: int = 0
+
+    def is_healthy(self, now: float) -> bool:
+        return self.ejected_until <= now
+
+    @property
+    def load(self) -> float:
+        return (self.outstanding + 1) / self.weight
+
+
+class InstancePool:
+    """Picks instances by least outstanding requests relative to their weight.
+
+    Instances that fail are ejected for a cool-down period, which doubles with
+    every consecutive failure up to 8 times the base cool-down.
+    """
+
+    def __init__(self, instances: Sequence[tuple[str, float]], cooldown: float = DEFAULT_COOLDOWN) -> None:
+        if not instances:
+            raise ValueError("An instance pool needs at least one instance")
+        self.instances = [Instance(url=url.rstrip("/"), weight=weight) for url, weight in instances]
+        self.cooldown = cooldown
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.instances)
+
+    def acquire(self, exclude: Collection[str] = ()) -> Instance:
+        """Reserve the least loaded healthy instance.
+
+        If every candidate is ejected, the one that recovers soonest is used.
+        """
+        now = time.monotonic()
+        with self._lock:
+            candidates = [i for i in self.instances if i.url not in exclude] or self.instances
+            healthy = [i for i in candidates if i.is_healthy(now)]
+            instance = min(healthy, key=lambda i: i.load) if healthy else min(candidates, key=lambda i: i.ejected_until)
+            instance.outstanding += 1
+            return instance
+
+    def release(self, instance: Instance, ok: bool, retry_after: float | None = None) -> None:
+        """Return an instance to the pool, ejecting it if the request failed.
+
+        A Retry-After from the instance extends the cool-down if it is longer.
+        """
+        with self._lock:
+            instance.outstanding -= 1
+            if ok:
+                instance.failures = 0
+                instance.ejected_until = 0.0
+                return
+            instance.failures += 1
+            cooldown = max(self.cooldown * 2 ** min(instance.failures - 1, 3), retry_after or 0.0)
+            instance.ejected_until = time.monotonic() + cooldown
+        logger.debug("Ejected %s for %.0f s after %d failures", instance.url, cooldown, instance.failures)
+
+    def cancel(self, instance: Instance) -> None:
+        """Return an instance to the pool without judging its health."""
+        with self._lock:
+            instance.outstanding -= 1
+
+    def has_healthy(self, exclude: Collection[str] = ()) -> bool:
+        """Whether a healthy instance outside exclude is available."""
+        now = time.monotonic()
+        with self._lock:
+            return any(i.is_healthy(now) for i in self.instances if i.url not in exclude)
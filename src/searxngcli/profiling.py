@@ -0,0 +1,262 @@
+"""CPU and memory profiling of one invocation, split into phases.
+
+Enabled with --profile-output DIR or SEARXNG_PROFILE=DIR, the command runs
+under cProfile and tracemalloc from the first line of the entry point. Time
+and allocations are attributed to the innermost active phase: startup (imports
+and argument parsing), config, http, model (building SearchResponse and its
+results), render, and other for the rest of the command. Only the main thread
+is profiled; work on worker threads shows up as the main thread waiting in the
+phase that started it.
+
+tracemalloc's traces are cleared whenever the phase changes, so each segment's
+snapshot holds just the blocks allocated in it that are still alive at its end,
+and taking it costs little however large the heap already is. Each run writes
+a directory with one pstats file per phase, the numbered snapshots of every
+segment and a profile.json summary with the time and memory of every phase;
+`searxng profile report` reads them and groups the snapshots' allocation sites,
+which is too slow to do while profiling. This module only uses the standard
+library.
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import AbstractContextManager, contextmanager, nullcontext
+from pathlib import Path
+from typing import Any
+
+PROFILE_ENV = "SEARXNG_PROFILE"
+PHASES = ("startup", "config", "http", "model", "render", "other")
+SUMMARY_FILENAME = "profile.json"
+SNAPSHOTS_DIRNAME = "snapshots"
+SUMMARY_VERSION = 1
+
+_active: "Profiler | None" = None
+
+
+class _PhaseStats:
+    def __init__(self) -> None:
+        self.seconds = 0.0
+        self.segments = 0
+        self.retained_bytes = 0
+        self.peak_bytes = 0
+
+
+class Profiler:
+    """Switches cProfile profiles and tracemalloc measurements as phases are entered and left."""
+
+    def __init__(self, output_dir: Path, argv: list[str]) -> None:
+        import cProfile
+        import tracemalloc
+
+        self._cprofile = cProfile
+        self._tracemalloc = tracemalloc
+        self.run_dir = output_dir / f"{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}"
+        self.argv = argv
+        self.started_at = time.time()
+        self._thread = threading.get_ident()
+        self._profiles: dict[str, Any] = {}
+        self._stats: dict[str, _PhaseStats] = {}
+        self._stack: list[str] = []
+        self._segment_start = 0.0
+        self._snapshots = 0
+
+    def start(self) -> None:
+        (self.run_dir / SNAPSHOTS_DIRNAME).mkdir(parents=True, exist_ok=True)
+        self._tracemalloc.start()
+        self._stack.append("startup")
+        self._begin_segment()
+
+    def _begin_segment(self) -> None:
+        self._tracemalloc.clear_traces()
+        self._segment_start = time.perf_counter()
+        profile = self._profiles.get(self._stack[-1])
+        if profile is None:
+            profile = self._profiles[self._stack[-1]] = self._cprofile.Profile()
+        profile.enable()
+
+    def _end_segment(self) -> None:
+        name = self._stack[-1]
+        self._profiles[name].disable()
+        elapsed = time.perf_counter() - self._segment_start
+        current, peak = self._tracemalloc.get_traced_memory()
+        snapshot = self._tracemalloc.take_snapshot()
+
+        stats = self._stats.setdefault(name, _PhaseStats())
+        stats.seconds += elapsed
+        stats.segments += 1
+        stats.retained_bytes += current
+        stats.peak_bytes = max(stats.peak_bytes, peak)
+        self._snapshots += 1
+        snapshot.dump(str(self.run_dir / SNAPSHOTS_DIRNAME / f"{self._snapshots:03d}-{name}.snapshot"))
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Attribute everything the main thread does inside the block to phase name."""
+        if threading.get_ident() != self._thread or not self._stack or self._stack[-1] == name:
+            yield
+            return
+        self._end_segment()
+        self._stack.append(name)
+        self._begin_segment()
+        try:
+            yield
+        finally:
+            self._end_segment()
+            self._stack.pop()
+            self._begin_segment()
+
+    def command_started(self) -> None:
+        """End the startup phase; what follows outside other phases counts as other."""
+        if self._stack == ["startup"]:
+            self._end_segment()
+            self._stack[0] = "other"
+            self._begin_segment()
+
+    def stop(self) -> Path:
+        """Stop profiling and write the results; returns the run directory."""
+        import pstats
+
+        while self._stack:
+            self._end_segment()
+            self._stack.pop()
+        self._tracemalloc.stop()
+
+        phases = {}
+        for name in sorted(self._stats, key=PHASES.index):
+            stats = self._stats[name]
+            profile = self._profiles[name]
+            profile.dump_stats(str(self.run_dir / f"{name}.pstats"))
+            phases[name] = {
+                "seconds": stats.seconds,
+                "import_seconds": _import_seconds(pstats.Stats(profile)),
+                "segments": stats.segments,
+                "retained_bytes": stats.retained_bytes,
+                "peak_bytes": stats.peak_bytes,
+            }
+        summary = {"version": SUMMARY_VERSION, "argv": self.argv, "started_at": self.started_at, "phases": phases}
+        (self.run_dir / SUMMARY_FILENAME).write_text(json.dumps(summary, indent=2) + "\n")
+        return self.run_dir
+
+
+def _import_seconds(stats: Any) -> float:
+    """Time spent importing modules, from the cumulative time of importlib's loader entry point."""
+    return sum(
+        entry[3]
+        for (filename, _, function), entry in stats.stats.items()
+        if function == "_find_and_load" and "importlib._bootstrap" in filename
+    )
+
+
+def start(output_dir: Path, argv: list[str]) -> Profiler:
+    """Start profiling this invocation."""
+    global _active
+    profiler = Profiler(output_dir, argv)
+    profiler.start()
+    _active = profiler
+    return profiler
+
+
+def stop() -> Path | None:
+    """Stop profiling, if it was started, and return the run directory."""
+    global _active
+    profiler, _active = _active, None
+    return profiler.stop() if profiler is not None else None
+
+
+def phase(name: str) -> AbstractContextManager[None]:
+    """Attribute a block to a profiling phase when profiling, otherwise do nothing."""
+    return _active.phase(name) if _active is not None else nullcontext()
+
+
+def command_started() -> None:
+    if _active is not None:
+        _active.command_started()
+
+
+def find_run(path: Path) -> Path:
+    """Resolve a run directory, or the latest run in a profile output directory."""
+    if (path / SUMMARY_FILENAME).exists():
+        return path
+    runs = sorted(p.parent for p in path.glob(f"*/{SUMMARY_FILENAME}"))
+    if not runs:
+        raise FileNotFoundError(f"No profile found in {path}")
+    return runs[-1]
+
+
+def _format_bytes(size: int) -> str:
+    for unit in ("B", "KiB", "MiB"):
+        if abs(size) < 1024:
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GiB"
+
+
+def format_report(run_dir: Path, top: int = 10, phases: list[str] | None = None) -> list[str]:
+    """Summarize a profiling run: per phase, its time and memory, top functions and allocation sites."""
+    import pstats
+
+    summary = json.loads((run_dir / SUMMARY_FILENAME).read_text())
+    lines = [f"Profile of: searxng {' '.join(summary['argv'])}", ""]
+    total = sum(p["seconds"] for p in summary["phases"].values()) or 1.0
+    lines.append(f"{'phase':<10} {'time':>10} {'share':>6} {'imports':>10} {'retained':>10} {'peak':>10}")
+    for name, data in summary["phases"].items():
+        lines.append(
+            f"{name:<10} {data['seconds'] * 1000:>7.1f} ms {data['seconds'] / total:>6.0%}"
+            f" {data['import_seconds'] * 1000:>7.1f} ms"
+            f" {_format_bytes(data['retained_bytes']):>10} {_format_bytes(data['peak_bytes']):>10}"
+        )
+
+    for name, data in summary["phases"].items():
+        if phases and name not in phases:
+            continue
+        lines += ["", f"== {name} ({data['seconds'] * 1000:.1f} ms)"]
+        stats_path = run_dir / f"{name}.pstats"
+        if stats_path.exists():
+            stats = pstats.Stats(str(stats_path), stream=sys.stderr)
+            measured = [item for item in stats.stats.items() if item[0][0] != __file__]
+            entries = sorted(measured, key=lambda item: -item[1][2])[:top]
+            lines.append(f"  {'own time':>10} {'cumulative':>11} {'calls':>8}  function")
+            for (filename, lineno, function), (_, calls, own, cumulative, _) in entries:
+                location = f"{_short_path(filename)}:{lineno}({function})" if lineno else function
+                lines.append(f"  {own * 1000:>7.2f} ms {cumulative * 1000:>8.2f} ms {calls:>8}  {location}")
+        sites = allocation_sites(run_dir, name)[:top]
+        if sites:
+            lines.append(f"  {'retained':>10} {'blocks':>8}  site")
+            for site, size, count in sites:
+                lines.append(f"  {_format_bytes(size):>10} {count:>8}  {_short_path(site)}")
+    return lines
+
+
+def allocation_sites(run_dir: Path, phase_name: str) -> list[tuple[str, int, int]]:
+    """Group the blocks a phase's segments left allocated by source line, largest first."""
+    import tracemalloc
+
+    # Blocks allocated while taking snapshots are the profiler's, not the command's.
+    own_files = {tracemalloc.__file__, __file__}
+    sites: dict[str, list[int]] = {}
+    for path in sorted((run_dir / SNAPSHOTS_DIRNAME).glob(f"*-{phase_name}.snapshot")):
+        for stat in tracemalloc.Snapshot.load(str(path)).statistics("lineno"):
+            frame = stat.traceback[0]
+            if frame.filename in own_files:
+                continue
+            site = sites.setdefault(f"{frame.filename}:{frame.lineno}", [0, 0])
+            site[0] += stat.size
+            site[1] += stat.count
+    return sorted(((site, size, count) for site, (size, count) in sites.items()), key=lambda item: -item[1])
+
+
+def _short_path(filename: str) -> str:
+    """Shorten a file path to the part after site-packages or the Python library directory."""
+    package_root = str(Path(__file__).parent.parent) + os.sep
+    if filename.startswith(package_root):
+        return filename[len(package_root) :]
+    for marker in ("site-packages/", "dist-packages/", "/lib/python"):
+        index = filename.rfind(marker)
+        if index != -1:
+            rest = filename[index + len(marker) :]
+            return rest.split("/", 1)[1] if marker == "/lib/python" and "/" in rest else rest
+    return filename
@@ -0,0 +1,156 @@
+"""Client-side rate limiting, adaptive concurrency and retry backoff.
+
+AdaptiveLimiter combines a token bucket (a fixed request rate, if configured)
+with an AIMD concurrency limit: the number of requests allowed in flight grows
+by one per round of healthy responses and is cut multiplicatively on 429/5xx,
+connection errors, rising latency or a growing number of unresponsive engines.
+
+The core is non-blocking: try_acquire() either takes a slot or returns how long
+to wait, so the same state serves blocking callers (acquire) and asyncio code
+(which sleeps with asyncio.sleep between attempts).
+"""
+
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+
+from .logging import get_logger
+
+logger = get_logger(__name__)
+
+BACKOFF_BASE = 0.5
+BACKOFF_CAP = 30.0
+
+# Status codes worth retrying after a pause, once no other instance is left.
+RETRY_STATUS_CODES = frozenset({429, 502, 503, 504})
+
+# Smoothed latency above this multiple of the baseline, plus the slack in
+# seconds to ignore jitter on fast links, counts as congestion.
+LATENCY_TOLERANCE = 2.0
+LATENCY_SLACK = 0.05
+ERROR_DECREASE = 0.5
+CONGESTION_DECREASE = 0.8
+# How often a caller blocked on concurrency re-checks, in seconds.
+POLL_INTERVAL = 0.05
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """Parse a Retry-After header (delay in seconds or an HTTP date) into seconds."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, when.timestamp() - time.time())
+
+
+def backoff_delay(attempt: int, retry_after: float | None = None) -> float | None:
+    """Full-jitter exponential backoff for a retry, never shorter than Retry-After.
+
+    Returns None when the server asks for a longer pause than BACKOFF_CAP,
+    which is better reported than waited out.
+    """
+    if retry_after is not None and retry_after > BACKOFF_CAP:
+        return None
+    delay = random.uniform(0, min(BACKOFF_CAP, BACKOFF_BASE * 2**attempt))
+    return max(delay, retry_after or 0.0)
+
+
+class AdaptiveLimiter:
+    """Token bucket plus AIMD concurrency limit shared by all requests of a client."""
+
+    def __init__(
+        self,
+        rate: float = 0.0,
+        max_concurrency: int = 20,
+        initial_concurrency: int | None = None,
+        min_concurrency: int = 1,
+    ) -> None:
+        self.rate = rate
+        self.burst = max(1.0, rate)
+        self.max_concurrency = max_concurrency
+        self.min_concurrency = min(min_concurrency, max_concurrency)
+        initial = initial_concurrency if initial_concurrency is not None else max_concurrency // 2
+        self.limit = float(max(self.min_concurrency, min(initial, max_concurrency)))
+        self.inflight = 0
+        self._tokens = self.burst
+        self._refilled_at = time.monotonic()
+        self._baseline: float | None = None
+        self._smoothed: float | None = None
+        self._unresponsive: float | None = None
+        self._decreased_at = 0.0
+        self._cond = threading.Condition()
+
+    def try_acquire(self) -> float:
+        """Take a slot if one is free: returns 0.0, or the seconds to wait before retrying."""
+        with self._cond:
+            now = time.monotonic()
+            if self.inflight >= int(self.limit):
+                return POLL_INTERVAL
+            if self.rate > 0:
+                self._tokens = min(self.burst, self._tokens + (now - self._refilled_at) * self.rate)
+                self._refilled_at = now
+                if self._tokens < 1:
+                    return (1 - self._tokens) / self.rate
+                self._tokens -= 1
+            self.inflight += 1
+            return 0.0
+
+    def acquire(self) -> None:
+        """Block until a slot is free and take it."""
+        with self._cond:
+            while (delay := self.try_acquire()) > 0:
+                self._cond.wait(delay)
+
+    def release(self, latency: float | None, ok: bool) -> None:
+        """Return a slot and adjust the limit; latency is None for failed requests."""
+        with self._cond:
+            self.inflight -= 1
+            if not ok or latency is None:
+                self._decrease(ERROR_DECREASE)
+            else:
+                self._observe_latency(latency)
+            self._cond.notify_all()
+
+    def cancel(self) -> None:
+        """Return a slot without adjusting the limit, for a request that ended without an outcome."""
+        with self._cond:
+            self.inflight -= 1
+            self._cond.notify_all()
+
+    def observe_unresponsive(self, count: int) -> None:
+        """Back off when a response lists more unresponsive engines than usual."""
+        with self._cond:
+            if self._unresponsive is not None and count > self._unresponsive + 1:
+                self._decrease(CONGESTION_DECREASE)
+            self._unresponsive = count if self._unresponsive is None else 0.8 * self._unresponsive + 0.2 * count
+
+    def _observe_latency(self, latency: float) -> None:
+        self._smoothed = latency if self._smoothed is None else 0.8 * self._smoothed + 0.2 * latency
+        if self._baseline is None or latency < self._baseline:
+            self._baseline = latency
+        else:
+            # Let the baseline drift up slowly so an early lucky sample doesn't pin it.
+            self._baseline += (latency - self._baseline) * 0.01
+
+        if self._smoothed > self._baseline * LATENCY_TOLERANCE + LATENCY_SLACK:
+            self._decrease(CONGESTION_DECREASE)
+        elif self.limit < self.max_concurrency:
+            self.limit = min(self.max_concurrency, self.limit + 1 / self.limit)
+
+    def _decrease(self, factor: float) -> None:
+        # Requests in flight when the limit drops report the same congestion;
+        # only cut once per round trip.
+        now = time.monotonic()
+        if now - self._decreased_at < (self._smoothed or 0.0):
+            return
+        self._decreased_at = now
+        previous = self.limit
+        self.limit = max(float(self.min_concurrency), self.limit * factor)
+        if int(self.limit) != int(previous):
+            logger.debug("Concurrency limit lowered to %d", int(self.limit))
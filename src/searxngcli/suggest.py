@@ -0,0 +1,206 @@
+"""Prefix-trie cache of /autocompleter suggestions.
+
+Completions are stored in a character trie keyed on the normalized prefix, so
+a prefix that was never asked for can still be answered from the nearest
+shorter prefix: when that prefix got fewer suggestions than the backend's
+usual page of results, the list is taken to be every completion it knows, and
+filtering it by the longer prefix gives the same answer the network would.
+
+The trie is persisted as nested JSON objects, which load straight into the
+node dictionaries without rebuilding, so a cached completion costs the CLI a
+file read. This module only uses the standard library.
+"""
+
+import hashlib
+import json
+import os
+import re
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+from .logging import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_SUGGEST_TTL = 86400
+DEFAULT_MAX_PREFIXES = 5000
+
+# SearXNG's autocomplete backends return up to about ten suggestions; a shorter
+# list is treated as complete and reused for longer prefixes.
+COMPLETE_BELOW = 10
+
+# Node keys in the persisted trie: children, suggestions and fetch time.
+_CHILDREN = "c"
+_SUGGESTIONS = "s"
+_FETCHED_AT = "t"
+
+
+def normalize_prefix(prefix: str) -> str:
+    """Lowercase a prefix and collapse whitespace, keeping a trailing word break."""
+    return re.sub(r"\s+", " ", prefix.lower()).lstrip()
+
+
+def parse_suggestions(data: Any) -> list[str]:
+    """Extract suggestions from an /autocompleter response.
+
+    SearXNG answers in the OpenSearch format, ``[query, [suggestions]]``, or
+    with a plain list of suggestions for XMLHttpRequest clients.
+    """
+    if isinstance(data, list) and len(data) >= 2 and isinstance(data[0], str) and isinstance(data[1], list):
+        data = data[1]
+    if not isinstance(data, list):
+        raise ValueError("Unexpected autocompleter response")
+    return [item for item in data if isinstance(item, str)]
+
+
+def suggest_path(cache_dir: Path, base_url: str) -> Path:
+    """Get the suggestion cache file path for an instance."""
+    digest = hashlib.sha256(base_url.encode()).hexdigest()[:16]
+    return cache_dir / "suggest" / f"{digest}.json"
+
+
+class SuggestCache:
+    """File-backed prefix trie of autocomplete answers for one instance.
+
+    Answers older than ttl seconds are ignored and dropped on the next save;
+    beyond max_prefixes stored answers, the oldest are evicted.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        ttl: float = DEFAULT_SUGGEST_TTL,
+        max_prefixes: int = DEFAULT_MAX_PREFIXES,
+    ) -> None:
+        self.path = path
+        self.ttl = ttl
+        self.max_prefixes = max_prefixes
+        self._root: dict | None = None
+        self._dirty = False
+        self._lock = threading.Lock()
+
+    def _load(self) -> dict:
+        if self._root is None:
+            try:
+                with open(self.path, "rb") as f:
+                    root = json.load(f)
+            except FileNotFoundError:
+                root = {}
+            except (OSError, ValueError) as e:
+                logger.debug("Ignoring unreadable suggestion cache %s: %s", self.path, e)
+                root = {}
+            self._root = root if isinstance(root, dict) else {}
+        return self._root
+
+    def _fresh(self, node: dict, now: float) -> bool:
+        return _SUGGESTIONS in node and now - node.get(_FETCHED_AT, 0.0) <= self.ttl
+
+    def lookup(self, prefix: str) -> list[str] | None:
+        """Answer a prefix from the cache, or return None if it must be fetched."""
+        key = normalize_prefix(prefix)
+        now = time.time()
+        with self._lock:
+            node = self._load()
+            nearest: dict | None = node if self._fresh(node, now) else None
+            for char in key:
+                node = node.get(_CHILDREN, {}).get(char)
+                if node is None:
+                    break
+                if self._fresh(node, now):
+                    nearest = node
+            else:
+                if nearest is node:
+                    return list(node[_SUGGESTIONS])
+
+        if nearest is None or len(nearest[_SUGGESTIONS]) >= COMPLETE_BELOW:
+            return None
+        return [s for s in nearest[_SUGGESTIONS] if normalize_prefix(s).startswith(key)]
+
+    def store(self, prefix: str, suggestions: list[str]) -> None:
+        """Record the suggestions fetched for a prefix."""
+        key = normalize_prefix(prefix)
+        with self._lock:
+            node = self._load()
+            for char in key:
+                node = node.setdefault(_CHILDREN, {}).setdefault(char, {})
+            node[_SUGGESTIONS] = list(suggestions)
+            node[_FETCHED_AT] = time.time()
+            self._dirty = True
+
+    def save(self) -> None:
+        """Atomically write the trie back, dropping expired and excess answers."""
+        with self._lock:
+            if not self._dirty or self._root is None:
+                return
+            self._prune(self._root, time.time())
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.path.parent, prefix=".suggest-")
+            try:
+                with os.fdopen(fd, "w") as f:
+                    json.dump(self._root, f, ensure_ascii=False, separators=(",", ":"))
+                os.replace(tmp_path, self.path)
+            except BaseException:
+                Path(tmp_path).unlink(missing_ok=True)
+                raise
+            self._dirty = False
+
+    def _prune(self, root: dict, now: float) -> None:
+        answers: list[tuple[float, dict]] = []
+
+        def walk(node: dict) -> bool:
+            """Drop expired answers below node; returns whether node is now empty."""
+            if _SUGGESTIONS in node:
+                if self._fresh(node, now):
+                    answers.append((node[_FETCHED_AT], node))
+                else:
+                    del node[_SUGGESTIONS], node[_FETCHED_AT]
+            children = node.get(_CHILDREN, {})
+            for char in [c for c, child in children.items() if walk(child)]:
+                del children[char]
+            if not children:
+                node.pop(_CHILDREN, None)
+            return not node
+
+        walk(root)
+        excess = len(answers) - self.max_prefixes
+        if excess > 0:
+            answers.sort(key=lambda answer: answer[0])
+            for _, node in answers[:excess]:
+                del node[_SUGGESTIONS], node[_FETCHED_AT]
+            walk(root)
+            logger.debug("Evicted %d cached suggestion prefixes", excess)
+
+
+def print_cached(argv: list[str]) -> bool:
+    """Answer ``searxng suggest PREFIX [--json]`` from the cache without loading the app.
+
+    Returns False, having printed nothing, when the arguments need the full
+    command or the prefix is not cached.
+    """
+    positional = [arg for arg in argv if arg != "--json"]
+    if len(positional) != 1 or len(argv) > 2 or positional[0].startswith("-"):
+        return False
+    output_json = len(argv) == 2
+    if output_json and sys.stdout.isatty():
+        return False
+
+    from .config import get_cache_dir, load_config
+
+    config_path = os.environ.get("SEARXNG_CONFIG")
+    try:
+        config = load_config(Path(config_path) if config_path else None)
+    except Exception:
+        return False
+
+    suggestions = SuggestCache(suggest_path(get_cache_dir(), config.base_url)).lookup(positional[0])
+    if suggestions is None:
+        return False
+    if output_json:
+        sys.stdout.write(json.dumps(suggestions, indent=2, ensure_ascii=False) + "\n")
+    else:
+        sys.stdout.write("".join(f"{s}\n" for s in suggestions))
+    return True
@@ -0,0 +1,166 @@
+"""Per-request timing breakdown for --timings.
+
+Network phases come from httpcore's trace extension. Name resolution happens
+inside httpcore's TCP connect, so DNS time is part of the connect phase; the
+http phase is the whole exchange, including waiting for a pooled connection.
+Decode, model and render phases are attributed to the last request made by the
+same thread, or reported for the whole invocation when there is none (cache
+hits, or rendering merged results in the main thread).
+"""
+
+import json
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import AbstractContextManager, contextmanager, nullcontext
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+# httpcore trace events, without their "connection."/"http11."/"http2." prefix,
+# that delimit each network phase.
+NETWORK_PHASES = {
+    "connect": ("connect_tcp.started", "connect_tcp.complete"),
+    "tls": ("start_tls.started", "start_tls.complete"),
+    "send": ("send_request_headers.started", "send_request_body.complete"),
+    "wait": ("receive_response_headers.started", "receive_response_headers.complete"),
+    "download": ("receive_response_body.started", "receive_response_body.complete"),
+}
+
+PHASE_ORDER = ("connect", "tls", "send", "wait", "download", "http", "decode", "model", "fetch", "render")
+
+
+@dataclass
+class RequestTiming:
+    """Phase durations of one HTTP request, in seconds."""
+
+    method: str
+    url: str
+    status: int | None = None
+    phases: dict[str, float] = field(default_factory=dict)
+    _events: dict[str, float] = field(default_factory=dict, repr=False)
+
+    def trace(self, name: str, info: dict[str, Any]) -> None:
+        """httpcore trace callback."""
+        now = time.perf_counter()
+        event = name.split(".", 1)[-1]
+        self._events[event] = now
+        for phase, (start, end) in NETWORK_PHASES.items():
+            if event == end and start in self._events:
+                self.phases[phase] = self.phases.get(phase, 0.0) + now - self._events[start]
+
+    def add(self, phase: str, seconds: float) -> None:
+        self.phases[phase] = self.phases.get(phase, 0.0) + seconds
+
+    def to_dict(self) -> dict:
+        return {
+            "method": self.method,
+            "url": self.url,
+            "status": self.status,
+            "phases_ms": {name: seconds * 1000 for name, seconds in _ordered(self.phases)},
+        }
+
+
+def _ordered(phases: dict[str, float]) -> list[tuple[str, float]]:
+    return sorted(phases.items(), key=lambda item: PHASE_ORDER.index(item[0]) if item[0] in PHASE_ORDER else 99)
+
+
+class Timings:
+    """Collects request and processing phase timings for one invocation."""
+
+    def __init__(self) -> None:
+        self.requests: list[RequestTiming] = []
+        self.phases: dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def start_request(self, method: str, url: str) -> RequestTiming:
+        """Register a request; later phases measured on this thread are added to it."""
+        record = RequestTiming(method=method, url=url)
+        with self._lock:
+            self.requests.append(record)
+        self._local.request = record
+        return record
+
+    @contextmanager
+    def request(self, method: str, url: str) -> Iterator[RequestTiming]:
+        """Time a request, passing ``record.trace`` to httpx as the trace extension."""
+        record = self.start_request(method, url)
+        start = time.perf_counter()
+        try:
+            yield record
+        finally:
+            record.add("http", time.perf_counter() - start)
+
+    @contextmanager
+    def measure(self, phase: str) -> Iterator[None]:
+        """Time a processing phase such as decode, model or render."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            record = getattr(self._local, "request", None)
+            if record is not None:
+                record.add(phase, elapsed)
+            else:
+                with self._lock:
+                    self.phases[phase] = self.phases.get(phase, 0.0) + elapsed
+
+    def to_dict(self) -> dict:
+        return {
+            "requests": [r.to_dict() for r in self.requests],
+            "phases_ms": {name: seconds * 1000 for name, seconds in _ordered(self.phases)},
+        }
+
+    def to_openmetrics(self) -> str:
+        """Render the timings in the OpenMetrics text format."""
+        lines = [
+            "# TYPE searxng_request_phase_seconds gauge",
+            "# UNIT searxng_request_phase_seconds seconds",
+            "# HELP searxng_request_phase_seconds Duration of a phase of one request.",
+        ]
+        for index, record in enumerate(self.requests):
+            labels = f'request="{index}",method="{record.method}",url="{_escape(record.url)}"'
+            for name, seconds in _ordered(record.phases):
+                lines.append(f'searxng_request_phase_seconds{{{labels},phase="{name}"}} {seconds:.6f}')
+        lines += [
+            "# TYPE searxng_phase_seconds gauge",
+            "# UNIT searxng_phase_seconds seconds",
+            "# HELP searxng_phase_seconds Duration of a phase not tied to a single request.",
+        ]
+        for name, seconds in _ordered(self.phases):
+            lines.append(f'searxng_phase_seconds{{phase="{name}"}} {seconds:.6f}')
+        lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+    def format(self) -> list[str]:
+        """Human readable lines, one summary line per request."""
+        lines = []
+        for record in self.requests:
+            status = record.status if record.status is not None else "error"
+            lines.append(f"{record.method} {record.url} {status}")
+            lines.append(f"  {_format_phases(record.phases)}")
+        if self.phases:
+            lines.append(_format_phases(self.phases))
+        return lines
+
+    def write(self, path: Path) -> None:
+        """Write the timings to a file, as JSON for *.json and OpenMetrics otherwise."""
+        if path.suffix == ".json":
+            path.write_text(json.dumps(self.to_dict(), indent=2) + "\n")
+        else:
+            path.write_text(self.to_openmetrics())
+
+
+def _format_phases(phases: dict[str, float]) -> str:
+    return "  ".join(f"{name} {seconds * 1000:.1f} ms" for name, seconds in _ordered(phases))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def measure(timings: Timings | None, phase: str) -> AbstractContextManager[None]:
+    """Time a phase when timings are being collected, otherwise do nothing."""
+    return timings.measure(phase) if timings is not None else nullcontext()
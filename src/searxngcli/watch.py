@@ -0,0 +1,275 @@
+"""Periodic searches that report only results not seen before."""
+
+import hashlib
+import heapq
+import math
+import os
+import re
+import struct
+import tempfile
+import threading
+import time
+from collections.abc import Iterator, Sequence
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from .batch import DEFAULT_CONCURRENCY
+from .cache import cache_key
+from .client import build_search_params
+from .logging import get_logger
+from .merge import normalize_url
+
+if TYPE_CHECKING:
+    from .client import SearXNGClient
+    from .models import SearchResult
+
+logger = get_logger(__name__)
+
+SEEN_FILENAME = "watch-seen.bin"
+DEFAULT_SEEN_CAPACITY = 1_000_000
+DEFAULT_ERROR_RATE = 0.001
+
+# How often the seen-set is written back while watching, in seconds.
+SAVE_INTERVAL = 30.0
+
+INTERVAL_UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+_HEADER = struct.Struct("<4sHHIQQ")
+_MAGIC = b"SXSS"
+_VERSION = 1
+
+
+def parse_interval(value: str) -> float:
+    """Parse an interval such as "90", "30s", "10m", "1h30m" or "1d" into seconds."""
+    text = value.strip().lower()
+    if re.fullmatch(r"\d+(\.\d+)?", text):
+        seconds = float(text)
+    else:
+        parts = re.findall(r"(\d+(?:\.\d+)?)([smhd])", text)
+        if not parts or "".join(n + u for n, u in parts) != text:
+            raise ValueError(f"Invalid interval: {value!r} (use e.g. 30s, 10m, 1h, 1d)")
+        seconds = sum(float(n) * INTERVAL_UNITS[u] for n, u in parts)
+    if seconds <= 0:
+        raise ValueError(f"Interval must be positive: {value!r}")
+    return seconds
+
+
+class SeenSet:
+    """Persisted, fixed-size set of seen keys made of two rotating Bloom filters.
+
+    New keys go into the current filter; once it holds capacity keys it becomes
+    the previous one and a fresh filter takes over, so memory stays bounded and
+    the set remembers between capacity and twice capacity of the latest keys.
+    Membership is approximate: an unseen key is reported as seen with roughly
+    twice error_rate probability, a seen key is never reported as new.
+    """
+
+    def __init__(
+        self,
+        path: Path | None = None,
+        capacity: int = DEFAULT_SEEN_CAPACITY,
+        error_rate: float = DEFAULT_ERROR_RATE,
+    ) -> None:
+        self.path = path
+        self.capacity = capacity
+        bits = math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        self.num_bits = (bits + 7) // 8 * 8
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self.count = 0
+        self._current = bytearray(self.num_bits // 8)
+        self._previous = bytearray(self.num_bits // 8)
+        self._dirty = False
+        self._lock = threading.Lock()
+        if path is not None:
+            self._load(path)
+
+    def _positions(self, key: str) -> list[int]:
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self.num_bits for i in range(self.num_hashes)]
+
+    @staticmethod
+    def _test(bits: bytearray, positions: list[int]) -> bool:
+        return all(bits[p >> 3] & (1 << (p & 7)) for p in positions)
+
+    def __contains__(self, key: str) -> bool:
+        positions = self._positions(key)
+        with self._lock:
+            return self._test(self._current, positions) or self._test(self._previous, positions)
+
+    def add(self, key: str) -> bool:
+        """Add a key; returns False if it was (probably) already seen."""
+        positions = self._positions(key)
+        with self._lock:
+            if self._test(self._current, positions):
+                return False
+            seen = self._test(self._previous, positions)
+            if self.count >= self.capacity:
+                self._previous, self._current = self._current, bytearray(self.num_bits // 8)
+                self.count = 0
+                logger.debug("Seen-set generation full, rotated")
+            for p in positions:
+                self._current[p >> 3] |= 1 << (p & 7)
+            self.count += 1
+            self._dirty = True
+            return not seen
+
+    def _load(self, path: Path) -> None:
+        try:
+            with open(path, "rb") as f:
+                header = f.read(_HEADER.size)
+                current = f.read(self.num_bits // 8)
+                previous = f.read(self.num_bits // 8)
+        except FileNotFoundError:
+            return
+        except OSError as e:
+            logger.warning("Could not read seen-set %s: %s", path, e)
+            return
+
+        if len(header) != _HEADER.size:
+            logger.warning("Ignoring truncated seen-set %s", path)
+            return
+        magic, version, num_hashes, _, num_bits, count = _HEADER.unpack(header)
+        if (magic, version, num_hashes, num_bits) != (_MAGIC, _VERSION, self.num_hashes, self.num_bits):
+            logger.warning("Ignoring seen-set %s with a different size or format", path)
+            return
+        if len(current) != len(self._current) or len(previous) != len(self._previous):
+            logger.warning("Ignoring truncated seen-set %s", path)
+            return
+        self._current[:] = current
+        self._previous[:] = previous
+        self.count = count
+
+    def save(self) -> None:
+        """Atomically write the set back, if it changed."""
+        with self._lock:
+            if self.path is None or not self._dirty:
+                return
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.path.parent, prefix=".seen-")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(_HEADER.pack(_MAGIC, _VERSION, self.num_hashes, 0, self.num_bits, self.count))
+                    f.write(self._current)
+                    f.write(self._previous)
+                os.replace(tmp_path, self.path)
+            except BaseException:
+                Path(tmp_path).unlink(missing_ok=True)
+                raise
+            self._dirty = False
+
+
+@dataclass
+class WatchEvent:
+    """A result not seen before, or a failed run, of one watched query."""
+
+    query: str
+    result: "SearchResult | None" = None
+    error: str | None = None
+
+    def to_dict(self) -> dict:
+        data: dict[str, Any] = {"query": self.query}
+        if self.result is not None:
+            data.update(self.result.to_dict())
+        if self.error is not None:
+            data["error"] = self.error
+        return data
+
+
+class Watcher:
+    """Re-run many queries every interval over one client, emitting only new results.
+
+    First runs are spread evenly across the interval so that thousands of
+    watches don't hit the instance at once; afterwards every query keeps its
+    own slot. At most concurrency searches are in flight.
+    """
+
+    def __init__(
+        self,
+        client: "SearXNGClient",
+        seen: SeenSet,
+        queries: Sequence[str],
+        interval: float,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        **search_kwargs: Any,
+    ) -> None:
+        if concurrency < 1:
+            raise ValueError("Concurrency must be at least 1")
+        self.client = client
+        self.seen = seen
+        self.queries = list(dict.fromkeys(queries))
+        self.interval = interval
+        self.concurrency = concurrency
+        # Every run must see what the instance returns now.
+        self.search_kwargs = {**search_kwargs, "use_cache": False}
+        # Seen URLs are tracked per query and the filters that change its results.
+        filters = {name: search_kwargs.get(name) for name in ("categories", "engines", "language", "time_range")}
+        self._keys = [cache_key(client.base_url, build_search_params(query, **filters)) for query in self.queries]
+
+    def run(self, rounds: int | None = None) -> Iterator[WatchEvent]:
+        """Yield new results as searches finish; run every query rounds times, or forever."""
+        start = time.monotonic()
+        stagger = 0.0 if rounds == 1 else self.interval / max(1, len(self.queries))
+        schedule = [(start + i * stagger, i) for i in range(len(self.queries))]
+        heapq.heapify(schedule)
+        runs = [0] * len(self.queries)
+        pending: dict[Future, tuple[int, float]] = {}
+        saved_at = start
+
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            try:
+                while schedule or pending:
+                    now = time.monotonic()
+                    while schedule and schedule[0][0] <= now and len(pending) < self.concurrency:
+                        due, i = heapq.heappop(schedule)
+                        future = executor.submit(self.client.search, self.queries[i], **self.search_kwargs)
+                        pending[future] = (i, due)
+
+                    timeout = None
+                    if schedule and len(pending) < self.concurrency:
+                        timeout = max(0.0, schedule[0][0] - now)
+                    if not pending:
+                        time.sleep(timeout or 0.0)
+                        continue
+                    done, _ = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+
+                    for future in done:
+                        i, due = pending.pop(future)
+                        yield from self._collect(i, future)
+                        runs[i] += 1
+                        if rounds is None or runs[i] < rounds:
+                            # Keep the slot, unless the watch fell a whole interval behind.
+                            heapq.heappush(schedule, (max(due + self.interval, time.monotonic()), i))
+
+                    if time.monotonic() - saved_at > SAVE_INTERVAL:
+                        self.seen.save()
+                        saved_at = time.monotonic()
+            finally:
+                for future in pending:
+                    future.cancel()
+                self.seen.save()
+
+    def _collect(self, i: int, future: Future) -> Iterator[WatchEvent]:
+        query = self.queries[i]
+        try:
+            response = future.result()
+        except Exception as e:
+            logger.debug("Watched query %r failed: %s", query, e)
+            yield WatchEvent(query=query, error=str(e) or type(e).__name__)
+            return
+
+        new = 0
+        for result in response.results:
+            if not result.url:
+                continue
+            key = f"{self._keys[i]}\n{normalize_url(result.url)}"
+            if key not in self.seen:
+                new += 1
+                yield WatchEvent(query=query, result=result)
+            # Marked after delivery, so a reader that dies mid-write gets it again; results
+            # still returned are re-added so they survive the rotation of the older filter.
+            self.seen.add(key)
+        logger.debug("Watched query %r: %d new of %d results", query, new, len(response.results))
@@ -0,0 +1,120 @@
+"""Local stand-in for a SearXNG instance, for tests and benchmarks."""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+
+def make_search_response(query: str, page: int = 1, num_results: int = 10) -> dict:
+    """Build a synthetic /search response."""
+    offset = (page - 1) * num_results
+    return {
+        "query": query,
+        "number_of_results": num_results * 10,
+        "results": [
+            {
+                "title": f"{query} result {offset + i}",
+                "url": f"https://example.com/{query.replace(' ', '-')}/{offset + i}",
+                "content": f"Content of result {offset + i} for {query}. " * 3,
+                "engine": "google",
+                "engines": ["google", "bing"],
+                "category": "general",
+                "score": round(10.0 / (offset + i + 1), 4),
+                "publishedDate": "2025-01-01T00:00:00",
+                "thumbnail": "",
+            }
+            for i in range(num_results)
+        ],
+        "suggestions": [f"{query} tutorial", f"{query} example"],
+        "corrections": [],
+        "unresponsive_engines": [],
+    }
+
+
+def make_config_response(num_engines: int = 10) -> dict:
+    """Build a synthetic /config response."""
+    categories = ["general", "images", "news", "videos", "science"]
+    return {
+        "categories": categories,
+        "engines": [
+            {
+                "name": f"engine{i}" if i > 1 else ("google", "bing")[i],
+                "categories": [categories[i % len(categories)]],
+                "shortcut": f"e{i}",
+                "enabled": i % 7 != 0,
+            }
+            for i in range(num_engines)
+        ],
+    }
+
+
+class FakeSearXNG:
+    """Serve /search, /config and /autocompleter fixtures on a local port in a background thread.
+
+    Use as a context manager; ``base_url`` points at the running server.
+    """
+
+    def __init__(self, num_results: int = 10, num_engines: int = 10, latency: float = 0.0) -> None:
+        self.num_results = num_results
+        self.num_engines = num_engines
+        self.latency = latency
+        self.requests: list[str] = []
+        self._server: ThreadingHTTPServer | None = None
+        self._thread: threading.Thread | None = None
+        self._config_body = json.dumps(make_config_response(num_engines)).encode()
+
+    @property
+    def base_url(self) -> str:
+        assert self._server is not None
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def __enter__(self) -> "FakeSearXNG":
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Headers and body go out in separate writes; without this, Nagle's
+            # algorithm stalls every keep-alive response on a delayed ACK.
+            disable_nagle_algorithm = True
+
+            def do_GET(self) -> None:  # noqa: N802
+                url = urlsplit(self.path)
+                params = {k: v[0] for k, v in parse_qs(url.query).items()}
+                fake.requests.append(self.path)
+                if fake.latency:
+                    time.sleep(fake.latency)
+
+                if url.path == "/search":
+                    data = make_search_response(params.get("q", ""), int(params.get("pageno", 1)), fake.num_results)
+                    body = json.dumps(data).encode()
+                elif url.path == "/config":
+                    body = fake._config_body
+                elif url.path == "/autocompleter":
+                    query = params.get("q", "")
+                    body = json.dumps([query, [f"{query} tutorial", f"{query} example"]]).encode()
+                else:
+                    self.send_error(404)
+                    return
+
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args: object) -> None:
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        assert self._server is not None
+        self._server.shutdown()
+        self._server.server_close()
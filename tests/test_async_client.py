@@ -0,0 +1,219 @@
+"""Tests for the asyncio SearXNG client."""
+
+import asyncio
+from pathlib import Path
+
+import httpx
+import pytest
+
+from searxngcli.async_client import AsyncSearXNGClient
+from searxngcli.cache import SearchCache
+from searxngcli.client import SearXNGClient
+from searxngcli.config import InstanceConfig
+from searxngcli.metadata import ConfigSnapshot, MetadataStore
+from searxngcli.suggest import SuggestCache
+
+BASE_URL = "https://searxng.example.com"
+CONFIG = {"categories": ["general"], "engines": [{"name": "google", "categories": ["general"]}]}
+
+
+class FakeTransport(httpx.MockTransport):
+    def __init__(self, status_code: int = 200, json: dict | list | None = None, delay: float = 0.0):
+        self.requests: list[httpx.Request] = []
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            self.requests.append(request)
+            await asyncio.sleep(delay)
+            body = json if json is not None else {"query": request.url.params.get("q", ""), "results": []}
+            return httpx.Response(status_code, json=body)
+
+        super().__init__(handler)
+
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr("searxngcli.client.backoff_delay", lambda attempt, retry_after=None: 0.0)
+
+
+class TestAsyncSearch:
+    def test_search_matches_sync_client(self):
+        data = {"query": "test", "results": [{"title": "Result", "url": "https://example.com"}]}
+
+        async def run() -> object:
+            async with AsyncSearXNGClient(BASE_URL, transport=FakeTransport(json=data)) as client:
+                return await client.search("test", categories="general", page=2)
+
+        sync_transport = httpx.MockTransport(lambda request: httpx.Response(200, json=data))
+        with SearXNGClient(BASE_URL, transport=sync_transport) as client:
+            expected = client.search("test", categories="general", page=2)
+        assert asyncio.run(run()) == expected
+
+    def test_builds_same_params(self):
+        transport = FakeTransport()
+
+        async def run() -> None:
+            async with AsyncSearXNGClient(BASE_URL, transport=transport) as client:
+                await client.search("test", language="cs", safe_search=0)
+
+        asyncio.run(run())
+        assert dict(transport.requests[0].url.params) == {
+            "q": "test",
+            "format": "json",
+            "pageno": "1",
+            "language": "cs",
+            "safesearch": "0",
+        }
+
+    def test_coalesces_identical_in_flight_searches(self):
+        transport = FakeTransport(delay=0.05)
+
+        async def run() -> list:
+            async with AsyncSearXNGClient(BASE_URL, transport=transport) as client:
+                return await asyncio.gather(*(client.search("same") for _ in range(5)))
+
+        responses = asyncio.run(run())
+        assert len(transport.requests) == 1
+        assert all(r.query == "same" for r in responses)
+
+    def test_cancelled_leader_is_taken_over(self):
+        transport = FakeTransport(delay=0.05)
+
+        async def run() -> tuple:
+            async with AsyncSearXNGClient(BASE_URL, transport=transport) as client:
+                leader = asyncio.create_task(client.search("same"))
+                await asyncio.sleep(0.01)
+                follower = asyncio.create_task(client.search("same"))
+                await asyncio.sleep(0.01)
+                leader.cancel()
+                response = await follower
+                return leader.cancelled(), response, client.limiter.inflight
+
+        cancelled, response, inflight = asyncio.run(run())
+        assert cancelled
+        assert response.query == "same"
+        assert len(transport.requests) == 2
+        assert inflight == 0
+
+    def test_timed_out_searches_release_their_slot(self):
+        async def run() -> tuple:
+            async with AsyncSearXNGClient(BASE_URL, transport=FakeTransport(delay=1.0), max_connections=4) as client:
+                for i in range(10):
+                    with pytest.raises(asyncio.TimeoutError):
+                        await asyncio.wait_for(client.search(f"q{i}"), 0.01)
+                return client.limiter.inflight, client.pool.instances[0].outstanding
+
+        assert asyncio.run(run()) == (0, 0)
+
+    def test_deadline_returns_partial_when_nothing_arrives(self):
+        transport = FakeTransport(delay=1.0)
+
+        async def run() -> tuple:
+            async with AsyncSearXNGClient(BASE_URL, transport=transport) as client:
+                response = await client.search("test", deadline=0.05)
+                return response, client.limiter.inflight
+
+        response, inflight = asyncio.run(run())
+        assert response.partial
+        assert response.results == []
+        assert transport.requests[0].url.params["timeout_limit"] == "0.1"
+        assert inflight == 0
+
+    def test_deadline_marks_timed_out_engines_partial(self):
+        data = {"query": "test", "results": [], "unresponsive_engines": [["slow", "timeout"]]}
+
+        async def run() -> object:
+            async with AsyncSearXNGClient(BASE_URL, transport=FakeTransport(json=data)) as client:
+                return await client.search("test", deadline=1.0)
+
+        assert asyncio.run(run()).partial
+
+    def test_uses_cache(self, tmp_path: Path):
+        transport = FakeTransport()
+
+        async def run() -> None:
+            cache = SearchCache(tmp_path / "cache.db")
+            async with AsyncSearXNGClient(BASE_URL, cache=cache, transport=transport) as client:
+                await client.search("test")
+                await client.search("test")
+
+        asyncio.run(run())
+        assert len(transport.requests) == 1
+
+    def test_fails_over_to_healthy_instance(self):
+        async def handler(request: httpx.Request) -> httpx.Response:
+            if request.url.host == "a.example.com":
+                return httpx.Response(503)
+            return httpx.Response(200, json={"query": "from b"})
+
+        instances = [InstanceConfig("https://a.example.com"), InstanceConfig("https://b.example.com")]
+
+        async def run() -> str:
+            async with AsyncSearXNGClient(
+                "https://a.example.com", instances=instances, transport=httpx.MockTransport(handler)
+            ) as client:
+                return (await client.search("test")).query
+
+        assert asyncio.run(run()) == "from b"
+
+    def test_http_error(self):
+        async def run() -> None:
+            async with AsyncSearXNGClient(BASE_URL, transport=FakeTransport(status_code=500)) as client:
+                await client.search("test")
+
+        with pytest.raises(httpx.HTTPStatusError):
+            asyncio.run(run())
+
+
+class TestSearchMany:
+    def test_bounded_concurrency_in_input_order(self):
+        active = 0
+        peak = 0
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+            query = request.url.params["q"]
+            if query == "fail":
+                return httpx.Response(500)
+            return httpx.Response(200, json={"query": query})
+
+        async def run() -> list:
+            async with AsyncSearXNGClient(BASE_URL, transport=httpx.MockTransport(handler)) as client:
+                return await client.search_many([f"q{i}" for i in range(10)] + ["fail"], concurrency=3)
+
+        results = asyncio.run(run())
+        assert peak <= 3
+        assert [r.query for r in results] == [f"q{i}" for i in range(10)] + ["fail"]
+        assert all(r.ok for r in results[:10])
+        assert not results[10].ok
+
+
+class TestAsyncAutocomplete:
+    def test_fetches_and_caches(self, tmp_path: Path):
+        transport = FakeTransport(json=["py", ["python", "pytest"]])
+        cache = SuggestCache(tmp_path / "suggest.json")
+
+        async def run() -> list[list[str]]:
+            async with AsyncSearXNGClient(BASE_URL, transport=transport, suggest_cache=cache) as client:
+                return [await client.autocomplete(prefix) for prefix in ("py", "py", "pyte")]
+
+        assert asyncio.run(run()) == [["python", "pytest"], ["python", "pytest"], ["pytest"]]
+        assert len(transport.requests) == 1
+
+
+class TestAsyncConfig:
+    def test_engines_and_categories_from_snapshot(self, tmp_path: Path):
+        store = MetadataStore(tmp_path / "snapshot.json")
+        store.save(ConfigSnapshot(data=CONFIG, fetched_at=0))
+        transport = FakeTransport(json={"categories": ["news"], "engines": []})
+
+        async def run() -> tuple:
+            async with AsyncSearXNGClient(BASE_URL, metadata=store, transport=transport) as client:
+                return await client.get_categories(), [e.name for e in await client.get_engines()]
+
+        assert asyncio.run(run()) == (["general"], ["google"])
+        # The stale snapshot was revalidated in the background before closing.
+        assert MetadataStore(store.path).load().data == {"categories": ["news"], "engines": []}
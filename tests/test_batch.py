@@ -0,0 +1,70 @@
+"""Tests for batch search execution."""
+
+import threading
+import time
+
+import pytest
+
+from searxngcli.batch import read_queries, run_batch
+from searxngcli.models import SearchResponse
+
+
+class FakeClient:
+    def __init__(self, fail: set[str] | None = None, delay: float = 0.0):
+        self.fail = fail or set()
+        self.delay = delay
+        self.active = 0
+        self.max_active = 0
+        self.calls: list[dict] = []
+        self._lock = threading.Lock()
+
+    def search(self, query: str, **kwargs) -> SearchResponse:
+        with self._lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+            self.calls.append({"query": query, **kwargs})
+        try:
+            time.sleep(self.delay)
+            if query in self.fail:
+                raise RuntimeError(f"boom: {query}")
+            return SearchResponse(query=query, number_of_results=1)
+        finally:
+            with self._lock:
+                self.active -= 1
+
+
+class TestReadQueries:
+    def test_skips_blank_lines_and_comments(self):
+        lines = ["python\n", "\n", "  # comment\n", "  rust  \n"]
+        assert list(read_queries(lines)) == ["python", "rust"]
+
+
+class TestRunBatch:
+    def test_yields_one_result_per_query(self):
+        client = FakeClient()
+        results = list(run_batch(client, ["a", "b", "c"], concurrency=2, language="en"))
+
+        assert sorted(r.query for r in results) == ["a", "b", "c"]
+        assert all(r.ok for r in results)
+        assert all(call["language"] == "en" for call in client.calls)
+
+    def test_failures_are_reported_inline(self):
+        client = FakeClient(fail={"b"})
+        results = {r.query: r for r in run_batch(client, ["a", "b", "c"])}
+
+        assert results["a"].ok
+        assert not results["b"].ok
+        assert results["b"].error == "boom: b"
+        assert results["b"].to_dict() == {"index": 1, "query": "b", "error": "boom: b"}
+        assert results["c"].ok
+
+    def test_respects_concurrency_limit(self):
+        client = FakeClient(delay=0.02)
+        results = list(run_batch(client, [str(i) for i in range(10)], concurrency=3))
+
+        assert len(results) == 10
+        assert 1 < client.max_active <= 3
+
+    def test_invalid_concurrency(self):
+        with pytest.raises(ValueError):
+            list(run_batch(FakeClient(), ["a"], concurrency=0))
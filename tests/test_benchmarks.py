@@ -0,0 +1,23 @@
+"""Smoke tests for the benchmark suite."""
+
+from benchmarks.run import compare, run_suite
+
+
+class TestBenchmarks:
+    def test_run_suite_reports_all_benchmarks(self):
+        report = run_suite(runs=2, num_results=3, concurrency=2, cold_start=False)
+        assert set(report["benchmarks"]) == {"client", "parse", "render"}
+        assert report["benchmarks"]["client"]["throughput"]["requests_per_s"] > 0
+        assert report["benchmarks"]["parse"]["results_per_s"] > 0
+
+    def test_compare_flags_regressions_in_both_directions(self):
+        baseline = {"benchmarks": {"parse": {"min_ms": 10.0, "results_per_s": 1000.0}}}
+        current = {"benchmarks": {"parse": {"min_ms": 12.0, "results_per_s": 800.0}}}
+        regressions = compare(baseline, current, threshold=10.0)
+        assert len(regressions) == 2
+        assert compare(baseline, current, threshold=30.0) == []
+
+    def test_compare_ignores_improvements(self):
+        baseline = {"benchmarks": {"parse": {"min_ms": 10.0, "results_per_s": 1000.0}}}
+        current = {"benchmarks": {"parse": {"min_ms": 5.0, "results_per_s": 2000.0}}}
+        assert compare(baseline, current, threshold=0.0) == []
@@ -0,0 +1,72 @@
+"""Tests for the search response cache."""
+
+import time
+from pathlib import Path
+
+from searxngcli.cache import SearchCache, cache_key, normalize_params
+
+
+class TestCacheKey:
+    def test_normalizes_lists_and_whitespace(self):
+        a = {"q": "python  asyncio", "format": "json", "pageno": 1, "engines": "google,Bing"}
+        b = {"q": " python asyncio ", "pageno": "1", "engines": "bing, google"}
+        assert normalize_params(a) == normalize_params(b)
+        assert cache_key("https://a", a) == cache_key("https://a", b)
+
+    def test_differs_by_instance_and_params(self):
+        params = {"q": "test", "pageno": 1}
+        assert cache_key("https://a", params) != cache_key("https://b", params)
+        assert cache_key("https://a", params) != cache_key("https://a", {"q": "test", "pageno": 2})
+
+
+class TestSearchCache:
+    def test_put_and_get(self, tmp_path: Path):
+        cache = SearchCache(tmp_path / "cache.db")
+        cache.put("k", {"q": "test"}, {"query": "test", "results": [{"title": "x"}]})
+
+        assert cache.get("k") == {"query": "test", "results": [{"title": "x"}]}
+        assert cache.get("missing") is None
+
+    def test_expired_entries_are_not_returned(self, tmp_path: Path):
+        cache = SearchCache(tmp_path / "cache.db")
+        cache.put("k", {"q": "test"}, {"query": "test"}, ttl=-1)
+
+        assert cache.get("k") is None
+        assert cache.stats().entries == 0
+
+    def test_lru_eviction(self, tmp_path: Path):
+        payload = {"content": "".join(chr(33 + (i * 7919) % 90) for i in range(2000))}
+        cache = SearchCache(tmp_path / "cache.db")
+        cache.put("probe", {}, payload)
+        entry_size = cache.stats().size_bytes
+        cache.clear()
+
+        cache.max_size = entry_size * 3
+        cache.put("a", {}, payload)
+        time.sleep(0.01)
+        cache.put("b", {}, payload)
+        time.sleep(0.01)
+        cache.put("c", {}, payload)
+        time.sleep(0.01)
+        assert cache.get("a") is not None
+        time.sleep(0.01)
+        cache.put("d", {}, payload)
+
+        assert cache.get("b") is None
+        assert cache.get("a") is not None
+        assert cache.get("d") is not None
+
+    def test_shared_between_instances(self, tmp_path: Path):
+        SearchCache(tmp_path / "cache.db").put("k", {}, {"query": "shared"})
+        assert SearchCache(tmp_path / "cache.db").get("k") == {"query": "shared"}
+
+    def test_clear_and_stats(self, tmp_path: Path):
+        cache = SearchCache(tmp_path / "cache.db")
+        cache.put("a", {}, {"query": "a"})
+        cache.put("b", {}, {"query": "b"})
+
+        stats = cache.stats()
+        assert stats.entries == 2
+        assert stats.size_bytes > 0
+        assert cache.clear() == 2
+        assert cache.stats().entries == 0
@@ -0,0 +1,120 @@
+"""Tests for recording and replaying exchanges with SearXNG instances."""
+
+import gzip
+import time
+from pathlib import Path
+
+import httpx
+import pytest
+
+from searxngcli.cassette import CassetteMissError, RecordingTransport, ReplayTransport, request_key
+from searxngcli.client import SearXNGClient
+
+BASE_URL = "https://searxng.example.com"
+CONFIG = {"categories": ["general"], "engines": [{"name": "google", "categories": ["general"]}]}
+
+
+def live_transport() -> httpx.MockTransport:
+    counter = {"search": 0}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/config":
+            return httpx.Response(200, json=CONFIG)
+        counter["search"] += 1
+        title = f"{request.url.params['q']} {counter['search']}"
+        return httpx.Response(200, json={"query": request.url.params["q"], "results": [{"title": title}]})
+
+    return httpx.MockTransport(handler)
+
+
+@pytest.fixture
+def cassette(tmp_path: Path) -> Path:
+    path = tmp_path / "run.jsonl.gz"
+    with SearXNGClient(BASE_URL, transport=live_transport(), record=path) as client:
+        client.search("rust")
+        client.search("rust")
+        client.search("go", engines="google", deadline=5.0)
+        client.get_config()
+    return path
+
+
+class TestRequestKey:
+    def test_ignores_host_param_order_and_timeout_limit(self):
+        a = httpx.URL("https://a.example.com/search?q=x&format=json&timeout_limit=1.5")
+        b = httpx.URL("https://b.example.com/search?format=json&q=x")
+        assert request_key("GET", a) == request_key("GET", b) == "GET /search?format=json&q=x"
+
+
+class TestReplay:
+    def test_replays_recorded_exchanges_offline(self, cassette: Path):
+        replay = ReplayTransport(cassette)
+        assert len(replay) == 4
+        with SearXNGClient("https://other.example.com", transport=replay) as client:
+            assert client.search("go", engines="google").results[0].title == "go 3"
+            assert client.get_engines()[0].name == "google"
+
+    def test_repeated_requests_in_recorded_order(self, cassette: Path):
+        with SearXNGClient(BASE_URL, transport=ReplayTransport(cassette)) as client:
+            titles = [client.search("rust").results[0].title for _ in range(3)]
+        assert titles == ["rust 1", "rust 2", "rust 2"]
+
+    def test_unrecorded_request(self, cassette: Path):
+        with (
+            SearXNGClient(BASE_URL, transport=ReplayTransport(cassette)) as client,
+            pytest.raises(CassetteMissError, match="GET /search"),
+        ):
+            client.search("zig")
+
+    def test_misses_release_their_slot(self, cassette: Path):
+        with SearXNGClient(BASE_URL, transport=ReplayTransport(cassette), max_connections=4) as client:
+            for i in range(10):
+                with pytest.raises(CassetteMissError):
+                    client.search(f"zig {i}")
+            assert client.limiter.inflight == 0
+            assert client.search("rust").results[0].title == "rust 1"
+
+    def test_simulated_latency_times_out(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+        path = tmp_path / "slow.jsonl.gz"
+
+        def slow(request: httpx.Request) -> httpx.Response:
+            time.sleep(0.02)
+            return httpx.Response(200, json={"results": []})
+
+        with httpx.Client(transport=RecordingTransport(path, httpx.MockTransport(slow))) as http:
+            http.get(f"{BASE_URL}/search?q=slow")
+
+        sleeps: list[float] = []
+        monkeypatch.setattr("searxngcli.cassette.time.sleep", sleeps.append)
+        with httpx.Client(transport=ReplayTransport(path, latency=100)) as http:
+            http.get(f"{BASE_URL}/search?q=slow", timeout=10.0)
+            with pytest.raises(httpx.ReadTimeout):
+                http.get(f"{BASE_URL}/search?q=slow", timeout=1.0)
+        assert sleeps[0] >= 2.0
+        assert sleeps[1] == 1.0
+
+    def test_binary_body(self, tmp_path: Path):
+        path = tmp_path / "binary.jsonl.gz"
+        body = bytes(range(256))
+        transport = RecordingTransport(path, httpx.MockTransport(lambda request: httpx.Response(200, content=body)))
+        with httpx.Client(transport=transport) as http:
+            http.get(f"{BASE_URL}/favicon.ico")
+        with httpx.Client(transport=ReplayTransport(path)) as http:
+            assert http.get(f"{BASE_URL}/favicon.ico").content == body
+
+    def test_not_a_cassette(self, tmp_path: Path):
+        path = tmp_path / "other.jsonl.gz"
+        with gzip.open(path, "wt") as f:
+            f.write('{"query": "x"}\n')
+        with pytest.raises(ValueError, match="not a cassette"):
+            ReplayTransport(path)
+
+
+class TestRecording:
+    def test_cassette_replaced_on_close(self, cassette: Path):
+        transport = RecordingTransport(cassette, live_transport())
+        with httpx.Client(transport=transport) as http:
+            http.get(f"{BASE_URL}/search?q=new")
+            assert len(ReplayTransport(cassette)) == 4
+        assert transport.recorded == 1
+        assert len(ReplayTransport(cassette)) == 1
+        assert [p.name for p in cassette.parent.iterdir()] == [cassette.name]
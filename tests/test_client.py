@@ -0,0 +1,530 @@
+"""Tests for the SearXNG HTTP client."""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import httpx
+import pytest
+
+from searxngcli.cache import SearchCache
+from searxngcli.client import SearXNGClient
+from searxngcli.config import InstanceConfig
+from searxngcli.deadline import MIN_SAMPLES, LatencyHistory
+from searxngcli.metadata import ConfigSnapshot, MetadataStore
+
+BASE_URL = "https://searxng.example.com"
+CONFIG = {"categories": ["general"], "engines": [{"name": "google", "categories": ["general"]}]}
+
+
+class FakeTransport(httpx.MockTransport):
+    def __init__(self, status_code: int = 200, json: dict | None = None, headers: dict | None = None):
+        self.requests: list[httpx.Request] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            self.requests.append(request)
+            return httpx.Response(status_code, json=json, headers=headers)
+
+        super().__init__(handler)
+
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr("searxngcli.client.backoff_delay", lambda attempt, retry_after=None: 0.0)
+
+
+class TestSearch:
+    def test_search(self):
+        transport = FakeTransport(json={"query": "test", "results": [{"title": "Result"}]})
+        with SearXNGClient(BASE_URL, transport=transport) as client:
+            response = client.search("test", engines="google", page=2)
+
+        assert response.results[0].title == "Result"
+        request = transport.requests[0]
+        assert request.url.path == "/search"
+        assert request.url.params["q"] == "test"
+        assert request.url.params["pageno"] == "2"
+        assert request.url.params["engines"] == "google"
+
+    def test_reuses_connection_pool(self):
+        with SearXNGClient(BASE_URL, transport=FakeTransport(json={})) as client:
+            http = client.http
+            client.search("a")
+            client.search("b")
+            assert client.http is http
+        assert client._http is None
+
+    def test_coalesces_identical_in_flight_searches(self):
+        started = threading.Event()
+        release = threading.Event()
+        transport = FakeTransport()
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            transport.requests.append(request)
+            started.set()
+            release.wait(timeout=5)
+            return httpx.Response(200, json={"query": "test", "results": [{"title": "Result"}]})
+
+        transport.handler = handler
+        with SearXNGClient(BASE_URL, transport=transport) as client, ThreadPoolExecutor(max_workers=3) as executor:
+            futures = [executor.submit(client.search, "test")]
+            started.wait(timeout=5)
+            futures += [executor.submit(client.search, " test "), executor.submit(client.search, "test")]
+            time.sleep(0.05)
+            release.set()
+            responses = [f.result() for f in futures]
+
+        assert len(transport.requests) == 1
+        assert all(r.results[0].title == "Result" for r in responses)
+
+    def test_http_error(self):
+        with (
+            SearXNGClient(BASE_URL, transport=FakeTransport(status_code=500)) as client,
+            pytest.raises(httpx.HTTPStatusError),
+        ):
+            client.search("test")
+
+
+def paged_transport(page_size: int, pages: int) -> FakeTransport:
+    transport = FakeTransport()
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        transport.requests.append(request)
+        page = int(request.url.params["pageno"])
+        results = [] if page > pages else [{"url": f"https://example.com/{page}/{i}"} for i in range(page_size)]
+        # Every page repeats the first result of page 1.
+        results.append({"url": "https://example.com/1/0/"})
+        return httpx.Response(200, json={"query": "test", "results": results})
+
+    transport.handler = handler
+    return transport
+
+
+class TestSearchPages:
+    def test_collects_unique_results_across_pages(self):
+        transport = paged_transport(page_size=10, pages=5)
+        with SearXNGClient(BASE_URL, transport=transport) as client:
+            response = client.search_pages("test", num=25)
+
+        assert len(response.results) == 25
+        assert len({r.url for r in response.results}) == 25
+        assert response.results[0].url == "https://example.com/1/0"
+        assert len(transport.requests) >= 3
+
+    def test_stops_at_empty_page(self):
+        transport = paged_transport(page_size=10, pages=2)
+        with SearXNGClient(BASE_URL, transport=transport) as client:
+            response = client.search_pages("test", num=100, max_pages=5)
+
+        assert len(response.results) == 20
+        assert len(transport.requests) <= 5
+
+    def test_respects_max_pages(self):
+        transport = paged_transport(page_size=10, pages=10)
+        with SearXNGClient(BASE_URL, transport=transport) as client:
+            response = client.search_pages("test", num=100, page=3, max_pages=2)
+
+        assert {int(r.url.params["pageno"]) for r in transport.requests} == {3, 4}
+        assert len(response.results) == 21
+
+
+def engine_transport(delays: dict[str, float], failing: frozenset[str] = frozenset()) -> FakeTransport:
+    """Answer each single-engine search with results ranked differently per engine."""
+    transport = FakeTransport()
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        transport.requests.append(request)
+        engine = request.url.params["engines"]
+        time.sleep(delays.get(engine, 0.0))
+        if engine in failing:
+            return httpx.Response(500)
+        urls = {"google": ["a", "b", "c"], "bing": ["b", "d"], "slow": ["e"]}[engine]
+        results = [{"url": f"https://{name}.com", "engines": [engine]} for name in urls]
+        return httpx.Response(200, json={"query": "test", "results": results})
+
+    transport.handler = handler
+    return transport
+
+
+class TestSearchFused:
+    def test_one_request_per_engine_fused_by_rank(self):
+        transport = engine_transport({})
+        with SearXNGClient(BASE_URL, transport=transport) as client:
+            response = client.search_fused("test", "google, bing")
+
+        assert sorted(r.url.params["engines"] for r in transport.requests) == ["bing", "google"]
+        assert [r.url for r in response.results] == ["https://b.com", "https://a.com", "https://d.com", "https://c.com"]
+        assert response.results[0].engines == ["google", "bing"]
+        assert response.results[0].score > response.results[1].score
+
+    def test_deadline_leaves_out_late_engines(self):
+        transport = engine_transport({"slow": 0.5})
+        with SearXNGClient(BASE_URL, transport=transport) as client:
+            started = time.monotonic()
+            response = client.search_fused("test", "google,slow", deadline=0.1)
+            elapsed = time.monotonic() - started
+
+        assert elapsed < 0.4
+        assert "https://e.com" not in [r.url for r in response.results]
+        assert response.unresponsive_engines == [["slow", "deadline exceeded"]]
+
+    def test_failed_engines_are_reported(self):
+        transport = engine_transport({}, failing=frozenset({"bing"}))
+        with SearXNGClient(BASE_URL, transport=transport, max_retries=0) as client:
+            response = client.search_fused("test", "google,bing")
+
+        assert [r.url for r in response.results] == ["https://a.com", "https://b.com", "https://c.com"]
+        assert [name for name, _ in response.unresponsive_engines] == ["bing"]
+
+    def test_raises_when_every_engine_fails(self):
+        transport = engine_transport({}, failing=frozenset({"google", "bing"}))
+        with (
+            SearXNGClient(BASE_URL, transport=transport, max_retries=0) as client,
+            pytest.raises(httpx.HTTPStatusError),
+        ):
+            client.search_fused("test", "google,bing")
+
+    def test_partial_when_no_engine_meets_deadline(self):
+        transport = engine_transport({"slow": 0.3})
+        with SearXNGClient(BASE_URL, transport=transport) as client:
+            response = client.search_fused("test", "slow", deadline=0.05)
+
+        assert response.partial
+        assert response.results == []
+        assert response.unresponsive_engines == [["slow", "deadline exceeded"]]
+
+
+def slow_first_transport(delay: float) -> FakeTransport:
+    """Answer the first request after delay seconds and any later ones at once."""
+    transport = FakeTransport()
+    lock = threading.Lock()
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        with lock:
+            transport.requests.append(request)
+            first = len(transport.requests) == 1
+        if first:
+            time.sleep(delay)
+        return httpx.Response(200, json={"query": "test", "results": [{"title": "first" if first else "hedge"}]})
+
+    transport.handler = handler
+    return transport
+
+
+class TestDeadline:
+    def test_sends_timeout_limit(self):
+        transport = FakeTransport(json={"query": "test", "results": [{"title": "Result"}]})
+        with SearXNGClient(BASE_URL, transport=transport) as client:
+            response = client.search("test", deadline=2.0)
+
+        assert not response.partial
+        assert response.results[0].title == "Result"
+        assert transport.requests[0].url.params["timeout_limit"] == "1.6"
+
+    def test_slow_request_is_hedged(self):
+        transport = slow_first_transport(1.0)
+        latency = LatencyHistory()
+        for _ in range(MIN_SAMPLES):
+            latency.record(0.02)
+        with SearXNGClient(BASE_URL, transport=transport, latency=latency) as client:
+            started = time.monotonic()
+            response = client.search("test", deadline=0.8)
+            elapsed = time.monotonic() - started
+
+        assert response.results[0].title == "hedge"
+        assert len(transport.requests) == 2
+        assert elapsed < 0.5
+
+    def test_returns_partial_when_nothing_arrives(self):
+        transport = FakeTransport()
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            transport.requests.append(request)
+            time.sleep(1.0)
+            return httpx.Response(200, json={"query": "test", "results": [{"title": "Late"}]})
+
+        transport.handler = handler
+        with SearXNGClient(BASE_URL, transport=transport) as client:
+            started = time.monotonic()
+            response = client.search("test", deadline=0.1)
+            elapsed = time.monotonic() - started
+
+        assert response.partial
+        assert response.results == []
+        assert elapsed < 0.5
+        # Hedged halfway through the deadline, for lack of latency history.
+        assert len(transport.requests) == 2
+
+    def test_timed_out_engines_mark_partial_and_skip_cache(self, tmp_path: Path):
+        def handler(request: httpx.Request) -> httpx.Response:
+            if "timeout_limit" in request.url.params:
+                return httpx.Response(
+                    200,
+                    json={
+                        "query": "q",
+                        "results": [{"url": "https://a.example.com"}],
+                        "unresponsive_engines": [["slowengine", "timeout"]],
+                    },
+                )
+            return httpx.Response(
+                200,
+                json={"query": "q", "results": [{"url": "https://a.example.com"}, {"url": "https://b.example.com"}]},
+            )
+
+        cache = SearchCache(tmp_path / "cache.db")
+        with SearXNGClient(BASE_URL, cache=cache, transport=httpx.MockTransport(handler)) as client:
+            trimmed = client.search("q", deadline=1.0)
+            full = client.search("q")
+
+        assert trimmed.partial
+        assert len(trimmed.results) == 1
+        assert not full.partial
+        assert len(full.results) == 2
+
+    def test_complete_deadline_response_is_cached(self, tmp_path: Path):
+        transport = FakeTransport(json={"query": "q", "results": [{"title": "Result"}]})
+        cache = SearchCache(tmp_path / "cache.db")
+        with SearXNGClient(BASE_URL, cache=cache, transport=transport) as client:
+            client.search("q", deadline=1.0)
+            client.search("q")
+        assert len(transport.requests) == 1
+
+    def test_instances_slower_than_deadline_stay_healthy(self):
+        requests = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            requests.append(request)
+            read_timeout = request.extensions["timeout"]["read"]
+            if read_timeout < 0.5:
+                time.sleep(read_timeout)
+                raise httpx.ReadTimeout("too slow", request=request)
+            time.sleep(0.5)
+            return httpx.Response(200, json={"query": "test", "results": []})
+
+        instances = [InstanceConfig("https://a.example.com"), InstanceConfig("https://b.example.com")]
+        with SearXNGClient(
+            "https://a.example.com", instances=instances, transport=httpx.MockTransport(handler)
+        ) as client:
+            limit = client.limiter.limit
+            response = client.search("test", deadline=0.2)
+            time.sleep(0.2)
+
+            assert response.partial
+            assert all(instance.ejected_until == 0.0 for instance in client.pool.instances)
+            assert client.limiter.limit == limit
+            assert client.limiter.inflight == 0
+        # The request and its hedge, without failing over or retrying past the deadline.
+        assert len(requests) == 2
+
+    def test_errors_are_raised(self):
+        with (
+            SearXNGClient(BASE_URL, transport=FakeTransport(status_code=500), max_retries=0) as client,
+            pytest.raises(httpx.HTTPStatusError),
+        ):
+            client.search("test", deadline=1.0)
+
+    def test_records_latency(self):
+        latency = LatencyHistory()
+        with SearXNGClient(BASE_URL, transport=FakeTransport(json={}), latency=latency) as client:
+            client.search("a")
+            client.search("b", use_cache=False)
+        assert len(latency) == 2
+
+    def test_pages_collected_before_deadline(self):
+        transport = paged_transport(page_size=10, pages=5)
+        handler = transport.handler
+
+        def slow_later_pages(request: httpx.Request) -> httpx.Response:
+            if request.url.params["pageno"] != "1":
+                time.sleep(1.0)
+            return handler(request)
+
+        transport.handler = slow_later_pages
+        with SearXNGClient(BASE_URL, transport=transport) as client:
+            response = client.search_pages("test", num=30, deadline=0.3)
+
+        assert response.partial
+        assert len(response.results) == 10
+
+
+class TestInstancePool:
+    def test_fails_over_to_healthy_instance(self):
+        transport = FakeTransport()
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            transport.requests.append(request)
+            if request.url.host == "a.example.com":
+                return httpx.Response(503)
+            return httpx.Response(200, json={"query": "test", "results": [{"title": "From b"}]})
+
+        transport.handler = handler
+        instances = [InstanceConfig("https://a.example.com"), InstanceConfig("https://b.example.com")]
+        with SearXNGClient("https://a.example.com", instances=instances, transport=transport) as client:
+            assert client.search("one").results[0].title == "From b"
+            assert client.search("two").results[0].title == "From b"
+
+        hosts = [r.url.host for r in transport.requests]
+        assert hosts.count("a.example.com") == 1
+        assert hosts.count("b.example.com") == 2
+
+    def test_connection_errors_fail_over(self):
+        def handler(request: httpx.Request) -> httpx.Response:
+            if request.url.host == "a.example.com":
+                raise httpx.ConnectError("refused", request=request)
+            return httpx.Response(200, json={"query": "test"})
+
+        instances = [InstanceConfig("https://a.example.com"), InstanceConfig("https://b.example.com")]
+        with SearXNGClient(
+            "https://a.example.com", instances=instances, transport=httpx.MockTransport(handler)
+        ) as client:
+            assert client.search("one").query == "test"
+
+    def test_single_instance_error_is_raised(self):
+        def handler(request: httpx.Request) -> httpx.Response:
+            raise httpx.ConnectError("refused", request=request)
+
+        with (
+            SearXNGClient(BASE_URL, transport=httpx.MockTransport(handler)) as client,
+            pytest.raises(httpx.ConnectError),
+        ):
+            client.search("test")
+
+
+class TestRetries:
+    def test_retries_after_429(self):
+        responses = [httpx.Response(429, headers={"Retry-After": "1"}), httpx.Response(200, json={"query": "test"})]
+        transport = FakeTransport()
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            transport.requests.append(request)
+            return responses.pop(0)
+
+        transport.handler = handler
+        with SearXNGClient(BASE_URL, transport=transport) as client:
+            assert client.search("test").query == "test"
+        assert len(transport.requests) == 2
+
+    def test_gives_up_after_max_retries(self):
+        transport = FakeTransport(status_code=503)
+        with (
+            SearXNGClient(BASE_URL, transport=transport, max_retries=2) as client,
+            pytest.raises(httpx.HTTPStatusError),
+        ):
+            client.search("test")
+        assert len(transport.requests) == 3
+
+    def test_does_not_retry_server_errors(self):
+        transport = FakeTransport(status_code=500)
+        with SearXNGClient(BASE_URL, transport=transport) as client, pytest.raises(httpx.HTTPStatusError):
+            client.search("test")
+        assert len(transport.requests) == 1
+
+    def test_connection_errors_are_retried(self):
+        attempts = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            attempts.append(request)
+            if len(attempts) == 1:
+                raise httpx.ConnectError("refused", request=request)
+            return httpx.Response(200, json={"query": "test"})
+
+        with SearXNGClient(BASE_URL, transport=httpx.MockTransport(handler)) as client:
+            assert client.search("test").query == "test"
+        assert len(attempts) == 2
+
+    def test_errors_lower_concurrency_limit(self):
+        with SearXNGClient(BASE_URL, transport=FakeTransport(status_code=503), max_retries=0) as client:
+            limit = client.limiter.limit
+            with pytest.raises(httpx.HTTPStatusError):
+                client.search("test")
+            assert client.limiter.limit < limit
+            assert client.limiter.inflight == 0
+
+    def test_other_errors_release_their_slot(self):
+        def handler(request: httpx.Request) -> httpx.Response:
+            raise LookupError("no response")
+
+        with SearXNGClient(BASE_URL, transport=httpx.MockTransport(handler), max_connections=2) as client:
+            for _ in range(5):
+                with pytest.raises(LookupError):
+                    client.search("test")
+            assert client.limiter.inflight == 0
+            assert client.pool.instances[0].outstanding == 0
+
+
+class TestConfigSnapshot:
+    def test_fetches_and_stores_snapshot(self, tmp_path: Path):
+        transport = FakeTransport(json=CONFIG, headers={"ETag": '"v1"'})
+        store = MetadataStore(tmp_path / "snapshot.json")
+
+        with SearXNGClient(BASE_URL, metadata=store, transport=transport) as client:
+            assert client.get_categories() == ["general"]
+            assert [e.name for e in client.get_engines()] == ["google"]
+        assert len(transport.requests) == 1
+        assert MetadataStore(store.path).load().etag == '"v1"'
+
+    def test_refresh_sends_validators(self, tmp_path: Path):
+        store = MetadataStore(tmp_path / "snapshot.json")
+        store.save(ConfigSnapshot(data=CONFIG, etag='"v1"', last_modified="yesterday", fetched_at=0))
+        transport = FakeTransport(status_code=304)
+
+        with SearXNGClient(BASE_URL, metadata=store, transport=transport) as client:
+            assert client.get_categories(refresh=True) == ["general"]
+        assert transport.requests[0].headers["If-None-Match"] == '"v1"'
+        assert transport.requests[0].headers["If-Modified-Since"] == "yesterday"
+        assert store.load().fetched_at > time.time() - 60
+
+    def test_stale_snapshot_revalidated_in_background(self, tmp_path: Path):
+        store = MetadataStore(tmp_path / "snapshot.json")
+        store.save(ConfigSnapshot(data=CONFIG, etag='"v1"', fetched_at=0))
+        transport = FakeTransport(json={"categories": ["news"]}, headers={"ETag": '"v2"'})
+
+        with SearXNGClient(BASE_URL, metadata=store, transport=transport) as client:
+            assert client.get_categories() == ["general"]
+        assert MetadataStore(store.path).load().data == {"categories": ["news"]}
+
+    def test_refresh_failure_uses_snapshot(self, tmp_path: Path):
+        store = MetadataStore(tmp_path / "snapshot.json")
+        store.save(ConfigSnapshot(data=CONFIG, fetched_at=0))
+
+        with SearXNGClient(BASE_URL, metadata=store, transport=FakeTransport(status_code=503)) as client:
+            assert client.get_categories(refresh=True) == ["general"]
+
+    def test_search_rejects_unknown_engine_without_request(self, tmp_path: Path):
+        store = MetadataStore(tmp_path / "snapshot.json")
+        store.save(ConfigSnapshot(data=CONFIG, fetched_at=time.time()))
+        transport = FakeTransport(json={})
+
+        with (
+            SearXNGClient(BASE_URL, metadata=store, transport=transport) as client,
+            pytest.raises(ValueError, match="gogle"),
+        ):
+            client.search("test", engines="gogle")
+        assert transport.requests == []
+
+    def test_stale_snapshot_revalidated_before_rejecting(self, tmp_path: Path):
+        store = MetadataStore(tmp_path / "snapshot.json")
+        store.save(ConfigSnapshot(data=CONFIG, etag='"v1"', fetched_at=0))
+        updated = {**CONFIG, "engines": [*CONFIG["engines"], {"name": "brave", "categories": ["general"]}]}
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            if request.url.path == "/config":
+                return httpx.Response(200, json=updated, headers={"ETag": '"v2"'})
+            return httpx.Response(200, json={"query": "test", "results": []})
+
+        with SearXNGClient(BASE_URL, metadata=store, transport=httpx.MockTransport(handler)) as client:
+            assert client.search("test", engines="brave").query == "test"
+        assert MetadataStore(store.path).load().etag == '"v2"'
+
+    def test_stale_snapshot_only_warns_when_refresh_fails(self, tmp_path: Path):
+        store = MetadataStore(tmp_path / "snapshot.json")
+        store.save(ConfigSnapshot(data=CONFIG, fetched_at=0))
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            if request.url.path == "/config":
+                return httpx.Response(404)
+            return httpx.Response(200, json={"query": "test", "results": []})
+
+        with SearXNGClient(BASE_URL, metadata=store, transport=httpx.MockTransport(handler)) as client:
+            assert client.search("test", engines="brave").query == "test"
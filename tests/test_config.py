@@ -1,10 +1,36 @@
 """Tests for configuration management."""
 
+import os
+import sys
 from pathlib import Path
 
 import pytest
 
-from searxngcli.config import Config, load_config, save_config
+from searxngcli.config import Config, InstanceConfig, load_config, parse_config_value, read_config_file, save_config
+
+PROFILES = """\
+base_url: https://public.example.com
+instances:
+  - https://public.example.com
+  - https://public-2.example.com
+timeout: 20
+profiles:
+  internal:
+    base_url: https://searx.internal
+    categories: it
+    engines: github,stackoverflow
+    language: en
+    timeout: 5
+    num: 10
+  news:
+    categories: news
+"""
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    return tmp_path / "cache"
 
 
 class TestConfig:
@@ -40,3 +66,156 @@ class TestConfig:
 
         loaded = load_config(config_file)
         assert loaded.base_url == "https://searxng.example.com"
+
+    def test_load_config_cache_settings(self, tmp_path: Path):
+        config_file = tmp_path / "config.yml"
+        config_file.write_text("base_url: https://searxng.example.com\ncache_ttl: 0\ncache_max_size: 10\n")
+
+        config = load_config(config_file)
+        assert config.cache_ttl == 0
+        assert config.cache_max_size == 10
+
+    def test_save_config_omits_default_cache_settings(self, tmp_path: Path):
+        config_file = tmp_path / "config.yml"
+        save_config(Config(base_url="https://searxng.example.com"), config_file)
+
+        assert config_file.read_text() == "base_url: https://searxng.example.com\n"
+
+    def test_load_config_connection_settings(self, tmp_path: Path):
+        config_file = tmp_path / "config.yml"
+        config_file.write_text("base_url: https://searxng.example.com\ntimeout: 10\nhttp2: true\n")
+
+        config = load_config(config_file)
+        assert config.timeout == 10.0
+        assert config.http2 is True
+        assert config.max_connections == 20
+
+
+class TestProfiles:
+    @pytest.fixture
+    def config_file(self, tmp_path: Path) -> Path:
+        path = tmp_path / "config.yml"
+        path.write_text(PROFILES)
+        return path
+
+    def test_without_profile(self, config_file: Path):
+        config = load_config(config_file)
+        assert (config.base_url, config.timeout, config.categories, config.num) == (
+            "https://public.example.com",
+            20.0,
+            "",
+            25,
+        )
+        assert set(config.profiles) == {"internal", "news"}
+
+    def test_profile_overrides(self, config_file: Path):
+        config = load_config(config_file, profile="internal")
+        assert config.profile == "internal"
+        assert config.base_url == "https://searx.internal"
+        assert (config.categories, config.engines, config.language) == ("it", "github,stackoverflow", "en")
+        assert (config.timeout, config.num) == (5.0, 10)
+        # Another base_url means another instance, not the top-level pool.
+        assert config.instances == []
+
+    def test_profile_inherits_top_level(self, config_file: Path):
+        config = load_config(config_file, profile="news")
+        assert config.base_url == "https://public.example.com"
+        assert config.timeout == 20.0
+        assert len(config.instances) == 2
+        assert config.categories == "news"
+
+    def test_unknown_profile(self, config_file: Path):
+        with pytest.raises(ValueError, match="available: internal, news"):
+            load_config(config_file, profile="missing")
+
+    def test_save_keeps_profiles(self, config_file: Path):
+        config = load_config(config_file)
+        config.profiles["news"]["language"] = "de"
+        save_config(config, config_file)
+
+        assert load_config(config_file, profile="news").language == "de"
+        assert load_config(config_file, profile="internal").base_url == "https://searx.internal"
+
+    def test_cannot_save_with_profile_applied(self, config_file: Path):
+        with pytest.raises(ValueError):
+            save_config(load_config(config_file, profile="news"), config_file)
+
+
+class TestCompiledConfig:
+    def test_unchanged_file_is_not_parsed_again(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+        path = tmp_path / "config.yml"
+        path.write_text(PROFILES)
+        data = read_config_file(path)
+
+        monkeypatch.setitem(sys.modules, "yaml", None)
+        assert read_config_file(path) == data
+        assert load_config(path, profile="internal").num == 10
+
+    def test_edited_file_is_parsed_again(self, tmp_path: Path):
+        path = tmp_path / "config.yml"
+        path.write_text("base_url: https://a.example.com\n")
+        load_config(path)
+        stat = path.stat()
+
+        # Same size and modification time as before would go unnoticed; anything else is picked up.
+        path.write_text("base_url: https://b.example.com\n")
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+        assert load_config(path).base_url == "https://b.example.com"
+
+    def test_values_json_cannot_hold(self, tmp_path: Path):
+        path = tmp_path / "config.yml"
+        path.write_text("base_url: https://a.example.com\nadded: 2025-01-01\n")
+        assert load_config(path).base_url == "https://a.example.com"
+        assert load_config(path).base_url == "https://a.example.com"
+
+    def test_unwritable_cache_dir(self, tmp_path: Path, cache_dir: Path):
+        cache_dir.parent.mkdir(exist_ok=True)
+        cache_dir.write_text("not a directory")
+        path = tmp_path / "config.yml"
+        path.write_text("base_url: https://a.example.com\n")
+        assert load_config(path).base_url == "https://a.example.com"
+
+
+class TestParseConfigValue:
+    def test_types(self):
+        assert parse_config_value("cache_ttl", "60") == 60
+        assert parse_config_value("connect_timeout", "2.5") == 2.5
+        assert parse_config_value("http2", "yes") is True
+        assert parse_config_value("http2", "false") is False
+
+    def test_invalid(self):
+        with pytest.raises(ValueError):
+            parse_config_value("cache_ttl", "soon")
+        with pytest.raises(ValueError):
+            parse_config_value("http2", "maybe")
+
+
+class TestInstances:
+    def test_load_instances(self, tmp_path: Path):
+        config_file = tmp_path / "config.yml"
+        config_file.write_text(
+            "instances:\n  - url: https://a.example.com/\n    weight: 2\n  - https://b.example.com\n"
+        )
+
+        config = load_config(config_file)
+        assert config.base_url == "https://a.example.com"
+        assert config.instances == [
+            InstanceConfig(url="https://a.example.com", weight=2.0),
+            InstanceConfig(url="https://b.example.com", weight=1.0),
+        ]
+
+    def test_invalid_weight(self, tmp_path: Path):
+        config_file = tmp_path / "config.yml"
+        config_file.write_text("instances:\n  - url: https://a.example.com\n    weight: 0\n")
+        with pytest.raises(ValueError):
+            load_config(config_file)
+
+    def test_save_and_load_instances(self, tmp_path: Path):
+        config_file = tmp_path / "config.yml"
+        config = Config(
+            base_url="https://a.example.com",
+            instances=[InstanceConfig(url="https://a.example.com"), InstanceConfig(url="https://b.example.com")],
+        )
+        save_config(config, config_file)
+
+        assert load_config(config_file) == config
@@ -0,0 +1,128 @@
+"""Tests for the resident daemon."""
+
+import os
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from searxngcli import daemon
+from searxngcli.config import Config
+from searxngcli.context import get_context
+
+from .fakeserver import FakeSearXNG
+
+
+@pytest.fixture
+def socket_path(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    monkeypatch.setenv("XDG_RUNTIME_DIR", str(tmp_path))
+    monkeypatch.delenv("SEARXNG_NO_DAEMON", raising=False)
+    monkeypatch.delenv("SEARXNG_CONFIG", raising=False)
+    return daemon.get_socket_path()
+
+
+@pytest.fixture
+def running_daemon(socket_path: Path, capsys: pytest.CaptureFixture):
+    ctx = get_context()
+    with FakeSearXNG() as server:
+        ctx.config = Config(base_url=server.base_url, cache_ttl=0)
+        instance = daemon.Daemon(socket_path)
+        thread = threading.Thread(target=instance.serve, daemon=True)
+        thread.start()
+        for _ in range(100):
+            if daemon.status(socket_path) is not None:
+                break
+            time.sleep(0.01)
+        try:
+            yield server
+        finally:
+            daemon.stop(socket_path)
+            thread.join(timeout=5)
+            ctx.close()
+            ctx.config = None
+
+
+class TestForward:
+    def test_no_daemon_falls_back(self, socket_path: Path):
+        assert daemon.forward(["search", "test"]) is None
+
+    def test_only_forwards_known_commands(self, running_daemon: FakeSearXNG):
+        assert daemon.forward(["batch", "queries.txt"]) is None
+
+    def test_opt_out(self, running_daemon: FakeSearXNG, monkeypatch: pytest.MonkeyPatch):
+        monkeypatch.setenv("SEARXNG_NO_DAEMON", "1")
+        assert daemon.forward(["search", "test"]) is None
+
+    def test_search_through_daemon(self, running_daemon: FakeSearXNG, capsys: pytest.CaptureFixture):
+        assert daemon.forward(["search", "python", "--jsonl"]) == 0
+        assert daemon.forward(["search", "python", "--jsonl"]) == 0
+
+        out = capsys.readouterr().out
+        assert out.count('"type":"meta"') == 2
+        assert "python result 0" in out
+        assert daemon.status()["requests"] == 2
+
+    def test_export_path_resolved_against_caller_cwd(
+        self, socket_path: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ):
+        sent = []
+        monkeypatch.setattr(daemon, "_request", lambda path, message: sent.append(message))
+        monkeypatch.chdir(tmp_path)
+        daemon.forward(["search", "q", "--export", "out.csv"])
+        daemon.forward(["search", "--export=out.db", "--", "--export", "x"])
+        assert sent[0]["argv"] == ["search", "q", "--export", str(tmp_path / "out.csv")]
+        assert sent[1]["argv"] == ["search", f"--export={tmp_path / 'out.db'}", "--", "--export", "x"]
+
+    def test_errors_are_forwarded(self, running_daemon: FakeSearXNG, capsys: pytest.CaptureFixture):
+        assert daemon.forward(["search", "--bogus"]) == 2
+        assert "No such option" in capsys.readouterr().err
+
+
+class TestDaemonStatus:
+    def test_status_and_stop(self, socket_path: Path):
+        assert daemon.status() is None
+        assert daemon.stop() is False
+
+
+class FakeClient:
+    closed = False
+
+    def close(self) -> None:
+        self.closed = True
+
+
+class TestConfigReload:
+    def test_replaced_client_closed_after_running_commands(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+        config_path = tmp_path / "config.yml"
+        config_path.write_text("base_url: http://localhost\n")
+        monkeypatch.setattr("searxngcli.config.get_config_path", lambda: config_path)
+        instance = daemon.Daemon(tmp_path / "daemon.sock")
+        ctx = get_context()
+        old = ctx.client = FakeClient()
+        started = threading.Event()
+        finish = threading.Event()
+
+        def run(message: dict) -> dict:
+            started.set()
+            finish.wait(5)
+            return {}
+
+        monkeypatch.setattr(instance, "run", run)
+        try:
+            instance._reload_config_if_changed()
+            running = threading.Thread(target=instance.handle, args=({"argv": ["search"]},))
+            running.start()
+            assert started.wait(5)
+
+            os.utime(config_path, (0, 0))
+            instance._reload_config_if_changed()
+            assert ctx.client is None
+            assert not old.closed
+
+            finish.set()
+            running.join(5)
+            assert old.closed
+        finally:
+            ctx.client = None
+            ctx.config = None
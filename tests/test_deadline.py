@@ -0,0 +1,72 @@
+"""Tests for the latency history behind deadline searches."""
+
+from pathlib import Path
+
+from searxngcli.deadline import (
+    MAX_HEDGE_SHARE,
+    MIN_SAMPLES,
+    LatencyHistory,
+    latency_path,
+    timed_out_engines,
+    timeout_limit,
+)
+
+
+class TestLatencyHistory:
+    def test_percentile_needs_enough_samples(self):
+        history = LatencyHistory()
+        for _ in range(MIN_SAMPLES - 1):
+            history.record(0.1)
+        assert history.percentile(95) is None
+        history.record(0.1)
+        assert history.percentile(95) == 0.1
+
+    def test_percentile(self):
+        history = LatencyHistory()
+        for i in range(1, 101):
+            history.record(i / 100)
+        assert history.percentile(50) == 0.5
+        assert history.percentile(95) == 0.95
+        assert history.percentile(100) == 1.0
+
+    def test_keeps_the_latest_window(self):
+        history = LatencyHistory(window=MIN_SAMPLES)
+        for _ in range(MIN_SAMPLES):
+            history.record(5.0)
+        for _ in range(MIN_SAMPLES):
+            history.record(0.1)
+        assert len(history) == MIN_SAMPLES
+        assert history.percentile(100) == 0.1
+
+    def test_hedge_delay(self):
+        history = LatencyHistory()
+        assert history.hedge_delay(2.0) == 2.0 * MAX_HEDGE_SHARE
+        for _ in range(MIN_SAMPLES):
+            history.record(0.3)
+        assert history.hedge_delay(2.0) == 0.3
+        assert history.hedge_delay(0.4) == 0.4 * MAX_HEDGE_SHARE
+
+    def test_persists(self, tmp_path: Path):
+        path = latency_path(tmp_path, "https://searx.example.com")
+        history = LatencyHistory(path)
+        history.record(0.25)
+        history.save()
+
+        assert LatencyHistory(path).percentile(0) is None
+        assert len(LatencyHistory(path)) == 1
+
+    def test_ignores_unreadable_file(self, tmp_path: Path):
+        path = tmp_path / "latency.json"
+        path.write_text("{not json")
+        assert len(LatencyHistory(path)) == 0
+
+
+def test_timeout_limit():
+    assert timeout_limit(2.0) == "1.6"
+    assert timeout_limit(0.01) == "0.1"
+
+
+def test_timed_out_engines():
+    data = {"unresponsive_engines": [["slow", "timeout"], ["blocked", "HTTP error"], ["odd"]]}
+    assert timed_out_engines(data) == ["slow"]
+    assert timed_out_engines({}) == []
@@ -0,0 +1,129 @@
+"""Tests for dataset export of search results."""
+
+import csv
+import sqlite3
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pytest
+
+from searxngcli.export import (
+    COLUMN_NAMES,
+    EXPORT_SCHEMA_VERSION,
+    CsvExporter,
+    ParquetExporter,
+    SqliteExporter,
+    export_format,
+    open_exporter,
+)
+from searxngcli.models import FetchedPage, SearchResult
+
+TIMESTAMP = datetime(2025, 1, 2, 3, 4, 5, tzinfo=timezone.utc)
+RESULTS = [
+    SearchResult(title="A", url="https://a.com", engine="google", engines=["google", "bing"], score=2.5),
+    SearchResult(title="B", url="https://b.com", page=FetchedPage(url="https://b.com", status=200, text="Body")),
+]
+
+
+class TestExportFormat:
+    def test_from_extension(self):
+        assert export_format(Path("out.CSV")) == "csv"
+        assert export_format(Path("out.sqlite3")) == "sqlite"
+        assert export_format(Path("out.parquet")) == "parquet"
+
+    def test_unknown_extension(self):
+        with pytest.raises(ValueError, match="Unknown export format"):
+            export_format(Path("out.json"))
+
+
+class TestCsvExporter:
+    def test_appends_with_one_header(self, tmp_path: Path):
+        path = tmp_path / "out.csv"
+        for query in ("one", "two"):
+            with open_exporter(path) as exporter:
+                exporter.add(query, 1, RESULTS, TIMESTAMP)
+
+        with open(path, newline="") as f:
+            rows = list(csv.DictReader(f))
+        assert list(rows[0]) == COLUMN_NAMES
+        assert [(r["query"], r["rank"]) for r in rows] == [("one", "1"), ("one", "2"), ("two", "1"), ("two", "2")]
+        assert rows[0]["schema_version"] == str(EXPORT_SCHEMA_VERSION)
+        assert rows[0]["timestamp"] == "2025-01-02T03:04:05.000+00:00"
+        assert rows[0]["engines"] == "google,bing"
+        assert rows[0]["fetched_status"] == ""
+        assert rows[1]["fetched_text"] == "Body"
+
+    def test_writes_in_batches(self, tmp_path: Path):
+        path = tmp_path / "out.csv"
+        exporter = CsvExporter(path, batch_size=3)
+        exporter.add("one", 1, RESULTS, TIMESTAMP)
+        assert exporter.written == 0
+        exporter.add("two", 1, RESULTS, TIMESTAMP)
+        assert exporter.written == 4
+        exporter.add("three", 1, RESULTS[:1], TIMESTAMP)
+        exporter.close()
+        assert exporter.written == 5
+
+    def test_refuses_file_with_other_columns(self, tmp_path: Path):
+        path = tmp_path / "out.csv"
+        path.write_text("query,url\n")
+        with pytest.raises(ValueError, match="different columns"):
+            CsvExporter(path)
+
+
+class TestSqliteExporter:
+    def test_appends_rows(self, tmp_path: Path):
+        path = tmp_path / "out.db"
+        for query in ("one", "two"):
+            with open_exporter(path) as exporter:
+                exporter.add(query, 2, RESULTS, TIMESTAMP)
+
+        conn = sqlite3.connect(path)
+        rows = conn.execute("SELECT query, page, rank, engines, score, fetched_truncated FROM results").fetchall()
+        conn.close()
+        assert rows == [
+            ("one", 2, 1, "google,bing", 2.5, None),
+            ("one", 2, 2, "", 0.0, 0),
+            ("two", 2, 1, "google,bing", 2.5, None),
+            ("two", 2, 2, "", 0.0, 0),
+        ]
+
+    def test_unknown_page_is_null(self, tmp_path: Path):
+        path = tmp_path / "out.db"
+        with open_exporter(path) as exporter:
+            exporter.add("filled", None, RESULTS[:1], TIMESTAMP)
+
+        conn = sqlite3.connect(path)
+        assert conn.execute("SELECT page FROM results").fetchall() == [(None,)]
+        conn.close()
+
+    def test_refuses_table_with_other_columns(self, tmp_path: Path):
+        path = tmp_path / "out.db"
+        conn = sqlite3.connect(path)
+        conn.execute("CREATE TABLE results (query TEXT)")
+        conn.close()
+        with pytest.raises(ValueError, match="different columns"):
+            SqliteExporter(path)
+
+
+class TestParquetExporter:
+    def test_each_run_adds_a_part_file(self, tmp_path: Path):
+        dataset = pytest.importorskip("pyarrow.dataset")
+        path = tmp_path / "out.parquet"
+        for query in ("one", "two"):
+            with open_exporter(path, batch_size=1) as exporter:
+                exporter.add(query, 1, RESULTS, TIMESTAMP)
+
+        assert len(list(path.glob("part-*.parquet"))) == 2
+        assert not list(path.glob(".*"))
+        table = dataset.dataset(path).to_table()
+        assert table.column_names == COLUMN_NAMES
+        assert sorted(table.column("query").to_pylist()) == ["one", "one", "two", "two"]
+        assert ["google", "bing"] in table.column("engines").to_pylist()
+        assert table.schema.metadata[b"searxngcli.schema_version"] == str(EXPORT_SCHEMA_VERSION).encode()
+
+    def test_empty_run_leaves_no_file(self, tmp_path: Path):
+        pytest.importorskip("pyarrow")
+        path = tmp_path / "out.parquet"
+        ParquetExporter(path).close()
+        assert list(path.iterdir()) == []
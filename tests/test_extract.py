@@ -0,0 +1,44 @@
+"""Tests for main-text extraction."""
+
+from searxngcli.extract import extract_text, sniff_charset
+
+
+class TestExtractText:
+    def test_drops_boilerplate(self):
+        html = """
+        <html><head><title> Example  page </title><style>p {}</style></head>
+        <body>
+          <header>Site name</header>
+          <nav><a href="/">Home</a></nav>
+          <h1>Heading</h1>
+          <p>First <b>paragraph</b>&nbsp;here.</p>
+          <script>var x = "<p>not text</p>";</script>
+          <p>Second<br>line</p>
+          <footer>Copyright</footer>
+        </body></html>
+        """
+        title, text = extract_text(html)
+        assert title == "Example page"
+        assert text == "Heading\n\nFirst paragraph here.\n\nSecond\n\nline"
+
+    def test_prefers_main_content(self):
+        body = "Actual article text. " * 20
+        html = f"<div>Sidebar links</div><article><p>{body}</p></article><div>Related</div>"
+        assert extract_text(html)[1] == body.strip()
+
+    def test_ignores_short_main_element(self):
+        html = "<main><p>Teaser</p></main><div>Everything else</div>"
+        assert extract_text(html)[1] == "Teaser\n\nEverything else"
+
+    def test_unclosed_tags(self):
+        assert extract_text("<p>One<p>Two<div>Three")[1] == "One\n\nTwo\n\nThree"
+
+
+class TestSniffCharset:
+    def test_meta_charset(self):
+        assert sniff_charset(b'<html><head><meta charset="windows-1250">') == "windows-1250"
+        meta = b'<meta http-equiv="Content-Type" content="text/html; charset=iso-8859-2">'
+        assert sniff_charset(meta) == "iso-8859-2"
+
+    def test_missing(self):
+        assert sniff_charset(b"<html><body>x</body></html>") is None
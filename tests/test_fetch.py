@@ -0,0 +1,168 @@
+"""Tests for fetching result pages."""
+
+import threading
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+import httpx
+import pytest
+
+from searxngcli.fetch import PageCache, PageFetcher
+
+HTML = "<html><head><title>Page</title></head><body><p>Hello world</p></body></html>"
+
+
+class Handler(httpx.MockTransport):
+    def __init__(self, respond: Callable[[httpx.Request], httpx.Response]):
+        self.requests: list[httpx.Request] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            self.requests.append(request)
+            return respond(request)
+
+        super().__init__(handler)
+
+
+def html_response(request: httpx.Request, **headers: str) -> httpx.Response:
+    return httpx.Response(200, text=HTML, headers={"Content-Type": "text/html; charset=utf-8", **headers})
+
+
+@pytest.fixture
+def cache(tmp_path: Path) -> PageCache:
+    return PageCache(tmp_path / "pages.db")
+
+
+class TestFetch:
+    def test_extracts_text(self):
+        with PageFetcher(transport=Handler(html_response)) as fetcher:
+            page = fetcher.fetch("https://example.com/a")
+
+        assert page.ok
+        assert (page.status, page.content_type, page.title, page.text) == (200, "text/html", "Page", "Hello world")
+        assert not page.truncated
+
+    def test_plain_text_and_binary(self):
+        def respond(request: httpx.Request) -> httpx.Response:
+            if request.url.path == "/notes.txt":
+                return httpx.Response(200, text="  notes \n", headers={"Content-Type": "text/plain"})
+            return httpx.Response(200, content=b"%PDF-1.7", headers={"Content-Type": "application/pdf"})
+
+        with PageFetcher(transport=Handler(respond)) as fetcher:
+            text, pdf = fetcher.fetch_all(["https://example.com/notes.txt", "https://example.com/doc.pdf"])
+
+        assert text.text == "notes"
+        assert (pdf.text, pdf.size) == ("", 8)
+
+    def test_stops_reading_at_max_bytes(self):
+        sent = []
+
+        def chunks():
+            for i in range(100):
+                sent.append(i)
+                yield b"<p>" + b"x" * 1000 + b"</p>"
+
+        def respond(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(200, content=chunks(), headers={"Content-Type": "text/html"})
+
+        with PageFetcher(transport=Handler(respond), max_bytes=5000) as fetcher:
+            page = fetcher.fetch("https://example.com/big")
+
+        assert page.truncated
+        assert page.size == 5000
+        assert len(sent) < 10
+
+    def test_http_error(self):
+        with PageFetcher(transport=Handler(lambda request: httpx.Response(404))) as fetcher:
+            page = fetcher.fetch("https://example.com/missing")
+        assert (page.status, page.error) == (404, "HTTP 404")
+
+    def test_transport_error(self):
+        def respond(request: httpx.Request) -> httpx.Response:
+            raise httpx.ConnectError("refused", request=request)
+
+        with PageFetcher(transport=Handler(respond)) as fetcher:
+            assert fetcher.fetch("https://example.com/").error == "refused"
+
+    def test_unsupported_scheme(self):
+        transport = Handler(html_response)
+        with PageFetcher(transport=transport) as fetcher:
+            assert fetcher.fetch("ftp://example.com/file").error == "Unsupported URL scheme"
+        assert not transport.requests
+
+    def test_per_host_limit(self):
+        active: dict[str, int] = {}
+        peak: dict[str, int] = {}
+        lock = threading.Lock()
+
+        def respond(request: httpx.Request) -> httpx.Response:
+            host = request.url.host
+            with lock:
+                active[host] = active.get(host, 0) + 1
+                peak[host] = max(peak.get(host, 0), active[host])
+            time.sleep(0.02)
+            with lock:
+                active[host] -= 1
+            return html_response(request)
+
+        urls = [f"https://{host}.example.com/{i}" for host in ("a", "b") for i in range(6)]
+        with PageFetcher(transport=Handler(respond), per_host=2, concurrency=8) as fetcher:
+            pages = fetcher.fetch_all(urls)
+
+        assert [page.url for page in pages] == urls
+        assert peak == {"a.example.com": 2, "b.example.com": 2}
+
+
+class TestPageCache:
+    def test_fresh_pages_skip_the_network(self, cache: PageCache):
+        transport = Handler(html_response)
+        with PageFetcher(cache=cache, transport=transport) as fetcher:
+            first = fetcher.fetch("https://example.com/a")
+            second = fetcher.fetch("https://example.com/a")
+
+        assert len(transport.requests) == 1
+        assert not first.from_cache
+        assert second.from_cache
+        assert second.text == first.text
+
+    def test_revalidates_stale_pages(self, cache: PageCache):
+        def respond(request: httpx.Request) -> httpx.Response:
+            if request.headers.get("If-None-Match") == '"v1"':
+                return httpx.Response(304)
+            return html_response(request, ETag='"v1"', **{"Last-Modified": "Wed, 01 Jan 2025 00:00:00 GMT"})
+
+        transport = Handler(respond)
+        with PageFetcher(cache=cache, transport=transport, freshness=0) as fetcher:
+            fetcher.fetch("https://example.com/a")
+            page = fetcher.fetch("https://example.com/a")
+
+        assert page.from_cache
+        assert page.text == "Hello world"
+        request = transport.requests[1]
+        assert request.headers["If-Modified-Since"] == "Wed, 01 Jan 2025 00:00:00 GMT"
+
+    def test_stale_page_served_when_fetch_fails(self, cache: PageCache):
+        with PageFetcher(cache=cache, transport=Handler(html_response)) as fetcher:
+            fetcher.fetch("https://example.com/a")
+
+        def respond(request: httpx.Request) -> httpx.Response:
+            raise httpx.ConnectError("refused", request=request)
+
+        with PageFetcher(cache=PageCache(cache.path), transport=Handler(respond), freshness=0) as fetcher:
+            page = fetcher.fetch("https://example.com/a")
+        assert page.ok
+        assert page.from_cache
+
+    def test_evicts_least_recently_used(self, tmp_path: Path):
+        cache = PageCache(tmp_path / "pages.db")
+        body = bytes(range(256)) * 40
+        with PageFetcher(cache=cache, transport=Handler(lambda r: httpx.Response(200, content=body))) as fetcher:
+            fetcher.fetch("https://example.com/probe")
+            size = len(cache._connect().execute("SELECT body FROM pages").fetchone()[0])
+            cache.max_size = size * 2
+            for name in ("a", "b", "c"):
+                fetcher.fetch(f"https://example.com/{name}")
+                time.sleep(0.01)
+
+            assert cache.get("https://example.com/a") is None
+            assert cache.get("https://example.com/c") is not None
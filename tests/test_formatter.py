@@ -0,0 +1,103 @@
+"""Tests for output formatting."""
+
+import json
+
+import pytest
+
+from searxngcli.formatter import print_categories, print_engines, print_json, print_results, write_jsonl
+from searxngcli.models import EngineInfo, SearchResponse, SearchResult
+
+
+class TestPrintResults:
+    response = SearchResponse(
+        query="test",
+        number_of_results=100,
+        results=[
+            SearchResult(title="[x] Checkbox syntax", url="https://a.com", content="Use [bold]", engines=["google"]),
+            SearchResult(title="B", url="https://b.com", score=2.0),
+        ],
+        suggestions=["tests"],
+    )
+
+    def test_plain_when_not_a_terminal(self, capsys: pytest.CaptureFixture):
+        print_results(self.response, num=10)
+        assert capsys.readouterr().out == (
+            "\n1. [x] Checkbox syntax\n   https://a.com\n   Use [bold]\n   engines: google\n"
+            "\n2. B\n   https://b.com\n   score: 2.0\n"
+            "\nShowing 2 of 100 results\nSuggestions: tests\n"
+        )
+
+    def test_terminal_keeps_brackets(self, monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture):
+        from rich.console import Console
+
+        from searxngcli.logging import use_consoles
+
+        monkeypatch.setattr("sys.stdout.isatty", lambda: True)
+        console = Console(force_terminal=True, color_system="standard", width=80)
+        with use_consoles(console, console):
+            print_results(self.response, num=1)
+
+        out = capsys.readouterr().out
+        assert "[x] Checkbox syntax" in out
+        assert "Use [bold]" in out
+        assert "\x1b[" in out
+
+    def test_no_results(self, capsys: pytest.CaptureFixture):
+        print_results(SearchResponse(query="test"))
+        assert capsys.readouterr().out == "No results found.\n"
+
+    def test_partial_marker(self, capsys: pytest.CaptureFixture):
+        response = SearchResponse(query="test", results=[SearchResult(title="A", url="https://a.com")], partial=True)
+        print_results(response)
+        assert capsys.readouterr().out.endswith("Partial results: the deadline passed before the search completed\n")
+
+        print_results(SearchResponse(query="test", partial=True))
+        assert capsys.readouterr().out == "No results within the deadline.\n"
+
+
+class TestPrintEngines:
+    def test_tab_separated_when_not_a_terminal(self, capsys: pytest.CaptureFixture):
+        engines = [
+            EngineInfo(name="google", categories=["general", "web"], shortcut="go"),
+            EngineInfo(name="bing", categories=["general"], shortcut="bi", enabled=False),
+        ]
+        print_engines(engines)
+        assert capsys.readouterr().out == "bing\tbi\tgeneral\tno\ngoogle\tgo\tgeneral,web\tyes\n"
+
+    def test_categories_one_per_line(self, capsys: pytest.CaptureFixture):
+        print_categories(["news", "general"])
+        assert capsys.readouterr().out == "general\nnews\n"
+
+
+class TestWriteJsonl:
+    def test_one_line_per_result_and_meta(self, capsys: pytest.CaptureFixture):
+        response = SearchResponse(
+            query="test",
+            number_of_results=2,
+            results=[SearchResult(title="A", url="https://a.com"), SearchResult(title="B", url="https://b.com")],
+            suggestions=["tests"],
+        )
+        write_jsonl(response)
+
+        lines = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+        assert [line["type"] for line in lines] == ["result", "result", "meta"]
+        assert lines[0]["title"] == "A"
+        assert lines[2]["suggestions"] == ["tests"]
+        assert "partial" not in lines[2]
+
+    def test_limited_to_num(self, capsys: pytest.CaptureFixture):
+        response = SearchResponse(query="test", results=[SearchResult(title=str(i)) for i in range(5)])
+        write_jsonl(response, num=2)
+
+        lines = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+        assert [line.get("title") for line in lines] == ["0", "1", None]
+
+    def test_partial_marker(self, capsys: pytest.CaptureFixture):
+        write_jsonl(SearchResponse(query="test", partial=True))
+        assert json.loads(capsys.readouterr().out)["partial"] is True
+
+
+class TestPrintJson:
+    def test_plain_when_not_a_terminal(self, capsys: pytest.CaptureFixture):
+        print_json({"query": "ü"})
+        assert capsys.readouterr().out == '{\n  "query": "ü"\n}\n'
@@ -0,0 +1,82 @@
+"""Tests for the local full-text index."""
+
+import time
+from pathlib import Path
+
+import pytest
+
+from searxngcli.client import SearXNGClient
+from searxngcli.index import ResultIndex, build_match_query
+
+from .fakeserver import FakeSearXNG
+
+RESULTS = [
+    {
+        "title": "Python asyncio tutorial",
+        "url": "https://www.example.com/asyncio/",
+        "content": "Learn event loops and coroutines",
+        "engines": ["google", "bing"],
+        "publishedDate": "2025-01-01",
+    },
+    {"title": "Rust ownership", "url": "https://rust.example.com/ownership", "content": "Borrowing explained"},
+]
+
+
+@pytest.fixture
+def index(tmp_path: Path):
+    index = ResultIndex(tmp_path / "index.db")
+    yield index
+    index.close()
+
+
+class TestMatchQuery:
+    def test_all_words_with_prefix_on_last(self):
+        assert build_match_query('python "async') == '"python" "async"*'
+
+    def test_requires_a_word(self):
+        with pytest.raises(ValueError):
+            build_match_query("-- ()")
+
+
+class TestResultIndex:
+    def test_search_by_title_and_content(self, index: ResultIndex):
+        index.add("python async", RESULTS)
+
+        response = index.search("coroutines")
+        assert [r.url for r in response.results] == ["https://www.example.com/asyncio/"]
+        assert response.results[0].engines == ["google", "bing"]
+        assert index.search("ownership rust").results[0].title == "Rust ownership"
+
+    def test_prefix_and_diacritics(self, index: ResultIndex):
+        index.add("cafe", [{"title": "Café Žižkov", "url": "https://cafe.example.com"}])
+        assert len(index.search("zizk").results) == 1
+
+    def test_search_by_query(self, index: ResultIndex):
+        index.add("systems programming", RESULTS[1:])
+        assert len(index.search("systems").results) == 1
+
+    def test_dedups_by_normalized_url(self, index: ResultIndex):
+        index.add("python", RESULTS[:1])
+        index.add("asyncio", [{**RESULTS[0], "url": "http://example.com/asyncio?utm_source=x", "title": "New title"}])
+
+        response = index.search("asyncio")
+        assert len(response.results) == 1
+        assert response.results[0].title == "New title"
+        # Both queries find the page.
+        assert len(index.search("python").results) == 1
+
+    def test_prunes_old_pages(self, index: ResultIndex, monkeypatch: pytest.MonkeyPatch):
+        index.add("old", RESULTS[1:])
+        now = time.time()
+        monkeypatch.setattr("searxngcli.index.time.time", lambda: now + index.max_age + 1)
+        index.add("new", RESULTS[:1])
+
+        assert index.search("rust").results == []
+        assert len(index.search("asyncio").results) == 1
+
+
+class TestClientIndexing:
+    def test_records_fetched_results(self, index: ResultIndex):
+        with FakeSearXNG(num_results=3) as server, SearXNGClient(server.base_url, index=index) as client:
+            client.search("needle")
+        assert len(index.search("needle").results) == 3
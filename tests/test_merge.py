@@ -0,0 +1,117 @@
+"""Tests for result merging and deduplication."""
+
+from searxngcli.merge import RankFusion, ResultMerger, fuse_responses, merge_responses, normalize_url
+from searxngcli.models import SearchResponse, SearchResult
+
+
+class TestNormalizeUrl:
+    def test_equivalent_urls(self):
+        urls = [
+            "https://www.Example.com/path/",
+            "http://example.com/path",
+            "https://example.com:443/path#section",
+            "https://example.com/path?utm_source=feed",
+        ]
+        assert {normalize_url(u) for u in urls} == {"example.com/path"}
+
+    def test_keeps_significant_differences(self):
+        assert normalize_url("https://example.com/a?x=1&y=2") == normalize_url("https://example.com/a?y=2&x=1")
+        assert normalize_url("https://example.com/a?x=1") != normalize_url("https://example.com/a?x=2")
+        assert normalize_url("https://example.com:8080/a") != normalize_url("https://example.com/a")
+
+    def test_non_http_urls_unchanged(self):
+        assert normalize_url("magnet:?xt=urn:btih:abc") == "magnet:?xt=urn:btih:abc"
+
+
+class TestResultMerger:
+    def test_dedup_keeps_best_score_and_first_position(self):
+        merger = ResultMerger()
+        merger.add(
+            [
+                SearchResult(title="A", url="https://a.com/", engines=["google"], score=1.0),
+                SearchResult(title="B", url="https://b.com", engines=["google"], score=0.5),
+            ]
+        )
+        merger.add([SearchResult(title="A better", url="http://www.a.com", engines=["bing"], score=2.0)])
+
+        assert len(merger) == 2
+        first = merger.results[0]
+        assert first.title == "A better"
+        assert first.score == 2.0
+        assert first.engines == ["google", "bing"]
+
+    def test_results_without_url_are_kept(self):
+        merger = ResultMerger()
+        merger.add([SearchResult(title="x"), SearchResult(title="y")])
+        assert len(merger) == 2
+
+
+class TestRankFusion:
+    def test_results_found_by_several_engines_rank_first(self):
+        fusion = RankFusion(k=60)
+        fusion.add("google", [SearchResult(url="https://a.com"), SearchResult(url="https://b.com")])
+        fusion.add("bing", [SearchResult(url="https://c.com"), SearchResult(url="http://www.b.com/")])
+
+        results = fusion.results
+        assert [r.url for r in results] == ["https://b.com", "https://a.com", "https://c.com"]
+        assert results[0].engines == ["google", "bing"]
+        assert results[0].score == round(1 / 62 + 1 / 62, 6)
+        assert results[1].score == round(1 / 61, 6)
+
+    def test_keeps_highest_ranked_copy(self):
+        fusion = RankFusion()
+        fusion.add("google", [SearchResult(url="https://x.com"), SearchResult(title="Low", url="https://a.com")])
+        fusion.add("bing", [SearchResult(title="High", url="https://a.com/")])
+
+        assert fusion.results[0].title == "High"
+
+    def test_duplicates_within_one_list_count_once(self):
+        fusion = RankFusion()
+        fusion.add("google", [SearchResult(url="https://a.com"), SearchResult(url="https://a.com/")])
+        assert len(fusion) == 1
+        assert fusion.results[0].score == round(1 / 61, 6)
+
+    def test_fuse_responses(self):
+        fused = fuse_responses(
+            [
+                ("google", SearchResponse(query="q", results=[SearchResult(url="https://a.com")], suggestions=["s1"])),
+                (
+                    "bing",
+                    SearchResponse(
+                        query="q",
+                        results=[SearchResult(url="https://b.com"), SearchResult(url="https://a.com")],
+                        suggestions=["s2"],
+                    ),
+                ),
+            ],
+            limit=1,
+        )
+        assert [r.url for r in fused.results] == ["https://a.com"]
+        assert fused.results[0].engines == ["google", "bing"]
+        assert fused.suggestions == ["s1", "s2"]
+
+
+class TestMergeResponses:
+    def test_merge(self):
+        merged = merge_responses(
+            [
+                SearchResponse(
+                    query="q",
+                    number_of_results=10,
+                    results=[SearchResult(url="https://a.com")],
+                    suggestions=["s1"],
+                ),
+                SearchResponse(
+                    query="q",
+                    number_of_results=12,
+                    results=[SearchResult(url="https://a.com/"), SearchResult(url="https://b.com")],
+                    suggestions=["s1", "s2"],
+                    unresponsive_engines=[["bing", "timeout"]],
+                ),
+            ],
+            limit=1,
+        )
+        assert merged.number_of_results == 12
+        assert [r.url for r in merged.results] == ["https://a.com"]
+        assert merged.suggestions == ["s1", "s2"]
+        assert merged.unresponsive_engines == [["bing", "timeout"]]
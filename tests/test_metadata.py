@@ -0,0 +1,50 @@
+"""Tests for the instance metadata snapshot."""
+
+import time
+from pathlib import Path
+
+import pytest
+
+from searxngcli.metadata import ConfigSnapshot, MetadataStore, snapshot_path, validate_filters
+
+SNAPSHOT = ConfigSnapshot(
+    data={
+        "categories": ["general", "news"],
+        "engines": [{"name": "google"}, {"name": "duckduckgo"}],
+    },
+    etag='"v1"',
+    fetched_at=time.time(),
+)
+
+
+class TestMetadataStore:
+    def test_save_and_load(self, tmp_path: Path):
+        path = snapshot_path(tmp_path, "https://searxng.example.com")
+        MetadataStore(path).save(SNAPSHOT)
+
+        loaded = MetadataStore(path).load()
+        assert loaded == SNAPSHOT
+
+    def test_load_missing(self, tmp_path: Path):
+        assert MetadataStore(tmp_path / "missing.json").load() is None
+
+    def test_is_stale(self, tmp_path: Path):
+        store = MetadataStore(tmp_path / "snapshot.json", max_age=60)
+        assert not store.is_stale(ConfigSnapshot(fetched_at=time.time()))
+        assert store.is_stale(ConfigSnapshot(fetched_at=time.time() - 120))
+
+    def test_snapshot_path_per_instance(self, tmp_path: Path):
+        assert snapshot_path(tmp_path, "https://a") != snapshot_path(tmp_path, "https://b")
+
+
+class TestValidateFilters:
+    def test_known_names(self):
+        validate_filters(SNAPSHOT, categories="general,news", engines="google, duckduckgo")
+
+    def test_unknown_engine_suggests_match(self):
+        with pytest.raises(ValueError, match=r"Unknown engines: gogle \(did you mean google\?\)"):
+            validate_filters(SNAPSHOT, engines="gogle")
+
+    def test_unknown_category(self):
+        with pytest.raises(ValueError, match="Unknown categories: xyz"):
+            validate_filters(SNAPSHOT, categories="general,xyz")
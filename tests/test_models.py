@@ -1,6 +1,9 @@
 """Tests for data models."""
 
-from searxngcli.models import EngineInfo, SearchResponse, SearchResult
+import pytest
+
+from searxngcli import jsonutil
+from searxngcli.models import EngineInfo, LazyResults, SearchResponse, SearchResult
 
 
 class TestSearchResult:
@@ -34,6 +37,37 @@ class TestSearchResult:
         assert result.engines == []
         assert result.score == 0.0
 
+    def test_slots(self):
+        with pytest.raises(AttributeError):
+            SearchResult().extra = 1  # type: ignore[attr-defined]
+
+
+class TestLazyResults:
+    raw = [{"title": f"Result {i}", "url": f"https://example.com/{i}"} for i in range(5)]
+
+    def test_decodes_on_access(self):
+        results = LazyResults(self.raw)
+        assert results._decoded == [None] * 5
+        assert results[1].title == "Result 1"
+        assert results._decoded[0] is None
+        assert results[1] is results[1]
+
+    def test_negative_index_and_slice(self):
+        results = LazyResults(self.raw)
+        assert results[-1].url == "https://example.com/4"
+        assert [r.title for r in results[1:3]] == ["Result 1", "Result 2"]
+        assert results._decoded[3] is None
+
+    def test_index_out_of_range(self):
+        with pytest.raises(IndexError):
+            LazyResults(self.raw)[5]
+
+    def test_equals_list(self):
+        results = LazyResults(self.raw)
+        assert results == [SearchResult.from_dict(r) for r in self.raw]
+        assert results != []
+        assert list(results)[2].title == "Result 2"
+
 
 class TestSearchResponse:
     def test_from_dict(self):
@@ -60,6 +94,10 @@ class TestSearchResponse:
         assert response.query == ""
         assert response.results == []
 
+    def test_to_dict_marks_partial_responses(self):
+        assert "partial" not in SearchResponse(query="test").to_dict()
+        assert SearchResponse(query="test", partial=True).to_dict()["partial"] is True
+
 
 class TestEngineInfo:
     def test_from_dict(self):
@@ -74,3 +112,15 @@ class TestEngineInfo:
         assert engine.categories == ["general"]
         assert engine.shortcut == "g"
         assert engine.enabled is True
+
+
+class TestJsonUtil:
+    def test_roundtrip(self):
+        data = {"title": "Příliš žluťoučký", "score": 1.5, "engines": ["google"]}
+        assert jsonutil.loads(jsonutil.dumpb(data)) == data
+        assert jsonutil.loads(jsonutil.dumps(data)) == data
+        assert "ř" in jsonutil.dumps(data)
+
+    def test_invalid_json_raises_value_error(self):
+        with pytest.raises(ValueError):
+            jsonutil.loads(b"{not json")
@@ -0,0 +1,53 @@
+"""Tests for the instance pool."""
+
+import time
+
+import pytest
+
+from searxngcli.pool import InstancePool
+
+
+class TestInstancePool:
+    def test_least_outstanding(self):
+        pool = InstancePool([("https://a", 1.0), ("https://b", 1.0)])
+        first = pool.acquire()
+        second = pool.acquire()
+        assert {first.url, second.url} == {"https://a", "https://b"}
+
+        pool.release(first, ok=True)
+        assert pool.acquire().url == first.url
+
+    def test_weights(self):
+        pool = InstancePool([("https://a", 3.0), ("https://b", 1.0)])
+        picks = [pool.acquire().url for _ in range(8)]
+        assert picks.count("https://a") == 6
+        assert picks.count("https://b") == 2
+
+    def test_failure_ejects_instance(self):
+        pool = InstancePool([("https://a", 1.0), ("https://b", 1.0)], cooldown=60)
+        a = pool.acquire()
+        pool.release(a, ok=False)
+
+        assert not pool.has_healthy(exclude={"https://b"})
+        for _ in range(3):
+            instance = pool.acquire()
+            assert instance.url == "https://b"
+            pool.release(instance, ok=True)
+
+    def test_all_ejected_uses_soonest_recovering(self):
+        pool = InstancePool([("https://a", 1.0), ("https://b", 1.0)], cooldown=60)
+        for _ in range(2):
+            pool.release(pool.acquire(exclude={"https://b"}), ok=False)
+        pool.release(pool.acquire(exclude={"https://a"}), ok=False)
+
+        assert pool.acquire().url == "https://b"
+
+    def test_retry_after_extends_cooldown(self):
+        pool = InstancePool([("https://a", 1.0)], cooldown=1)
+        instance = pool.acquire()
+        pool.release(instance, ok=False, retry_after=120)
+        assert instance.ejected_until > time.monotonic() + 60
+
+    def test_requires_instances(self):
+        with pytest.raises(ValueError):
+            InstancePool([])
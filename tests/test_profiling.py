@@ -0,0 +1,140 @@
+"""Tests for profiling an invocation by phase."""
+
+import json
+import os
+import subprocess
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+from searxngcli import profiling
+from searxngcli.profiling import SNAPSHOTS_DIRNAME, SUMMARY_FILENAME, Profiler, find_run, format_report
+
+from .fakeserver import FakeSearXNG
+
+ENTRY_POINT = "from searxngcli.cli import cli; cli()"
+
+
+def _allocate() -> list[str]:
+    return [f"item {i}" for i in range(2000)]
+
+
+@pytest.fixture
+def run_dir(tmp_path: Path) -> Path:
+    profiler = Profiler(tmp_path / "profiles", ["search", "test"])
+    profiler.start()
+    profiler.command_started()
+    with profiler.phase("http"):
+        kept = _allocate()
+        with profiler.phase("model"):
+            kept += _allocate()
+    with profiler.phase("render"):
+        pass
+    path = profiler.stop()
+    del kept
+    return path
+
+
+class TestProfiler:
+    def test_writes_a_profile_per_phase(self, run_dir: Path):
+        summary = json.loads((run_dir / SUMMARY_FILENAME).read_text())
+        assert summary["argv"] == ["search", "test"]
+        assert list(summary["phases"]) == ["startup", "http", "model", "render", "other"]
+        assert summary["phases"]["http"]["segments"] == 2
+        assert summary["phases"]["other"]["segments"] == 3
+        assert summary["phases"]["model"]["retained_bytes"] > 100_000
+        for name in summary["phases"]:
+            assert (run_dir / f"{name}.pstats").exists()
+        snapshots = sorted(p.name for p in (run_dir / SNAPSHOTS_DIRNAME).iterdir())
+        assert snapshots[:4] == [
+            "001-startup.snapshot",
+            "002-other.snapshot",
+            "003-http.snapshot",
+            "004-model.snapshot",
+        ]
+
+    def test_other_threads_stay_in_the_current_phase(self, tmp_path: Path):
+        profiler = Profiler(tmp_path, [])
+        profiler.start()
+        worker = threading.Thread(target=lambda: profiler.phase("http").__enter__())
+        worker.start()
+        worker.join()
+        path = profiler.stop()
+        assert list(json.loads((path / SUMMARY_FILENAME).read_text())["phases"]) == ["startup"]
+
+    def test_phase_does_nothing_when_inactive(self):
+        assert profiling._active is None
+        with profiling.phase("http"):
+            pass
+        profiling.command_started()
+        assert profiling.stop() is None
+
+
+class TestReport:
+    def test_lists_phases_functions_and_allocation_sites(self, run_dir: Path):
+        report = "\n".join(format_report(run_dir, top=5))
+        assert report.startswith("Profile of: searxng search test")
+        assert "== model" in report
+        assert "tests/test_profiling.py:" in report
+        assert "tracemalloc.py" not in report
+
+    def test_selected_phases(self, run_dir: Path):
+        report = format_report(run_dir, phases=["http"])
+        assert [line for line in report if line.startswith("==")] == [line for line in report if "== http" in line]
+
+    def test_find_run_picks_the_latest(self, run_dir: Path):
+        older = run_dir.parent / "20000101-000000-1"
+        older.mkdir()
+        (older / SUMMARY_FILENAME).write_text("{}")
+        assert find_run(run_dir.parent) == run_dir
+        assert find_run(older) == older
+
+    def test_find_run_without_profiles(self, tmp_path: Path):
+        with pytest.raises(FileNotFoundError):
+            find_run(tmp_path)
+
+
+class TestProfileOutput:
+    def test_search_writes_a_run(self, tmp_path: Path):
+        env = {**os.environ, "XDG_CACHE_HOME": str(tmp_path / "cache"), "SEARXNG_PROFILE": str(tmp_path / "out")}
+        config_file = tmp_path / "config.yml"
+        with FakeSearXNG() as server:
+            config_file.write_text(f"base_url: {server.base_url}\n")
+            result = subprocess.run(
+                [sys.executable, "-c", ENTRY_POINT, "--config", str(config_file), "search", "test", "--json"],
+                env=env,
+                capture_output=True,
+                text=True,
+                check=True,
+            )
+        assert "Profile written to" in result.stderr
+        phases = json.loads((find_run(tmp_path / "out") / SUMMARY_FILENAME).read_text())["phases"]
+        assert {"startup", "http", "model", "render"} <= set(phases)
+
+    def test_profile_report_is_not_profiled(self, tmp_path: Path):
+        env = {**os.environ, "XDG_CACHE_HOME": str(tmp_path / "cache"), "SEARXNG_PROFILE": str(tmp_path / "out")}
+        config_file = tmp_path / "config.yml"
+        with FakeSearXNG() as server:
+            config_file.write_text(f"base_url: {server.base_url}\n")
+            subprocess.run(
+                [sys.executable, "-c", ENTRY_POINT, "--config", str(config_file), "search", "test", "--json"],
+                env=env,
+                capture_output=True,
+                check=True,
+            )
+        reports = [
+            subprocess.run(
+                [sys.executable, "-c", ENTRY_POINT, "profile", "report", str(tmp_path / "out")],
+                env=env,
+                capture_output=True,
+                text=True,
+                check=True,
+            ).stdout
+            for _ in range(2)
+        ]
+        assert all(
+            report.startswith(f"Profile of: searxng --config {config_file} search test --json") for report in reports
+        )
+        assert len(list((tmp_path / "out").iterdir())) == 1
@@ -0,0 +1,96 @@
+"""Tests for client-side rate limiting and backoff."""
+
+import threading
+import time
+from email.utils import formatdate
+
+from searxngcli.ratelimit import BACKOFF_CAP, AdaptiveLimiter, backoff_delay, parse_retry_after
+
+
+class TestRetryAfter:
+    def test_seconds(self):
+        assert parse_retry_after("120") == 120.0
+
+    def test_http_date(self):
+        assert 50 < parse_retry_after(formatdate(time.time() + 60, usegmt=True)) <= 60
+
+    def test_invalid(self):
+        assert parse_retry_after(None) is None
+        assert parse_retry_after("soon") is None
+
+
+class TestBackoff:
+    def test_jitter_within_exponential_bound(self):
+        delays = [backoff_delay(3) for _ in range(100)]
+        assert all(0 <= d <= 4.0 for d in delays)
+        assert len(set(delays)) > 1
+
+    def test_honors_retry_after(self):
+        assert backoff_delay(0, retry_after=5) >= 5
+
+    def test_gives_up_on_long_retry_after(self):
+        assert backoff_delay(0, retry_after=BACKOFF_CAP + 1) is None
+
+
+class TestAdaptiveLimiter:
+    def test_concurrency_limit(self):
+        limiter = AdaptiveLimiter(max_concurrency=4, initial_concurrency=2)
+        assert limiter.try_acquire() == 0
+        assert limiter.try_acquire() == 0
+        assert limiter.try_acquire() > 0
+        limiter.release(0.01, ok=True)
+        assert limiter.try_acquire() == 0
+
+    def test_additive_increase_up_to_max(self):
+        limiter = AdaptiveLimiter(max_concurrency=4, initial_concurrency=1)
+        for _ in range(50):
+            limiter.acquire()
+            limiter.release(0.01, ok=True)
+        assert limiter.limit == 4
+
+    def test_multiplicative_decrease_on_errors(self):
+        limiter = AdaptiveLimiter(max_concurrency=16, initial_concurrency=16)
+        limiter.acquire()
+        limiter.release(None, ok=False)
+        assert limiter.limit == 8
+
+        # Failures of requests that were in flight at the same time cut only once.
+        limiter._smoothed = 60.0
+        limiter.acquire()
+        limiter.release(None, ok=False)
+        assert limiter.limit == 8
+
+    def test_decrease_on_rising_latency(self):
+        limiter = AdaptiveLimiter(max_concurrency=10, initial_concurrency=10)
+        for latency in (0.01, 0.01, 1.0, 1.0, 1.0):
+            limiter.acquire()
+            limiter.release(latency, ok=True)
+        assert limiter.limit < 10
+
+    def test_decrease_on_unresponsive_engines(self):
+        limiter = AdaptiveLimiter(max_concurrency=10, initial_concurrency=10)
+        limiter.observe_unresponsive(0)
+        limiter.observe_unresponsive(5)
+        assert limiter.limit == 8
+
+    def test_token_bucket(self):
+        limiter = AdaptiveLimiter(rate=2)
+        assert limiter.try_acquire() == 0
+        assert limiter.try_acquire() == 0
+        assert 0 < limiter.try_acquire() <= 0.5
+
+    def test_acquire_blocks_until_release(self):
+        limiter = AdaptiveLimiter(max_concurrency=1)
+        limiter.acquire()
+        acquired = threading.Event()
+
+        def worker() -> None:
+            limiter.acquire()
+            acquired.set()
+
+        thread = threading.Thread(target=worker)
+        thread.start()
+        assert not acquired.wait(0.1)
+        limiter.release(0.01, ok=True)
+        assert acquired.wait(1)
+        thread.join()
@@ -0,0 +1,95 @@
+"""Startup time budget for the CLI entry point."""
+
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+from .fakeserver import FakeSearXNG
+
+# Allowed time on top of a bare interpreter startup, in seconds (best of RUNS).
+VERSION_BUDGET = 0.05
+RUNS = 5
+
+HEAVY_MODULES = ("rich", "yaml", "httpx", "typer")
+
+REPORT_MODULES = "import atexit, sys; atexit.register(lambda: sys.stderr.write(' '.join(sorted(sys.modules))))"
+ENTRY_POINT = "from searxngcli.cli import cli; cli()"
+
+
+def _run(args: list[str], env: dict[str, str], code: str = ENTRY_POINT) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, "-c", code, *args],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+
+def _best_time(args: list[str], env: dict[str, str], code: str = ENTRY_POINT) -> float:
+    timings = []
+    for _ in range(RUNS):
+        start = time.perf_counter()
+        _run(args, env, code)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def _imported(args: list[str], env: dict[str, str]) -> set[str]:
+    result = _run(args, env, f"{REPORT_MODULES}; {ENTRY_POINT}")
+    return {name.split(".")[0] for name in result.stderr.split()}
+
+
+@pytest.fixture
+def env(tmp_path: Path) -> dict[str, str]:
+    return {**os.environ, "XDG_CACHE_HOME": str(tmp_path / "cache")}
+
+
+@pytest.fixture
+def server():
+    with FakeSearXNG() as fake:
+        yield fake
+
+
+@pytest.fixture
+def config_file(tmp_path: Path, server: FakeSearXNG) -> Path:
+    path = tmp_path / "config.yml"
+    path.write_text(f"base_url: {server.base_url}\n")
+    return path
+
+
+class TestStartup:
+    def test_version_imports_nothing_heavy(self, env: dict[str, str]):
+        assert not _imported(["--version"], env) & set(HEAVY_MODULES)
+
+    def test_search_json_does_not_import_rich(self, env: dict[str, str], config_file: Path):
+        imported = _imported(["--config", str(config_file), "search", "test", "--json"], env)
+        assert "rich" not in imported
+        assert "httpx" in imported
+
+    def test_unchanged_config_does_not_import_yaml(self, env: dict[str, str], config_file: Path):
+        args = ["--config", str(config_file), "search", "test", "--json"]
+        assert "yaml" in _imported(args, env)
+        assert "yaml" not in _imported(args, env)
+
+    def test_version_budget(self, env: dict[str, str]):
+        baseline = _best_time([], env, code="pass")
+        elapsed = _best_time(["--version"], env)
+        assert elapsed - baseline < VERSION_BUDGET
+
+    def test_warm_search_json_imports_only_http_stack(self, env: dict[str, str], config_file: Path):
+        args = ["--config", str(config_file), "search", "test", "--json", "--no-cache"]
+        _run(args, env)
+        assert _imported(args, env) & set(HEAVY_MODULES) == {"httpx", "typer"}
+
+    def test_cached_suggest_imports_nothing_heavy(self, env: dict[str, str], config_file: Path):
+        env = {**env, "SEARXNG_CONFIG": str(config_file)}
+        fetched = _run(["suggest", "pyth"], env)
+        assert fetched.stdout == "pyth tutorial\npyth example\n"
+
+        imported = _imported(["suggest", "pytho"], env)
+        assert not imported & {"httpx", "typer", "rich"}
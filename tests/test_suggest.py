@@ -0,0 +1,168 @@
+"""Tests for the autocomplete prefix cache."""
+
+import json
+import time
+from pathlib import Path
+
+import httpx
+import pytest
+
+from searxngcli.client import SearXNGClient
+from searxngcli.suggest import (
+    COMPLETE_BELOW,
+    SuggestCache,
+    normalize_prefix,
+    parse_suggestions,
+    print_cached,
+    suggest_path,
+)
+
+BASE_URL = "https://searxng.example.com"
+
+
+class FakeAutocompleter(httpx.MockTransport):
+    def __init__(self, suggestions: dict[str, list[str]]):
+        self.requests: list[httpx.Request] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            self.requests.append(request)
+            query = request.url.params["q"]
+            return httpx.Response(200, json=[query, suggestions.get(query, [])])
+
+        super().__init__(handler)
+
+
+@pytest.fixture
+def cache(tmp_path: Path) -> SuggestCache:
+    return SuggestCache(tmp_path / "suggest.json")
+
+
+class TestParsing:
+    def test_normalize_prefix(self):
+        assert normalize_prefix("  Python\t ASYNC ") == "python async "
+
+    def test_opensearch_format(self):
+        assert parse_suggestions(["py", ["python", "pytest"]]) == ["python", "pytest"]
+
+    def test_plain_list(self):
+        assert parse_suggestions(["python", "pytest", 3]) == ["python", "pytest"]
+
+    def test_unexpected_response(self):
+        with pytest.raises(ValueError):
+            parse_suggestions({"error": "nope"})
+
+    def test_path_is_per_instance(self, tmp_path: Path):
+        assert suggest_path(tmp_path, "https://a.example") != suggest_path(tmp_path, "https://b.example")
+
+
+class TestSuggestCache:
+    def test_miss(self, cache: SuggestCache):
+        assert cache.lookup("py") is None
+
+    def test_exact_hit(self, cache: SuggestCache):
+        cache.store("Py", ["python", "pytest"])
+        assert cache.lookup("py") == ["python", "pytest"]
+
+    def test_longer_prefix_filters_complete_answer(self, cache: SuggestCache):
+        cache.store("py", ["python", "pytest", "Python asyncio"])
+        assert cache.lookup("pyth") == ["python", "Python asyncio"]
+        assert cache.lookup("python ") == ["Python asyncio"]
+        assert cache.lookup("pyx") == []
+
+    def test_incomplete_answer_is_not_reused(self, cache: SuggestCache):
+        cache.store("py", [f"py{i}" for i in range(COMPLETE_BELOW)])
+        assert cache.lookup("py1") is None
+
+    def test_nearest_ancestor_wins(self, cache: SuggestCache):
+        cache.store("p", ["python"])
+        cache.store("py", ["pytest"])
+        assert cache.lookup("pyt") == ["pytest"]
+
+    def test_expired_answers_are_ignored(self, tmp_path: Path):
+        cache = SuggestCache(tmp_path / "suggest.json", ttl=60)
+        cache.store("py", ["python"])
+        cache._root["c"]["p"]["c"]["y"]["t"] = time.time() - 120
+        assert cache.lookup("py") is None
+        assert cache.lookup("pyt") is None
+
+    def test_persisted_as_nested_trie(self, tmp_path: Path):
+        path = tmp_path / "suggest.json"
+        cache = SuggestCache(path)
+        cache.store("py", ["python"])
+        cache.save()
+
+        stored = json.loads(path.read_text())
+        assert stored["c"]["p"]["c"]["y"]["s"] == ["python"]
+        assert SuggestCache(path).lookup("pyth") == ["python"]
+
+    def test_save_evicts_oldest_and_expired(self, tmp_path: Path):
+        path = tmp_path / "suggest.json"
+        cache = SuggestCache(path, ttl=60, max_prefixes=2)
+        for prefix in ("a", "ab", "b", "c"):
+            cache.store(prefix, [prefix])
+        cache._root["c"]["c"]["t"] = time.time() - 120
+        cache._root["c"]["a"]["t"] -= 2
+        cache.save()
+
+        reloaded = SuggestCache(path)
+        assert reloaded.lookup("a") is None
+        assert reloaded.lookup("ab") == ["ab"]
+        assert reloaded.lookup("b") == ["b"]
+        assert "c" not in json.loads(path.read_text())["c"]
+
+    def test_unreadable_file(self, tmp_path: Path):
+        path = tmp_path / "suggest.json"
+        path.write_text("not json")
+        assert SuggestCache(path).lookup("py") is None
+
+
+class TestAutocomplete:
+    def test_fetches_and_caches(self, cache: SuggestCache):
+        transport = FakeAutocompleter({"py": ["python", "pytest"]})
+        with SearXNGClient(BASE_URL, transport=transport, suggest_cache=cache) as client:
+            assert client.autocomplete("py") == ["python", "pytest"]
+            assert client.autocomplete("py") == ["python", "pytest"]
+            assert client.autocomplete("pyte") == ["pytest"]
+
+        assert len(transport.requests) == 1
+        assert transport.requests[0].url.path == "/autocompleter"
+        assert cache.path.exists()
+
+    def test_no_cache(self, cache: SuggestCache):
+        transport = FakeAutocompleter({"py": ["python"]})
+        with SearXNGClient(BASE_URL, transport=transport, suggest_cache=cache) as client:
+            client.autocomplete("py")
+            client.autocomplete("py", use_cache=False)
+        assert len(transport.requests) == 2
+
+    def test_blank_prefix(self):
+        transport = FakeAutocompleter({})
+        with SearXNGClient(BASE_URL, transport=transport) as client:
+            assert client.autocomplete("  ") == []
+        assert not transport.requests
+
+
+class TestPrintCached:
+    @pytest.fixture
+    def config(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+        path = tmp_path / "config.yml"
+        path.write_text(f"base_url: {BASE_URL}\n")
+        monkeypatch.setenv("SEARXNG_CONFIG", str(path))
+        monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+        return path
+
+    def test_prints_cached_answer(self, config: Path, tmp_path: Path, capsys: pytest.CaptureFixture):
+        cache = SuggestCache(suggest_path(tmp_path / "cache" / "searxngcli", BASE_URL))
+        cache.store("py", ["python"])
+        cache.save()
+
+        assert print_cached(["pyt"])
+        assert capsys.readouterr().out == "python\n"
+        assert print_cached(["pyt", "--json"])
+        assert json.loads(capsys.readouterr().out) == ["python"]
+
+    def test_falls_back_to_command(self, config: Path, capsys: pytest.CaptureFixture):
+        assert not print_cached(["py"])
+        assert not print_cached(["py", "--no-cache"])
+        assert not print_cached([])
+        assert capsys.readouterr().out == ""
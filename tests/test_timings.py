@@ -0,0 +1,84 @@
+"""Tests for the per-request timing breakdown."""
+
+import json
+import threading
+from pathlib import Path
+
+from searxngcli.client import SearXNGClient
+from searxngcli.timings import Timings
+
+from .fakeserver import FakeSearXNG
+
+
+class TestRequestTiming:
+    def test_trace_events_become_phases(self):
+        record = Timings().start_request("GET", "http://example.com/search")
+        for event in (
+            "connection.connect_tcp.started",
+            "connection.connect_tcp.complete",
+            "http11.send_request_headers.started",
+            "http11.send_request_body.complete",
+            "http11.receive_response_headers.started",
+            "http11.receive_response_headers.complete",
+            "http11.receive_response_body.started",
+            "http11.receive_response_body.complete",
+        ):
+            record.trace(event, {})
+        assert set(record.phases) == {"connect", "send", "wait", "download"}
+        assert all(seconds >= 0 for seconds in record.phases.values())
+
+
+class TestTimings:
+    def test_measure_attributes_to_last_request_of_thread(self):
+        timings = Timings()
+        with timings.measure("model"):
+            pass
+        record = timings.start_request("GET", "http://example.com/search")
+        with timings.measure("decode"):
+            pass
+
+        def render() -> None:
+            with timings.measure("render"):
+                pass
+
+        thread = threading.Thread(target=render)
+        thread.start()
+        thread.join()
+
+        assert set(record.phases) == {"decode"}
+        assert set(timings.phases) == {"model", "render"}
+
+    def test_openmetrics(self):
+        timings = Timings()
+        with timings.request("GET", 'http://example.com/search?q="x"') as record:
+            record.status = 200
+        timings.phases["render"] = 0.01
+
+        text = timings.to_openmetrics()
+        assert text.endswith("# EOF\n")
+        assert "# UNIT searxng_request_phase_seconds seconds" in text
+        assert 'url="http://example.com/search?q=\\"x\\"",phase="http"}' in text
+        assert 'searxng_phase_seconds{phase="render"}' in text
+
+    def test_write_json(self, tmp_path: Path):
+        timings = Timings()
+        with timings.request("GET", "http://example.com/search") as record:
+            record.status = 200
+        path = tmp_path / "timings.json"
+        timings.write(path)
+
+        data = json.loads(path.read_text())
+        assert data["requests"][0]["status"] == 200
+        assert "http" in data["requests"][0]["phases_ms"]
+
+
+class TestClientTimings:
+    def test_search_records_network_and_processing_phases(self):
+        timings = Timings()
+        with FakeSearXNG() as server, SearXNGClient(server.base_url, timings=timings) as client:
+            client.search("test")
+
+        [record] = timings.requests
+        assert record.status == 200
+        assert record.url == f"{server.base_url}/search"
+        assert {"connect", "send", "wait", "download", "http", "decode", "model"} <= set(record.phases)
@@ -0,0 +1,154 @@
+"""Tests for watch mode."""
+
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from searxngcli.models import SearchResponse, SearchResult
+from searxngcli.watch import SeenSet, Watcher, parse_interval
+
+
+class FakeClient:
+    """Stands in for SearXNGClient: every search returns results 0..n of its query, n growing per call."""
+
+    base_url = "https://searxng.example.com"
+
+    def __init__(self, fail: set[str] | None = None):
+        self.fail = fail or set()
+        self.calls: list[tuple[str, float]] = []
+        self._lock = threading.Lock()
+
+    def search(self, query: str, **kwargs: object) -> SearchResponse:
+        with self._lock:
+            runs = sum(1 for q, _ in self.calls if q == query)
+            self.calls.append((query, time.monotonic()))
+        assert kwargs["use_cache"] is False
+        if query in self.fail:
+            raise RuntimeError("instance down")
+        results = [SearchResult(title=f"{query} {i}", url=f"https://example.com/{query}/{i}") for i in range(runs + 2)]
+        return SearchResponse(query=query, results=results)
+
+
+class TestParseInterval:
+    @pytest.mark.parametrize(
+        ("value", "seconds"),
+        [("90", 90), ("30s", 30), ("10m", 600), ("1h30m", 5400), ("1d", 86400), ("0.5s", 0.5)],
+    )
+    def test_valid(self, value: str, seconds: float):
+        assert parse_interval(value) == seconds
+
+    @pytest.mark.parametrize("value", ["", "10x", "m", "10m5", "0"])
+    def test_invalid(self, value: str):
+        with pytest.raises(ValueError):
+            parse_interval(value)
+
+
+class TestSeenSet:
+    def test_add_reports_new_keys_once(self):
+        seen = SeenSet(capacity=1000)
+        assert seen.add("a")
+        assert not seen.add("a")
+        assert "a" in seen
+        assert "b" not in seen
+
+    def test_false_positive_rate(self):
+        seen = SeenSet(capacity=10_000, error_rate=0.01)
+        for i in range(10_000):
+            seen.add(f"seen {i}")
+        false_positives = sum(f"unseen {i}" in seen for i in range(10_000))
+        assert false_positives < 300
+
+    def test_rotation_bounds_memory_and_keeps_recent_keys(self):
+        seen = SeenSet(capacity=100)
+        size = len(seen._current)
+        for i in range(250):
+            seen.add(str(i))
+        assert len(seen._current) == size
+        assert all(str(i) in seen for i in range(200, 250))
+        assert sum(str(i) in seen for i in range(50)) < 5
+
+    def test_persists(self, tmp_path: Path):
+        path = tmp_path / "seen.bin"
+        seen = SeenSet(path, capacity=1000)
+        seen.add("a")
+        seen.save()
+
+        reloaded = SeenSet(path, capacity=1000)
+        assert "a" in reloaded
+        assert reloaded.count == 1
+
+    def test_ignores_file_of_other_size(self, tmp_path: Path):
+        path = tmp_path / "seen.bin"
+        seen = SeenSet(path, capacity=1000)
+        seen.add("a")
+        seen.save()
+        assert "a" not in SeenSet(path, capacity=5000)
+
+    def test_ignores_truncated_file(self, tmp_path: Path):
+        path = tmp_path / "seen.bin"
+        path.write_bytes(b"SXSS")
+        assert "a" not in SeenSet(path, capacity=1000)
+
+
+class TestWatcher:
+    def test_emits_only_new_results(self, tmp_path: Path):
+        client = FakeClient()
+        path = tmp_path / "seen.bin"
+
+        first = list(Watcher(client, SeenSet(path, capacity=1000), ["a", "b"], interval=60).run(rounds=1))
+        assert sorted(e.result.url for e in first) == [f"https://example.com/{q}/{i}" for q in "ab" for i in range(2)]
+
+        # A new process only reports the result that appeared since.
+        second = list(Watcher(client, SeenSet(path, capacity=1000), ["a"], interval=60).run(rounds=1))
+        assert [e.to_dict() for e in second] == [
+            {"query": "a", **SearchResult(title="a 2", url="https://example.com/a/2").to_dict()}
+        ]
+
+    def test_seen_urls_are_per_query(self):
+        client = FakeClient()
+        seen = SeenSet(capacity=1000)
+        list(Watcher(client, seen, ["a"], interval=60).run(rounds=1))
+        events = list(Watcher(client, seen, ["a"], interval=60, time_range="day").run(rounds=1))
+        assert len(events) == 3
+
+    def test_reports_failures_and_keeps_going(self):
+        client = FakeClient(fail={"bad"})
+        events = list(Watcher(client, SeenSet(capacity=1000), ["bad", "good"], interval=0.01).run(rounds=2))
+        assert [e.error for e in events if e.query == "bad"] == ["instance down", "instance down"]
+        assert len([e for e in events if e.query == "good"]) == 3
+
+    def test_staggers_first_runs_and_keeps_interval(self):
+        client = FakeClient()
+        interval = 0.2
+        list(Watcher(client, SeenSet(capacity=1000), ["a", "b", "c", "d"], interval=interval).run(rounds=2))
+
+        starts = {q: [t for name, t in client.calls if name == q] for q in "abcd"}
+        first = [starts[q][0] for q in "abcd"]
+        assert first == sorted(first)
+        assert first[-1] - first[0] == pytest.approx(interval * 3 / 4, abs=0.04)
+        for times in starts.values():
+            assert times[1] - times[0] == pytest.approx(interval, abs=0.04)
+
+    def test_bounded_concurrency(self):
+        active = 0
+        peak = 0
+        lock = threading.Lock()
+        client = FakeClient()
+        search = client.search
+
+        def slow_search(query: str, **kwargs: object) -> SearchResponse:
+            nonlocal active, peak
+            with lock:
+                active += 1
+                peak = max(peak, active)
+            time.sleep(0.01)
+            with lock:
+                active -= 1
+            return search(query, **kwargs)
+
+        client.search = slow_search
+        queries = [f"q{i}" for i in range(20)]
+        list(Watcher(client, SeenSet(capacity=1000), queries, interval=60, concurrency=3).run(rounds=1))
+        assert peak == 3